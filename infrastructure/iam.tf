@@ -79,3 +79,29 @@ resource "aws_iam_role_policy_attachment" "lambda_bedrock_access" {
   role       = aws_iam_role.lambda_execution.name
   policy_arn = aws_iam_policy.lambda_bedrock_access.arn
 }
+
+# SQS access for the parse queue event source
+resource "aws_iam_policy" "lambda_sqs_access" {
+  name        = "${var.project_name}-lambda-sqs-access-${var.environment}"
+  description = "Allow Lambda to consume the resume parse queue"
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = [aws_sqs_queue.parse.arn]
+      }
+    ]
+  })
+}
+
+resource "aws_iam_role_policy_attachment" "lambda_sqs_access" {
+  role       = aws_iam_role.lambda_execution.name
+  policy_arn = aws_iam_policy.lambda_sqs_access.arn
+}
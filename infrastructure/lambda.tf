@@ -25,9 +25,17 @@ resource "aws_lambda_function" "resume_parser" {
 
   environment {
     variables = {
-      S3_BUCKET_NAME   = aws_s3_bucket.resumes.id
-      BEDROCK_MODEL_ID = var.bedrock_model_id
-      ENVIRONMENT      = var.environment
+      S3_BUCKET_NAME              = aws_s3_bucket.resumes.id
+      BEDROCK_MODEL_ID            = var.bedrock_model_id
+      BEDROCK_REQUESTS_PER_MINUTE = var.bedrock_requests_per_minute
+      BEDROCK_TOKENS_PER_MINUTE   = var.bedrock_tokens_per_minute
+      BEDROCK_PROMPT_CACHING      = var.bedrock_prompt_caching
+      ENVIRONMENT                 = var.environment
+      PARSE_CACHE_BACKEND         = "s3"
+      PARSE_CACHE_PREFIX          = "parse-cache/"
+      PARSE_CACHE_TTL_SECONDS     = var.parse_cache_expiration_days * 86400
+      PARSE_BATCH_CONCURRENCY     = 4
+      PARSE_MAX_FILE_MB           = var.parse_max_file_mb
     }
   }
 
@@ -51,8 +59,11 @@ resource "aws_lambda_function" "ranking_agent" {
 
   environment {
     variables = {
-      BEDROCK_MODEL_ID = var.bedrock_model_id
-      ENVIRONMENT      = var.environment
+      BEDROCK_MODEL_ID            = var.bedrock_model_id
+      BEDROCK_REQUESTS_PER_MINUTE = var.bedrock_requests_per_minute
+      BEDROCK_TOKENS_PER_MINUTE   = var.bedrock_tokens_per_minute
+      BEDROCK_PROMPT_CACHING      = var.bedrock_prompt_caching
+      ENVIRONMENT                 = var.environment
     }
   }
 
@@ -23,6 +23,16 @@ output "ranking_agent_lambda_arn" {
   value       = aws_lambda_function.ranking_agent.arn
 }
 
+output "parse_queue_url" {
+  description = "URL of the SQS queue feeding asynchronous resume parsing"
+  value       = aws_sqs_queue.parse.url
+}
+
+output "parse_dlq_url" {
+  description = "URL of the dead-letter queue for resumes that repeatedly failed to parse"
+  value       = aws_sqs_queue.parse_dlq.url
+}
+
 output "lambda_execution_role_arn" {
   description = "ARN of the Lambda execution IAM role"
   value       = aws_iam_role.lambda_execution.arn
@@ -51,6 +51,24 @@ resource "aws_s3_bucket_lifecycle_configuration" "resumes" {
       noncurrent_days = 30
     }
   }
+
+  # Bounds the size of the parse result cache written by the parser Lambda
+  rule {
+    id     = "expire-parse-cache"
+    status = "Enabled"
+
+    filter {
+      prefix = "parse-cache/"
+    }
+
+    expiration {
+      days = var.parse_cache_expiration_days
+    }
+
+    noncurrent_version_expiration {
+      noncurrent_days = 1
+    }
+  }
 }
 
 # CORS configuration for web uploads
@@ -0,0 +1,78 @@
+# Asynchronous bulk parsing: resumes uploaded under var.batch_parse_prefix are
+# announced to an SQS queue, which feeds the parser Lambda in batches. Results
+# are written next to each upload as <key>.parsed.json.
+
+resource "aws_sqs_queue" "parse_dlq" {
+  name                      = "${var.project_name}-parse-dlq-${var.environment}"
+  message_retention_seconds = 1209600
+
+  tags = {
+    Name = "${var.project_name}-parse-dlq"
+  }
+}
+
+resource "aws_sqs_queue" "parse" {
+  name = "${var.project_name}-parse-${var.environment}"
+  # AWS recommends at least six times the function timeout for Lambda event sources
+  visibility_timeout_seconds = var.lambda_timeout * 6
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.parse_dlq.arn
+    maxReceiveCount     = 3
+  })
+
+  tags = {
+    Name = "${var.project_name}-parse"
+  }
+}
+
+resource "aws_sqs_queue_policy" "parse" {
+  queue_url = aws_sqs_queue.parse.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect    = "Allow"
+        Principal = { Service = "s3.amazonaws.com" }
+        Action    = "sqs:SendMessage"
+        Resource  = aws_sqs_queue.parse.arn
+        Condition = {
+          ArnEquals = { "aws:SourceArn" = aws_s3_bucket.resumes.arn }
+        }
+      }
+    ]
+  })
+}
+
+resource "aws_s3_bucket_notification" "batch_uploads" {
+  bucket = aws_s3_bucket.resumes.id
+
+  queue {
+    queue_arn     = aws_sqs_queue.parse.arn
+    events        = ["s3:ObjectCreated:*"]
+    filter_prefix = var.batch_parse_prefix
+    filter_suffix = ".pdf"
+  }
+
+  queue {
+    queue_arn     = aws_sqs_queue.parse.arn
+    events        = ["s3:ObjectCreated:*"]
+    filter_prefix = var.batch_parse_prefix
+    filter_suffix = ".docx"
+  }
+
+  depends_on = [aws_sqs_queue_policy.parse]
+}
+
+resource "aws_lambda_event_source_mapping" "parse_queue" {
+  event_source_arn                   = aws_sqs_queue.parse.arn
+  function_name                      = aws_lambda_function.resume_parser.arn
+  batch_size                         = var.batch_parse_batch_size
+  maximum_batching_window_in_seconds = 5
+  function_response_types            = ["ReportBatchItemFailures"]
+
+  scaling_config {
+    maximum_concurrency = var.batch_parse_max_concurrency
+  }
+}
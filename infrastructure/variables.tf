@@ -39,3 +39,51 @@ variable "s3_force_destroy" {
   type        = bool
   default     = false
 }
+
+variable "parse_cache_expiration_days" {
+  description = "Days before cached resume parse results in S3 expire"
+  type        = number
+  default     = 30
+}
+
+variable "parse_max_file_mb" {
+  description = "Largest resume upload (MB) the parser Lambda will download"
+  type        = number
+  default     = 20
+}
+
+variable "batch_parse_prefix" {
+  description = "S3 key prefix whose .pdf/.docx uploads are parsed asynchronously via SQS"
+  type        = string
+  default     = "batch-uploads/"
+}
+
+variable "batch_parse_batch_size" {
+  description = "Maximum SQS messages delivered to one parser Lambda invocation"
+  type        = number
+  default     = 10
+}
+
+variable "batch_parse_max_concurrency" {
+  description = "Maximum concurrent parser Lambda invocations fed by the parse queue (minimum 2)"
+  type        = number
+  default     = 10
+}
+
+variable "bedrock_requests_per_minute" {
+  description = "Bedrock requests per minute allowed per Lambda container (0 = no client-side limit)"
+  type        = number
+  default     = 0
+}
+
+variable "bedrock_tokens_per_minute" {
+  description = "Bedrock input+output tokens per minute allowed per Lambda container (0 = no client-side limit)"
+  type        = number
+  default     = 0
+}
+
+variable "bedrock_prompt_caching" {
+  description = "Mark static prompt blocks for Bedrock prompt caching (the model must support it)"
+  type        = bool
+  default     = false
+}
@@ -72,15 +72,26 @@ try {
     New-Item -ItemType Directory -Path $ParserDir | Out-Null
 
     # Copy handler and parser files
+    Copy-Item (Join-Path $LambdaSource "resume_parser\batch.py") $ParserDir
     Copy-Item (Join-Path $LambdaSource "resume_parser\handler.py") $ParserDir
     Copy-Item (Join-Path $LambdaSource "resume_parser\parser.py") $ParserDir
+    Copy-Item (Join-Path $LambdaSource "resume_parser\pdf_text.py") $ParserDir
 
     # Copy shared module
     $SharedDir = Join-Path $ParserDir "shared"
     New-Item -ItemType Directory -Path $SharedDir | Out-Null
     Copy-Item (Join-Path $LambdaSource "shared\__init__.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\aws_session.py") $SharedDir
     Copy-Item (Join-Path $LambdaSource "shared\bedrock_client.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\cold_start.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\llm_json.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\parse_cache.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\rate_limiter.py") $SharedDir
     Copy-Item (Join-Path $LambdaSource "shared\s3_client.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\telemetry.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\text_compaction.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\text_store.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\worker_pool.py") $SharedDir
 
     # Create parser zip
     $ParserZip = Join-Path $DistDir "resume-parser.zip"
@@ -100,8 +111,16 @@ try {
     $SharedDir = Join-Path $RankerDir "shared"
     New-Item -ItemType Directory -Path $SharedDir | Out-Null
     Copy-Item (Join-Path $LambdaSource "shared\__init__.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\aws_session.py") $SharedDir
     Copy-Item (Join-Path $LambdaSource "shared\bedrock_client.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\cold_start.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\llm_json.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\parse_cache.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\rate_limiter.py") $SharedDir
     Copy-Item (Join-Path $LambdaSource "shared\s3_client.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\telemetry.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\text_store.py") $SharedDir
+    Copy-Item (Join-Path $LambdaSource "shared\worker_pool.py") $SharedDir
 
     # Create ranker zip
     $RankerZip = Join-Path $DistDir "ranking-agent.zip"
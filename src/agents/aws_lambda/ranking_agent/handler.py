@@ -3,13 +3,54 @@
 import json
 import logging
 
-from ranker import RankingAgent
+from shared.cold_start import ImportProfiler
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# COLD_START_PROFILE=1 logs how long each module-level import below took
+_import_profiler = ImportProfiler.start_if_enabled()
+
+from ranker import RankingAgent
+from shared.aws_session import reset_session
+from shared.rate_limiter import reset_rate_limiters
+from shared.telemetry import instrument_handler
+from shared.worker_pool import Deadline
+
+if _import_profiler is not None:
+    _import_profiler.stop_and_log(logger)
+
+# Built on first use and kept for the life of the container, so warm invocations
+# reuse the Bedrock client, resolved credentials and open connections.
+_agent: RankingAgent | None = None
+
+
+def get_agent() -> RankingAgent:
+    """Return the container-wide ranking agent, creating it on first use.
+
+    Returns:
+        The shared RankingAgent instance.
+    """
+    global _agent
+    if _agent is None:
+        _agent = RankingAgent()
+    return _agent
+
+
+def reset() -> None:
+    """Drop the cached ranking agent.
 
+    Intended for tests that change environment variables or stub AWS clients between
+    invocations; the next invocation builds a fresh client and re-reads credentials.
+    """
+    global _agent
+    _agent = None
+    reset_session()
+    reset_rate_limiters()
+
+
+@instrument_handler("ranking-agent")
 def lambda_handler(event: dict, context) -> dict:
     """AWS Lambda entry point for resume ranking.
 
@@ -22,8 +63,6 @@ def lambda_handler(event: dict, context) -> dict:
     Returns:
         API Gateway response format with ranking results.
     """
-    logger.info(f"Received event: {json.dumps(event)}")
-
     # Handle health check
     if event.get("rawPath") == "/rank/health" or event.get("path") == "/rank/health":
         return _response(200, {"status": "healthy", "service": "ranking-agent"})
@@ -63,10 +102,10 @@ def lambda_handler(event: dict, context) -> dict:
         logger.info(f"Ranking {len(resumes)} resumes for job: {job.get('title')}")
 
         # Rank the resumes
-        agent = RankingAgent()
-        rankings = agent.rank(resumes, job)
+        rankings = get_agent().rank(resumes, job, Deadline.from_context(context))
 
         logger.info(f"Successfully ranked {len(rankings)} resumes")
+        logger.info(f"Bedrock stats: {json.dumps(get_agent().bedrock_stats)}")
         return _response(200, {"rankings": rankings})
 
     except ValueError as e:
@@ -1,20 +1,78 @@
 """Core ranking logic for AWS Lambda."""
 
+import logging
+import os
+
 from shared.bedrock_client import BedrockClient
+from shared.llm_json import json_array
+from shared.worker_pool import Deadline, WorkerPool, get_worker_pool
+
+logger = logging.getLogger(__name__)
+
+# Identical on every call: the first cacheable system block
+RANKING_SYSTEM_PROMPT = """You are an expert technical recruiter AI. Analyze the candidates against the job description and provide structured scoring.
+
+## Scoring Instructions
+For each candidate, provide:
+1. **skill_match_score** (0-100): How well the candidate's skills match the required and preferred skills. Weight required skills more heavily (70%) than preferred skills (30%).
+2. **experience_match_score** (0-100): How well the candidate's experience level matches the job requirement. Consider:
+   - Exact match = 90-100
+   - One level above = 80-90
+   - One level below = 50-70
+   - Two+ levels off = 20-50
+3. **overall_score** (0-100): Weighted combination: 60% skill_match + 40% experience_match
+4. **summary** (1-2 sentences): Brief assessment of fit, noting key strengths and gaps.
+
+## Response Format
+Respond ONLY with valid JSON in this exact structure:
+{
+  "rankings": [
+    {
+      "resume_id": <integer>,
+      "skill_match_score": <float 0-100>,
+      "experience_match_score": <float 0-100>,
+      "overall_score": <float 0-100>,
+      "summary": "<string>"
+    }
+  ]
+}
+
+Do not include any text outside the JSON object. Ensure all resume_ids from the input are represented in the output."""
 
 
 class RankingAgent:
-    """Ranks resumes against job descriptions using AWS Bedrock."""
+    """Ranks resumes against job descriptions using AWS Bedrock.
+
+    Candidates are split into token-budgeted chunks that are scored
+    concurrently. Any resume_id missing from a chunk's response (or belonging to
+    a chunk that failed) is re-requested up to max_retries times, as long as the
+    invocation deadline allows.
+    """
 
-    def __init__(self, bedrock_client: BedrockClient | None = None):
+    def __init__(
+        self,
+        bedrock_client: BedrockClient | None = None,
+        worker_pool: WorkerPool | None = None,
+    ):
         """Initialize the ranking agent.
 
         Args:
             bedrock_client: Bedrock client instance. Created from env vars if not provided.
+            worker_pool: Pool that runs chunk requests. Defaults to the shared pool.
         """
         self._bedrock = bedrock_client or BedrockClient()
+        self._pool = worker_pool or get_worker_pool()
+        self.chunk_token_budget = int(os.environ.get("RANKING_CHUNK_TOKEN_BUDGET", "8000"))
+        self.chunk_max_resumes = int(os.environ.get("RANKING_CHUNK_MAX_RESUMES", "20"))
+        self.chunk_concurrency = int(os.environ.get("RANKING_CHUNK_CONCURRENCY", "4"))
+        self.max_retries = int(os.environ.get("RANKING_MAX_RETRIES", "1"))
+
+    @property
+    def bedrock_stats(self) -> dict:
+        """Bedrock rate limiter counters and token usage, including prompt caching."""
+        return {"rate_limit": self._bedrock.limiter.stats(), "usage": self._bedrock.usage_stats()}
 
-    def rank(self, resumes: list[dict], job: dict) -> list[dict]:
+    def rank(self, resumes: list[dict], job: dict, deadline: Deadline | None = None) -> list[dict]:
         """Rank resumes against a job description.
 
         Args:
@@ -31,9 +89,11 @@ class RankingAgent:
                 - required_skills: list[str]
                 - preferred_skills: list[str]
                 - experience_level: str
+            deadline: Chunks (including retries) are not started once it expires.
 
         Returns:
-            List of ranking dictionaries with keys:
+            List of ranking dictionaries sorted by overall_score (highest
+            first), with keys:
                 - resume_id: int
                 - job_id: str
                 - skill_match_score: float
@@ -41,70 +101,144 @@ class RankingAgent:
                 - overall_score: float
                 - summary: str
         """
-        prompt = self._build_ranking_prompt(resumes, job)
-        parsed = self._bedrock.invoke_json(prompt, max_tokens=4096)
+        scores: dict = {}
+        pending = resumes
+        error = None
+        for _ in range(self.max_retries + 1):
+            results = self._pool.map(
+                lambda chunk: self._rank_chunk(chunk, job, deadline),
+                self._chunk_resumes(pending),
+                deadline=deadline,
+                max_concurrency=self.chunk_concurrency,
+            )
+
+            pending_ids = {r["resume_id"] for r in pending}
+            for result in results:
+                if result.skipped:
+                    error = TimeoutError("Invocation deadline reached before ranking finished")
+                    continue
+                if result.error is not None:
+                    error = result.error
+                    logger.warning(f"Ranking chunk failed: {error}")
+                    continue
+                for ranking in result.value:
+                    # Ignore ids the model invented or repeated from another chunk
+                    if ranking["resume_id"] in pending_ids:
+                        scores[ranking["resume_id"]] = ranking
+
+            pending = [r for r in pending if r["resume_id"] not in scores]
+            if not pending or (deadline is not None and deadline.expired()):
+                break
+
+        if pending:
+            if not scores and error is not None:
+                raise error
+            logger.warning(
+                f"Missing {len(pending)} candidate(s) after retries: "
+                f"{[r['resume_id'] for r in pending]}"
+            )
+
+        return sorted(scores.values(), key=lambda r: r["overall_score"], reverse=True)
+
+    def _rank_chunk(
+        self, resumes: list[dict], job: dict, deadline: Deadline | None = None
+    ) -> list[dict]:
+        """Score one chunk of resumes with a single Bedrock call.
+
+        Args:
+            resumes: Resume data dictionaries for this chunk.
+            job: Job description dictionary.
+            deadline: Bounds the wait for rate limit capacity.
+
+        Returns:
+            List of ranking dictionaries for the resumes the model scored.
+        """
+        prompt = self._build_ranking_prompt(resumes)
+        # Instructions, then the job: chunks of one job share the whole prefix
+        system = [RANKING_SYSTEM_PROMPT, self._build_job_prompt(job)]
+        parsed = self._bedrock.invoke_json(
+            prompt, max_tokens=4096, system=system, deadline=deadline
+        )
 
         rankings = []
-        for item in parsed.get("rankings", []):
-            rankings.append({
-                "resume_id": item["resume_id"],
-                "job_id": job["job_id"],
-                "skill_match_score": round(item["skill_match_score"], 1),
-                "experience_match_score": round(item["experience_match_score"], 1),
-                "overall_score": round(item["overall_score"], 1),
-                "summary": item["summary"],
-            })
+        for item in json_array(parsed, "rankings"):
+            # An invalid item (e.g. the last one of a truncated response) is
+            # dropped; its candidate is re-requested like any missing one
+            try:
+                rankings.append({
+                    "resume_id": item["resume_id"],
+                    "job_id": job["job_id"],
+                    "skill_match_score": round(item["skill_match_score"], 1),
+                    "experience_match_score": round(item["experience_match_score"], 1),
+                    "overall_score": round(item["overall_score"], 1),
+                    "summary": item["summary"],
+                })
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug(f"Dropping invalid ranking item {item!r}: {e}")
 
+        missing = {r["resume_id"] for r in resumes} - {r["resume_id"] for r in rankings}
+        if missing:
+            logger.warning(
+                f"Ranking response is missing {len(missing)} candidate(s): {sorted(missing)}"
+            )
         return rankings
 
-    def _build_ranking_prompt(self, resumes: list[dict], job: dict) -> str:
-        """Build the ranking prompt for the LLM.
+    def _chunk_resumes(self, resumes: list[dict]) -> list[list[dict]]:
+        """Split resumes into chunks whose formatted text fits the token budget.
+
+        Tokens are estimated at four characters each. A resume that alone
+        exceeds the budget still gets a chunk of its own.
 
         Args:
             resumes: List of resume data dictionaries.
-            job: Job description dictionary.
 
         Returns:
-            Formatted prompt string.
+            List of resume chunks.
         """
-        return f"""You are an expert technical recruiter AI. Analyze the following resumes against the job description and provide structured scoring.
+        chunks = []
+        current = []
+        used = 0
+        for r in resumes:
+            tokens = len(self._format_resumes([r])) // 4 + 1
+            if current and (
+                used + tokens > self.chunk_token_budget
+                or len(current) >= self.chunk_max_resumes
+            ):
+                chunks.append(current)
+                current, used = [], 0
+            current.append(r)
+            used += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _build_job_prompt(self, job: dict) -> str:
+        """Build the job description block, shared by every chunk of the job.
+
+        Args:
+            job: Job description dictionary.
 
-## Job Description
+        Returns:
+            Formatted job description.
+        """
+        return f"""## Job Description
 - **Title**: {job['title']}
 - **Description**: {job['description']}
 - **Required Skills**: {', '.join(job['required_skills'])}
 - **Preferred Skills**: {', '.join(job['preferred_skills'])}
-- **Experience Level Required**: {job['experience_level']}
-
-## Candidates to Evaluate
-{self._format_resumes(resumes)}
+- **Experience Level Required**: {job['experience_level']}"""
 
-## Scoring Instructions
-For each candidate, provide:
-1. **skill_match_score** (0-100): How well the candidate's skills match the required and preferred skills. Weight required skills more heavily (70%) than preferred skills (30%).
-2. **experience_match_score** (0-100): How well the candidate's experience level matches the job requirement. Consider:
-   - Exact match = 90-100
-   - One level above = 80-90
-   - One level below = 50-70
-   - Two+ levels off = 20-50
-3. **overall_score** (0-100): Weighted combination: 60% skill_match + 40% experience_match
-4. **summary** (1-2 sentences): Brief assessment of fit, noting key strengths and gaps.
+    def _build_ranking_prompt(self, resumes: list[dict]) -> str:
+        """Build the per-chunk part of the ranking prompt.
 
-## Response Format
-Respond ONLY with valid JSON in this exact structure:
-{{
-  "rankings": [
-    {{
-      "resume_id": <integer>,
-      "skill_match_score": <float 0-100>,
-      "experience_match_score": <float 0-100>,
-      "overall_score": <float 0-100>,
-      "summary": "<string>"
-    }}
-  ]
-}}
+        Args:
+            resumes: List of resume data dictionaries.
 
-Do not include any text outside the JSON object. Ensure all resume_ids from the input are represented in the output."""
+        Returns:
+            Formatted prompt string.
+        """
+        return f"""## Candidates to Evaluate
+{self._format_resumes(resumes)}"""
 
     def _format_resumes(self, resumes: list[dict]) -> str:
         """Format resumes for the prompt.
@@ -0,0 +1,171 @@
+"""Batch parsing of S3 ObjectCreated notifications and SQS messages.
+
+Each uploaded resume is parsed and its result written next to the source
+object as `<key>.parsed.json`. Records in one event are parsed concurrently on
+the shared worker pool; records not started before the invocation deadline
+are treated like retryable failures.
+
+Errors are split by whether a retry can help. Unsupported file types, objects
+over the size limit, missing objects and objects in another bucket are logged
+and dropped. Any other failure, including a model response that could not be
+parsed, marks the record as failed: for SQS it is reported in `batchItemFailures` so only those messages are
+redelivered; for direct S3 notifications the invocation raises so Lambda's
+async retry (and DLQ, if configured) takes over.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from urllib.parse import unquote_plus
+
+from parser import ResumeParser, UnsupportedFileTypeError
+from shared.s3_client import ObjectTooLargeError, S3Client
+from shared.worker_pool import Deadline, get_worker_pool
+
+logger = logging.getLogger(__name__)
+
+RESULT_SUFFIX = ".parsed.json"
+
+
+@dataclass
+class BatchItem:
+    """One resume to parse, and the SQS message it came from (if any)."""
+
+    bucket: str | None
+    key: str
+    message_id: str | None = None
+
+
+def is_record_batch(event: dict) -> bool:
+    """Check whether an event is an S3 notification or an SQS batch.
+
+    Args:
+        event: Lambda event object.
+
+    Returns:
+        True if the event carries S3 or SQS records.
+    """
+    records = event.get("Records")
+    return bool(records) and records[0].get("eventSource") in ("aws:s3", "aws:sqs")
+
+
+def handle_record_batch(
+    event: dict, parser: ResumeParser, deadline: Deadline | None = None
+) -> dict:
+    """Parse every resume referenced by an S3 or SQS event.
+
+    Args:
+        event: S3 notification or SQS batch event.
+        parser: Parser used for every record.
+        deadline: Records are not started once it expires.
+
+    Returns:
+        For SQS events, `{"batchItemFailures": [...]}` listing the message IDs
+        to redeliver. For S3 events, a summary of processed and skipped keys.
+
+    Raises:
+        RuntimeError: If a record from a direct S3 notification failed with an
+            error that a retry might fix.
+    """
+    is_sqs = event["Records"][0].get("eventSource") == "aws:sqs"
+    items = _collect_items(event["Records"])
+
+    results = get_worker_pool().map(
+        lambda item: _parse_item(item, parser, deadline),
+        items,
+        deadline=deadline,
+        max_concurrency=int(os.environ.get("PARSE_BATCH_CONCURRENCY", "4")),
+    )
+    outcomes = ["retry" if r.skipped else r.value for r in results]
+
+    retry = [item for item, outcome in zip(items, outcomes) if outcome == "retry"]
+    processed = outcomes.count("ok")
+    logger.info(
+        f"Batch of {len(items)} resume(s): {processed} parsed, "
+        f"{len(items) - processed - len(retry)} skipped, {len(retry)} to retry"
+    )
+    logger.info(f"Bedrock stats: {json.dumps(parser.bedrock_stats)}")
+
+    if is_sqs:
+        # A message holding several S3 records is redelivered if any of them failed
+        failed_messages = sorted({item.message_id for item in retry})
+        return {"batchItemFailures": [{"itemIdentifier": m} for m in failed_messages]}
+
+    if retry:
+        raise RuntimeError(f"Failed to parse {len(retry)} resume(s): {[i.key for i in retry]}")
+    return {"processed": processed, "skipped": len(items) - processed}
+
+
+def result_key(key: str) -> str:
+    """Return the S3 key the parse result for `key` is written to.
+
+    Args:
+        key: Source object key.
+
+    Returns:
+        Result object key.
+    """
+    return f"{key}{RESULT_SUFFIX}"
+
+
+def _collect_items(records: list[dict]) -> list[BatchItem]:
+    # Malformed messages are dropped rather than retried; redelivery cannot fix them
+    items = []
+    for record in records:
+        if record.get("eventSource") == "aws:s3":
+            items.extend(_s3_items([record]))
+            continue
+
+        message_id = record["messageId"]
+        try:
+            body = json.loads(record["body"])
+        except (KeyError, TypeError, json.JSONDecodeError):
+            logger.error(f"Dropping SQS message {message_id}: body is not JSON")
+            continue
+
+        if "Records" in body:
+            items.extend(_s3_items(body["Records"], message_id))
+        elif "file_path" in body:
+            bucket, key = None, body["file_path"]
+            if key.startswith("s3://"):
+                bucket, key = S3Client.parse_s3_uri(key)
+            items.append(BatchItem(bucket, key, message_id))
+        elif body.get("Event") == "s3:TestEvent":
+            continue
+        else:
+            logger.error(f"Dropping SQS message {message_id}: no S3 records or file_path")
+    return items
+
+
+def _s3_items(records: list[dict], message_id: str | None = None) -> list[BatchItem]:
+    items = []
+    for record in records:
+        if not record.get("eventName", "").startswith("ObjectCreated"):
+            continue
+        key = unquote_plus(record["s3"]["object"]["key"])
+        # Our own output lands in the same bucket; never parse it
+        if key.endswith(RESULT_SUFFIX):
+            continue
+        items.append(BatchItem(record["s3"]["bucket"]["name"], key, message_id))
+    return items
+
+
+def _parse_item(item: BatchItem, parser: ResumeParser, deadline: Deadline | None = None) -> str:
+    """Parse one resume and store the result; returns "ok", "skipped" or "retry"."""
+    if item.bucket is not None and item.bucket != parser.bucket_name:
+        logger.error(
+            f"Skipping {item.key}: bucket {item.bucket} is not the configured "
+            f"bucket {parser.bucket_name}"
+        )
+        return "skipped"
+    try:
+        result = parser.parse(item.key, deadline)
+        parser.store_result(result_key(item.key), result)
+        return "ok"
+    except (UnsupportedFileTypeError, ObjectTooLargeError, FileNotFoundError) as e:
+        logger.error(f"Skipping {item.key}: {e}")
+        return "skipped"
+    except Exception as e:
+        logger.exception(f"Failed to parse {item.key}: {e}")
+        return "retry"
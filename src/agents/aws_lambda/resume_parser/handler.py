@@ -4,26 +4,77 @@ import json
 import logging
 import os
 
-from parser import ResumeParser
+from shared.cold_start import ImportProfiler
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# COLD_START_PROFILE=1 logs how long each module-level import below took
+_import_profiler = ImportProfiler.start_if_enabled()
+
+from batch import handle_record_batch, is_record_batch
+from parser import ResumeParser
+from shared.aws_session import reset_session
+from shared.parse_cache import reset_parse_cache
+from shared.rate_limiter import reset_rate_limiters
+from shared.s3_client import ObjectTooLargeError
+from shared.telemetry import instrument_handler
+from shared.text_store import reset_text_store
+from shared.worker_pool import Deadline
+
+if _import_profiler is not None:
+    _import_profiler.stop_and_log(logger)
+
+# Built on first use and kept for the life of the container, so warm invocations
+# reuse the AWS clients, resolved credentials and open connections.
+_parser: ResumeParser | None = None
+
+
+def get_parser() -> ResumeParser:
+    """Return the container-wide parser, creating it on first use.
+
+    Returns:
+        The shared ResumeParser instance.
+    """
+    global _parser
+    if _parser is None:
+        _parser = ResumeParser()
+    return _parser
+
+
+def reset() -> None:
+    """Drop the cached parser, parse cache and text store.
+
+    Intended for tests that change environment variables or stub AWS clients between
+    invocations; the next invocation builds fresh clients and re-reads credentials.
+    """
+    global _parser
+    _parser = None
+    reset_parse_cache()
+    reset_text_store()
+    reset_session()
+    reset_rate_limiters()
+
 
+@instrument_handler("resume-parser")
 def lambda_handler(event: dict, context) -> dict:
     """AWS Lambda entry point for resume parsing.
 
-    Handles both API Gateway proxy events and direct Lambda invocations.
+    Handles API Gateway proxy events and direct Lambda invocations, plus S3
+    ObjectCreated notifications and SQS batches for asynchronous bulk parsing.
 
     Args:
         event: Lambda event containing the request.
         context: Lambda context object.
 
     Returns:
-        API Gateway response format with parsed resume data.
+        API Gateway response format with parsed resume data, or for S3/SQS
+        events the batch summary from handle_record_batch().
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    # S3 notifications and SQS batches; results are written back to S3
+    if is_record_batch(event):
+        return handle_record_batch(event, get_parser(), Deadline.from_context(context))
 
     # Handle health check
     if event.get("rawPath") == "/parse/health" or event.get("path") == "/parse/health":
@@ -43,12 +94,14 @@ def lambda_handler(event: dict, context) -> dict:
         logger.info(f"Parsing resume: {file_path}")
 
         # Parse the resume
-        parser = ResumeParser()
-        result = parser.parse(file_path)
+        result = get_parser().parse(file_path, Deadline.from_context(context))
 
         logger.info(f"Successfully parsed resume for: {result.get('candidate_name')}")
         return _response(200, result)
 
+    except ObjectTooLargeError as e:
+        logger.warning(f"Rejected upload: {e}")
+        return _response(413, {"error": str(e)})
     except FileNotFoundError as e:
         logger.error(f"File not found: {e}")
         return _response(404, {"error": str(e)})
@@ -2,62 +2,259 @@
 
 import json
 import os
-import tempfile
 from pathlib import Path
 from typing import BinaryIO
 
 from shared.bedrock_client import BedrockClient
+from shared.llm_json import json_array, load_json_object
+from shared.parse_cache import get_parse_cache, make_cache_key, stream_digest
 from shared.s3_client import S3Client
+from shared.telemetry import timed
+from shared.text_compaction import COMPACTION_VERSION, compact_resume_text
+from shared.text_store import S3TextStore, get_text_store, text_key
+from shared.worker_pool import Deadline, WorkerPool, get_worker_pool
+
+from pdf_text import extract_pdf_text
+
+# Bump whenever the prompt changes so cached parse results are invalidated.
+PROMPT_VERSION = "3"
+
+# Identical on every call, so it is sent as a cacheable system block
+PARSE_SYSTEM_PROMPT = """You analyze resume text and extract structured information.
+
+## Instructions
+Extract the following and respond ONLY with valid JSON:
+{
+  "candidate_name": "<full name of the candidate>",
+  "skills": ["<list of technical and professional skills mentioned>"],
+  "experience_level": "<one of: Junior, Mid, Senior, based on years of experience and role titles>",
+  "summary": "<2-3 sentence professional summary of the candidate>",
+  "suitable_roles": [
+    {"role": "<job title>", "score": <1-10>},
+    ...
+  ]
+}
+
+Rules:
+- For candidate_name: Extract the person's full name. It's usually at the top of the resume.
+- For skills: List all specific technical skills, tools, frameworks, certifications, and professional competencies mentioned. Be thorough but only include skills explicitly stated.
+- For experience_level: Junior = 0-2 years or entry-level titles, Mid = 3-6 years or mid-level titles, Senior = 7+ years or senior/lead/principal titles.
+- For summary: Write a brief professional summary based on the resume content.
+- For suitable_roles: Based on the candidate's skills and experience, suggest 3-6 job titles/roles they could realistically perform with a suitability score:
+  - Score 9-10: Excellent fit - candidate's primary expertise matches this role
+  - Score 7-8: Good fit - candidate has strong relevant skills
+  - Score 5-6: Moderate fit - candidate could transition with some upskilling
+  - Score 3-4: Stretch role - significant skill gaps but transferable experience
+  - Score 1-2: Weak fit - minimal alignment
+  - Sort roles by score (highest first)
+
+Respond ONLY with the JSON object, no other text."""
+
+
+class UnsupportedFileTypeError(ValueError):
+    """Raised when a resume is neither a PDF nor a DOCX file."""
 
 
 class ResumeParser:
     """Parses resume files from S3 into structured data using AWS Bedrock."""
 
-    def __init__(self, s3_client: S3Client | None = None, bedrock_client: BedrockClient | None = None):
+    def __init__(
+        self,
+        s3_client: S3Client | None = None,
+        bedrock_client: BedrockClient | None = None,
+        cache=None,
+        worker_pool: WorkerPool | None = None,
+        text_store: S3TextStore | None = None,
+    ):
         """Initialize the parser.
 
         Args:
             s3_client: S3 client instance. Created from env vars if not provided.
             bedrock_client: Bedrock client instance. Created from env vars if not provided.
+            cache: Parse result cache. Defaults to the cache configured by
+                PARSE_CACHE_BACKEND (disabled unless set).
+            worker_pool: Pool whose CPU slots bound concurrent text extraction.
+                Defaults to the shared pool.
+            text_store: Store of extracted text, reused across parses of the same
+                file. Defaults to the store configured by TEXT_STORE_PREFIX
+                (disabled unless set).
         """
         self._s3 = s3_client or S3Client()
         self._bedrock = bedrock_client or BedrockClient()
-
-    def parse(self, s3_key: str) -> dict:
+        self.cache = cache if cache is not None else get_parse_cache(self._s3)
+        self._pool = worker_pool or get_worker_pool()
+        self.text_store = text_store if text_store is not None else get_text_store(self._s3)
+        # Uploads are rejected above this size; below the spool size they stay in memory
+        self.max_file_bytes = int(float(os.environ.get("PARSE_MAX_FILE_MB", "20")) * 1024 * 1024)
+        self.spool_bytes = int(float(os.environ.get("PARSE_SPOOL_MEMORY_MB", "8")) * 1024 * 1024)
+        # PDF extraction stops after this many characters; the text is then
+        # compacted into the prompt's token budget
+        self.extract_char_limit = int(os.environ.get("PARSE_EXTRACT_CHAR_LIMIT", "24000"))
+        self.text_token_budget = int(os.environ.get("PARSE_TEXT_TOKEN_BUDGET", "750"))
+        self.pdf_backend = os.environ.get("PDF_TEXT_BACKEND", "auto")
+
+    @property
+    def bucket_name(self) -> str:
+        """Name of the S3 bucket resumes are read from."""
+        return self._s3.bucket_name
+
+    @property
+    def bedrock_stats(self) -> dict:
+        """Bedrock rate limiter counters and token usage, including prompt caching."""
+        return {"rate_limit": self._bedrock.limiter.stats(), "usage": self._bedrock.usage_stats()}
+
+    def parse(self, s3_key: str, deadline: Deadline | None = None) -> dict:
         """Parse a resume file from S3.
 
         Args:
             s3_key: S3 object key or full S3 URI (s3://bucket/key).
+            deadline: Invocation deadline; bounds the wait for Bedrock rate
+                limit capacity.
 
         Returns:
             Parsed resume data as a dictionary.
 
         Raises:
-            ValueError: If the file type is unsupported.
+            UnsupportedFileTypeError: If the file type is unsupported.
+            ObjectTooLargeError: If the file is larger than PARSE_MAX_FILE_MB.
+            FileNotFoundError: If the file doesn't exist in S3.
+            ValueError: If the model's response cannot be parsed as JSON.
+            RuntimeError: If the model invocation fails.
+        """
+        s3_key, ext = self._resolve_key(s3_key)
+        with self._download(s3_key) as file_stream:
+            digest = None
+            if self.cache is not None or self.text_store is not None:
+                digest = stream_digest(file_stream)
+
+            # Identical bytes parsed with the same model, prompt and text settings
+            # give the same result
+            cache_key = None
+            if self.cache is not None:
+                cache_key = make_cache_key(
+                    digest,
+                    self._bedrock.model_id,
+                    PROMPT_VERSION,
+                    settings=(
+                        self.pdf_backend,
+                        self.extract_char_limit,
+                        self.text_token_budget,
+                        COMPACTION_VERSION,
+                    ),
+                )
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            text = self._extracted_text(file_stream, ext, digest)
+        with self._pool.cpu_slot():
+            text = compact_resume_text(text, self.text_token_budget)
+
+        # Use LLM to extract structured data
+        result, complete = self._extract_structured_data(text, s3_key, deadline)
+        # A result repaired from a truncated response is not cached, so the next
+        # parse of the file asks again instead of serving it for the whole TTL
+        if cache_key is not None and text.strip() and complete:
+            self.cache.set(cache_key, result)
+        return result
+
+    def extract_text(self, s3_key: str) -> str:
+        """Extract the full text of a resume file from S3, before compaction.
+
+        The text is read from and kept in the text store when one is
+        configured, so files can be pre-extracted ahead of parsing.
+
+        Args:
+            s3_key: S3 object key or full S3 URI (s3://bucket/key).
+
+        Returns:
+            The extracted text.
+
+        Raises:
+            UnsupportedFileTypeError: If the file type is unsupported.
+            ObjectTooLargeError: If the file is larger than PARSE_MAX_FILE_MB.
             FileNotFoundError: If the file doesn't exist in S3.
         """
+        s3_key, ext = self._resolve_key(s3_key)
+        with self._download(s3_key) as file_stream:
+            digest = stream_digest(file_stream) if self.text_store is not None else None
+            return self._extracted_text(file_stream, ext, digest)
+
+    def store_result(self, s3_key: str, result: dict) -> str:
+        """Write a parse result to S3 as JSON.
+
+        Args:
+            s3_key: Destination object key.
+            result: Parsed resume data from parse().
+
+        Returns:
+            The S3 URI of the stored result.
+
+        Raises:
+            RuntimeError: If the upload fails.
+        """
+        return self._s3.upload_file(
+            s3_key, json.dumps(result).encode("utf-8"), content_type="application/json"
+        )
+
+    def _resolve_key(self, s3_key: str) -> tuple[str, str]:
+        """Normalize an S3 URI or key and check the file type.
+
+        Args:
+            s3_key: S3 object key or full S3 URI (s3://bucket/key).
+
+        Returns:
+            The object key and its lowercased extension.
+
+        Raises:
+            UnsupportedFileTypeError: If the file type is unsupported.
+        """
         # Handle both S3 URI and plain key formats
         if s3_key.startswith("s3://"):
             _, s3_key = S3Client.parse_s3_uri(s3_key)
 
         ext = Path(s3_key).suffix.lower()
         if ext not in (".pdf", ".docx"):
-            raise ValueError(f"Unsupported file type: {ext}")
+            raise UnsupportedFileTypeError(f"Unsupported file type: {ext}")
+        return s3_key, ext
 
-        # Download file from S3
-        file_stream = self._s3.download_file_to_stream(s3_key)
+    def _download(self, s3_key: str) -> BinaryIO:
+        """Stream a file from S3; large files spill to /tmp instead of memory."""
+        with timed("DownloadTime"):
+            return self._s3.download_file_to_stream(
+                s3_key, max_bytes=self.max_file_bytes, spool_bytes=self.spool_bytes
+            )
 
-        # Extract text based on file type
-        if ext == ".pdf":
-            text = self._extract_pdf(file_stream)
-        else:
-            text = self._extract_docx(file_stream)
+    def _extracted_text(self, file_stream: BinaryIO, ext: str, digest: str | None) -> str:
+        """Extract text, or read it from the text store when it was extracted before.
 
-        # Use LLM to extract structured data
-        return self._extract_structured_data(text, s3_key)
+        Args:
+            file_stream: File as a binary stream.
+            ext: Lowercased file extension.
+            digest: Content digest of the file; None skips the text store.
+
+        Returns:
+            Extracted text content.
+        """
+        key = None
+        if self.text_store is not None and digest is not None:
+            key = text_key(digest, self.pdf_backend, self.extract_char_limit)
+            text = self.text_store.get(key)
+            if text is not None:
+                return text
+
+        # CPU-bound, so bounded to the vCPU count
+        with self._pool.cpu_slot(), timed("ExtractionTime"):
+            if ext == ".pdf":
+                text = self._extract_pdf(file_stream)
+            else:
+                text = self._extract_docx(file_stream)
+        if key is not None:
+            self.text_store.put(key, text)
+        return text
 
     def _extract_pdf(self, file_stream: BinaryIO) -> str:
-        """Extract text from a PDF file stream.
+        """Extract text from a PDF file stream, up to PARSE_EXTRACT_CHAR_LIMIT characters.
 
         Args:
             file_stream: PDF file as a binary stream.
@@ -65,15 +262,7 @@ class ResumeParser:
         Returns:
             Extracted text content.
         """
-        import pdfplumber
-
-        text_parts = []
-        with pdfplumber.open(file_stream) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-        return "\n".join(text_parts)
+        return extract_pdf_text(file_stream, self.extract_char_limit, self.pdf_backend)
 
     def _extract_docx(self, file_stream: BinaryIO) -> str:
         """Extract text from a DOCX file stream.
@@ -89,15 +278,23 @@ class ResumeParser:
         doc = Document(file_stream)
         return "\n".join(para.text for para in doc.paragraphs if para.text.strip())
 
-    def _extract_structured_data(self, text: str, file_path: str) -> dict:
+    def _extract_structured_data(
+        self, text: str, file_path: str, deadline: Deadline | None = None
+    ) -> tuple[dict, bool]:
         """Use LLM to extract structured resume data.
 
         Args:
-            text: Raw text extracted from the resume.
+            text: Compacted text extracted from the resume.
             file_path: Original file path (for fallback name extraction).
+            deadline: Invocation deadline for the Bedrock call.
 
         Returns:
-            Parsed resume data dictionary.
+            Parsed resume data dictionary, and whether the model's response was
+            complete (False if it was repaired from a truncated response).
+
+        Raises:
+            ValueError: If the response cannot be parsed as JSON.
+            RuntimeError: If the model invocation fails.
         """
         if not text.strip():
             return {
@@ -106,45 +303,20 @@ class ResumeParser:
                 "experience_level": "Unknown",
                 "summary": None,
                 "suitable_roles": [],  # Empty list, format compatible with new structure
-            }
+            }, True
 
         prompt = f"""Analyze the following resume text and extract structured information.
 
 ## Resume Text
-{text[:3000]}
-
-## Instructions
-Extract the following and respond ONLY with valid JSON:
-{{
-  "candidate_name": "<full name of the candidate>",
-  "skills": ["<list of technical and professional skills mentioned>"],
-  "experience_level": "<one of: Junior, Mid, Senior, based on years of experience and role titles>",
-  "summary": "<2-3 sentence professional summary of the candidate>",
-  "suitable_roles": [
-    {{"role": "<job title>", "score": <1-10>}},
-    ...
-  ]
-}}
-
-Rules:
-- For candidate_name: Extract the person's full name. It's usually at the top of the resume.
-- For skills: List all specific technical skills, tools, frameworks, certifications, and professional competencies mentioned. Be thorough but only include skills explicitly stated.
-- For experience_level: Junior = 0-2 years or entry-level titles, Mid = 3-6 years or mid-level titles, Senior = 7+ years or senior/lead/principal titles.
-- For summary: Write a brief professional summary based on the resume content.
-- For suitable_roles: Based on the candidate's skills and experience, suggest 3-6 job titles/roles they could realistically perform with a suitability score:
-  - Score 9-10: Excellent fit - candidate's primary expertise matches this role
-  - Score 7-8: Good fit - candidate has strong relevant skills
-  - Score 5-6: Moderate fit - candidate could transition with some upskilling
-  - Score 3-4: Stretch role - significant skill gaps but transferable experience
-  - Score 1-2: Weak fit - minimal alignment
-  - Sort roles by score (highest first)
-
-Respond ONLY with the JSON object, no other text."""
+{text}"""
 
-        parsed = self._bedrock.invoke_json(prompt, max_tokens=1024)
+        response_text = self._bedrock.invoke(
+            prompt, max_tokens=1024, system=[PARSE_SYSTEM_PROMPT], deadline=deadline
+        )
+        parsed, complete = load_json_object(response_text)
 
         # Parse suitable_roles - handle both old (list[str]) and new (list[dict]) formats
-        raw_roles = parsed.get("suitable_roles", [])
+        raw_roles = json_array(parsed, "suitable_roles")
         suitable_roles = []
         for item in raw_roles:
             if isinstance(item, dict):
@@ -158,8 +330,8 @@ Respond ONLY with the JSON object, no other text."""
 
         return {
             "candidate_name": parsed.get("candidate_name", Path(file_path).stem),
-            "skills": parsed.get("skills", []),
+            "skills": json_array(parsed, "skills"),
             "experience_level": parsed.get("experience_level", "Unknown"),
             "summary": parsed.get("summary"),
             "suitable_roles": suitable_roles,
-        }
+        }, complete
@@ -0,0 +1,89 @@
+"""PDF text extraction that stops once the character budget is filled.
+
+Lambda has no /dev/shm, so multiprocessing pools are unavailable; the savings
+here come from the faster pypdfium2 backend and from not reading pages past
+the budget.
+"""
+
+import threading
+from typing import BinaryIO
+
+from shared.text_compaction import PAGE_BREAK
+
+PDF_BACKENDS = ("auto", "pdfium", "pdfplumber")
+
+# PDFium is not thread-safe; batch parsing extracts on several threads
+_pdfium_lock = threading.Lock()
+
+
+def extract_pdf_text(file_stream: BinaryIO, char_limit: int, backend: str = "auto") -> str:
+    """Extract text from a PDF until at least `char_limit` characters are collected.
+
+    Args:
+        file_stream: PDF file as a seekable binary stream.
+        char_limit: Number of characters after which remaining pages are skipped.
+        backend: "pdfium", "pdfplumber", or "auto" to use pdfium and fall back
+            to the layout-aware pdfplumber if it fails or finds no text.
+
+    Returns:
+        Text of the pages read, separated by PAGE_BREAK.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF text backend: {backend}")
+    if backend == "pdfplumber":
+        return _extract_pdfplumber(file_stream, char_limit)
+    if backend == "pdfium":
+        return _extract_pdfium(file_stream, char_limit)
+
+    try:
+        text = _extract_pdfium(file_stream, char_limit)
+    except Exception:
+        text = ""
+    if text.strip():
+        return text
+    file_stream.seek(0)
+    return _extract_pdfplumber(file_stream, char_limit)
+
+
+def _extract_pdfium(file_stream: BinaryIO, char_limit: int) -> str:
+    import pypdfium2 as pdfium
+
+    parts, size = [], 0
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(file_stream)
+        try:
+            for index in range(len(pdf)):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    page_text = textpage.get_text_bounded().replace("\r\n", "\n").strip()
+                finally:
+                    textpage.close()
+                    page.close()
+                if page_text:
+                    parts.append(page_text)
+                    size += len(page_text) + 1
+                if size >= char_limit:
+                    break
+        finally:
+            pdf.close()
+    return PAGE_BREAK.join(parts)
+
+
+def _extract_pdfplumber(file_stream: BinaryIO, char_limit: int) -> str:
+    import pdfplumber
+
+    parts, size = [], 0
+    with pdfplumber.open(file_stream) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            page.close()
+            if page_text:
+                parts.append(page_text)
+                size += len(page_text) + 1
+            if size >= char_limit:
+                break
+    return PAGE_BREAK.join(parts)
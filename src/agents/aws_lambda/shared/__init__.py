@@ -1,5 +1,42 @@
-# Shared utilities for AWS Lambda functions
-from .bedrock_client import BedrockClient
-from .s3_client import S3Client
+# Shared utilities for AWS Lambda functions.
+#
+# Exports are resolved lazily so that importing one submodule (for example
+# shared.bedrock_client in the ranking Lambda) does not load the others and
+# their dependencies during a cold start.
+import importlib
 
-__all__ = ["BedrockClient", "S3Client"]
+_EXPORTS = {
+    "BedrockClient": ".bedrock_client",
+    "Deadline": ".worker_pool",
+    "ImportProfiler": ".cold_start",
+    "InvocationMetrics": ".telemetry",
+    "MemoryParseCache": ".parse_cache",
+    "ObjectTooLargeError": ".s3_client",
+    "RateLimiter": ".rate_limiter",
+    "S3Client": ".s3_client",
+    "S3ParseCache": ".parse_cache",
+    "S3TextStore": ".text_store",
+    "WorkerPool": ".worker_pool",
+    "get_parse_cache": ".parse_cache",
+    "get_rate_limiter": ".rate_limiter",
+    "get_text_store": ".text_store",
+    "get_worker_pool": ".worker_pool",
+    "instrument_handler": ".telemetry",
+    "load_json_object": ".llm_json",
+    "record": ".telemetry",
+    "reset_parse_cache": ".parse_cache",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
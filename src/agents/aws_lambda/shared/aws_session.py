@@ -0,0 +1,35 @@
+"""Process-wide botocore session for the Lambda clients.
+
+The clients are created from botocore directly rather than through boto3:
+importing boto3 also loads s3transfer and its dependencies, which adds
+20-30 ms to every cold start and is never used here. Sharing one session, as
+boto3's default session does, resolves credentials and loads config once.
+"""
+
+import botocore.session
+from botocore.config import Config
+
+_session: botocore.session.Session | None = None
+
+
+def create_client(service_name: str, region_name: str, config: Config | None = None):
+    """Create a low-level client from the shared session.
+
+    Args:
+        service_name: AWS service name, e.g. "s3" or "bedrock-runtime".
+        region_name: AWS region.
+        config: Optional botocore client configuration.
+
+    Returns:
+        A botocore client, equivalent to boto3.client(...).
+    """
+    global _session
+    if _session is None:
+        _session = botocore.session.get_session()
+    return _session.create_client(service_name, region_name=region_name, config=config)
+
+
+def reset_session() -> None:
+    """Forget the shared session so the next client re-reads credentials and config."""
+    global _session
+    _session = None
@@ -2,44 +2,89 @@
 
 import json
 import os
+import threading
+import time
 from typing import Any
 
-import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
+from botocore.exceptions import ConnectionError as BotocoreConnectionError
+
+from .aws_session import create_client
+from .llm_json import load_json_object
+from .rate_limiter import BACKOFF_BASE_SECONDS, RateLimiter, get_rate_limiter
+from .telemetry import record, timed
+from .worker_pool import Deadline
+
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+# Error codes retried through the rate limiter's backoff
+THROTTLING_ERROR_CODES = {"ThrottlingException", "ServiceUnavailableException"}
 
 
 class BedrockClient:
-    """Wrapper for AWS Bedrock Runtime to invoke Claude models."""
+    """Wrapper for AWS Bedrock Runtime to invoke Claude models.
+
+    Calls go through the container-wide RateLimiter for the model: they queue
+    for request and token capacity, and throttled calls are retried after a
+    backoff instead of failing.
 
-    def __init__(self, model_id: str | None = None, region: str | None = None):
+    With BEDROCK_PROMPT_CACHING enabled, a system prompt passed as a list of
+    blocks gets a cache breakpoint after each block. Only some models support
+    prompt caching on Bedrock (Claude 3.5 Haiku, 3.7 Sonnet and later, not the
+    default Claude 3 Sonnet), so it is off by default.
+    """
+
+    def __init__(
+        self,
+        model_id: str | None = None,
+        region: str | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
         """Initialize the Bedrock client.
 
         Args:
             model_id: Bedrock model ID. Defaults to BEDROCK_MODEL_ID env var.
             region: AWS region. Defaults to AWS_REGION env var or us-east-1.
+            rate_limiter: Limiter for this model. Defaults to the shared one
+                configured by BEDROCK_REQUESTS_PER_MINUTE and BEDROCK_TOKENS_PER_MINUTE.
         """
         self.model_id = model_id or os.environ.get(
             "BEDROCK_MODEL_ID", "anthropic.claude-3-sonnet-20240229-v1:0"
         )
         self.region = region or os.environ.get("AWS_REGION", "us-east-1")
+        self.limiter = rate_limiter or get_rate_limiter(self.model_id)
+        self.max_attempts = int(os.environ.get("BEDROCK_MAX_ATTEMPTS", "8"))
+        self.max_wait_seconds = float(os.environ.get("BEDROCK_MAX_WAIT_SECONDS", "60"))
+        self.prompt_caching = os.environ.get("BEDROCK_PROMPT_CACHING", "false").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+        self._usage = dict.fromkeys(("requests",) + USAGE_FIELDS, 0)
+        self._usage_lock = threading.Lock()
 
-        # Configure retry behavior
+        # Retries are done in invoke() so throttling goes through the limiter
         config = Config(
-            retries={"max_attempts": 3, "mode": "adaptive"},
+            retries={"total_max_attempts": 1, "mode": "standard"},
             read_timeout=120,
             connect_timeout=10,
         )
 
-        self._client = boto3.client(
-            "bedrock-runtime", region_name=self.region, config=config
-        )
+        self._client = create_client("bedrock-runtime", self.region, config)
 
     def invoke(
         self,
         prompt: str,
         max_tokens: int = 4096,
         temperature: float = 0.0,
-        system: str | None = None,
+        system: str | list[str] | None = None,
+        deadline: Deadline | None = None,
     ) -> str:
         """Invoke the Claude model with a prompt.
 
@@ -47,13 +92,18 @@ class BedrockClient:
             prompt: The user message/prompt to send.
             max_tokens: Maximum tokens in the response.
             temperature: Sampling temperature (0.0-1.0).
-            system: Optional system prompt.
+            system: Optional system prompt. A list is sent as separate blocks,
+                most stable first, each cacheable when prompt caching is on.
+            deadline: Invocation deadline; queueing for rate limit capacity
+                stops when it expires, even within BEDROCK_MAX_WAIT_SECONDS.
 
         Returns:
             The model's response text.
 
         Raises:
-            RuntimeError: If the model invocation fails.
+            RuntimeError: If the model invocation fails, or is still throttled
+                after BEDROCK_MAX_ATTEMPTS attempts, BEDROCK_MAX_WAIT_SECONDS
+                or the deadline.
         """
         messages = [{"role": "user", "content": prompt}]
 
@@ -64,38 +114,80 @@ class BedrockClient:
             "temperature": temperature,
         }
 
-        if system:
+        system_chars = 0
+        if isinstance(system, list):
+            body["system"] = [self._system_block(text) for text in system]
+            system_chars = sum(len(text) for text in system)
+        elif system:
             body["system"] = system
-
-        try:
-            response = self._client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(body),
-                contentType="application/json",
-                accept="application/json",
-            )
-
-            response_body = json.loads(response["body"].read())
+            system_chars = len(system)
+
+        # Bedrock charges input plus max_tokens up front; ~4 characters per token
+        reserved = (len(prompt) + system_chars) // 4 + max_tokens
+        started = time.monotonic()
+        for attempt in range(1, self.max_attempts + 1):
+            max_wait = self.max_wait_seconds - (time.monotonic() - started)
+            if deadline is not None:
+                max_wait = min(max_wait, deadline.remaining_ms() / 1000)
+            try:
+                self.limiter.acquire(reserved, max_wait=max_wait)
+            except TimeoutError as e:
+                raise RuntimeError(f"Bedrock rate limit exceeded: {e}") from e
+
+            # Tokens used by a successful call; any other outcome releases the
+            # whole reservation, so retries do not pile up debt in the bucket
+            used = None
+            try:
+                with timed("BedrockLatency"):
+                    response = self._client.invoke_model(
+                        modelId=self.model_id,
+                        body=json.dumps(body),
+                        contentType="application/json",
+                        accept="application/json",
+                    )
+                response_body = json.loads(response["body"].read())
+                usage = response_body.get("usage")
+                used = self._record_usage(usage) if usage else reserved
+            except ClientError as e:
+                # Matched by code: older botocore models lack some of these
+                # exception classes on the client
+                error_code = e.response.get("Error", {}).get("Code", "")
+                if error_code == "ModelTimeoutException":
+                    raise RuntimeError(f"Bedrock model timeout: {e}") from e
+                if error_code not in THROTTLING_ERROR_CODES:
+                    raise RuntimeError(f"Bedrock invocation failed: {e}") from e
+                record("BedrockThrottles", 1, "Count")
+                if attempt == self.max_attempts:
+                    raise RuntimeError(
+                        f"Bedrock rate limit exceeded after {attempt} attempts: {e}"
+                    ) from e
+                self.limiter.throttled()
+                continue
+            except BotocoreConnectionError as e:
+                if attempt == self.max_attempts:
+                    raise RuntimeError(f"Bedrock invocation failed: {e}") from e
+                time.sleep(BACKOFF_BASE_SECONDS * attempt)
+                continue
+            except Exception as e:
+                raise RuntimeError(f"Bedrock invocation failed: {e}") from e
+            finally:
+                if used is None:
+                    self.limiter.release(reserved)
+                else:
+                    self.limiter.settle(reserved, used)
 
             # Extract text from the response
             if "content" in response_body and len(response_body["content"]) > 0:
                 return response_body["content"][0]["text"]
-            else:
-                raise RuntimeError("No content in Bedrock response")
-
-        except self._client.exceptions.ThrottlingException as e:
-            raise RuntimeError(f"Bedrock rate limit exceeded: {e}") from e
-        except self._client.exceptions.ModelTimeoutException as e:
-            raise RuntimeError(f"Bedrock model timeout: {e}") from e
-        except Exception as e:
-            raise RuntimeError(f"Bedrock invocation failed: {e}") from e
+            raise RuntimeError("No content in Bedrock response")
 
     def invoke_json(
         self,
         prompt: str,
         max_tokens: int = 4096,
         temperature: float = 0.0,
-        system: str | None = None,
+        system: str | list[str] | None = None,
+        deadline: Deadline | None = None,
     ) -> dict[str, Any]:
         """Invoke the model and parse the response as JSON.
 
@@ -103,23 +195,43 @@ class BedrockClient:
             prompt: The user message/prompt to send.
             max_tokens: Maximum tokens in the response.
             temperature: Sampling temperature (0.0-1.0).
-            system: Optional system prompt.
+            system: Optional system prompt; see invoke().
+            deadline: Invocation deadline; see invoke().
 
         Returns:
-            The parsed JSON response.
+            The parsed JSON response. A truncated response is repaired and
+            keeps its complete values; see shared.llm_json.
 
         Raises:
             ValueError: If the response cannot be parsed as JSON.
             RuntimeError: If the model invocation fails.
         """
-        response_text = self.invoke(prompt, max_tokens, temperature, system)
-
-        try:
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            # Try to extract JSON from the response
-            start = response_text.find("{")
-            end = response_text.rfind("}") + 1
-            if start >= 0 and end > start:
-                return json.loads(response_text[start:end])
-            raise ValueError(f"Failed to parse response as JSON: {response_text[:200]}")
+        response_text = self.invoke(prompt, max_tokens, temperature, system, deadline)
+        parsed, _ = load_json_object(response_text)
+        return parsed
+
+    def usage_stats(self) -> dict:
+        """Token totals for this client, including prompt cache reads and writes.
+
+        Returns:
+            Request count and summed usage fields from the responses.
+        """
+        with self._usage_lock:
+            return dict(self._usage)
+
+    def _system_block(self, text: str) -> dict:
+        block = {"type": "text", "text": text}
+        # A prefix below the model's minimum (1024 tokens, 2048 for Haiku) is not cached
+        if self.prompt_caching:
+            block["cache_control"] = {"type": "ephemeral"}
+        return block
+
+    def _record_usage(self, usage: dict) -> int:
+        """Add a response's usage to the totals; returns the tokens it used."""
+        with self._usage_lock:
+            self._usage["requests"] += 1
+            for field in USAGE_FIELDS:
+                self._usage[field] += usage.get(field) or 0
+        record("InputTokens", usage.get("input_tokens") or 0, "Count")
+        record("OutputTokens", usage.get("output_tokens") or 0, "Count")
+        return sum(usage.get(field) or 0 for field in USAGE_FIELDS)
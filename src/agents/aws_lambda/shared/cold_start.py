@@ -0,0 +1,123 @@
+"""Import-time profiling for Lambda cold starts.
+
+Lambda does not let us pass `-X importtime` to the interpreter. Two options:
+
+- Set PYTHONPROFILEIMPORTTIME=1 on the function. The interpreter writes the
+  raw `-X importtime` trace to stderr, which lands in CloudWatch Logs.
+- Set COLD_START_PROFILE=1. The handlers then time their own module-level
+  imports with ImportProfiler and log one summary line with the total and the
+  slowest modules.
+
+This module only uses the standard library, so importing it costs nothing
+measurable when profiling is off.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ExtensionFileLoader, SourceFileLoader, SourcelessFileLoader
+
+# Loaders created per module; builtin, frozen and zip importers are shared instances
+_PER_MODULE_LOADERS = (SourceFileLoader, SourcelessFileLoader, ExtensionFileLoader)
+
+
+class ImportProfiler(MetaPathFinder):
+    """Times every module executed between start() and stop().
+
+    It sits first on sys.meta_path, resolves the spec through the remaining
+    finders, and wraps `exec_module` on the loader when the loader is a
+    per-module instance (source, bytecode and extension modules). Self time
+    excludes nested imports, as in `-X importtime`.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, tuple[float, float]] = {}
+        self._stack: list[float] = []
+        self._started = 0.0
+        self.total_ms = 0.0
+
+    @classmethod
+    def start_if_enabled(cls) -> "ImportProfiler | None":
+        """Start a profiler if COLD_START_PROFILE is set.
+
+        Returns:
+            The running profiler, or None when profiling is off.
+        """
+        if os.environ.get("COLD_START_PROFILE", "").lower() not in ("1", "true", "yes"):
+            return None
+        return cls().start()
+
+    def start(self) -> "ImportProfiler":
+        """Begin timing imports.
+
+        Returns:
+            This profiler.
+        """
+        self._started = time.perf_counter()
+        sys.meta_path.insert(0, self)
+        return self
+
+    def stop(self) -> None:
+        """Stop timing imports."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        self.total_ms = (time.perf_counter() - self._started) * 1000
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if isinstance(spec.loader, _PER_MODULE_LOADERS):
+                spec.loader.exec_module = self._timed(fullname, spec.loader.exec_module)
+            return spec
+        return None
+
+    def _timed(self, fullname: str, exec_module):
+        def exec_and_time(module):
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                cumulative = (time.perf_counter() - start) * 1000
+                children = self._stack.pop()
+                self.timings[fullname] = (cumulative - children, cumulative)
+                if self._stack:
+                    self._stack[-1] += cumulative
+
+        return exec_and_time
+
+    def summary(self, top: int = 15) -> dict:
+        """Summarize the profile.
+
+        Args:
+            top: Number of modules to list, by self time.
+
+        Returns:
+            Total import time, module count and the slowest modules.
+        """
+        slowest = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return {
+            "import_ms": round(self.total_ms, 1),
+            "modules": len(self.timings),
+            "slowest": [
+                {"module": name, "self_ms": round(own, 1), "cumulative_ms": round(cumulative, 1)}
+                for name, (own, cumulative) in slowest
+            ],
+        }
+
+    def stop_and_log(self, logger: logging.Logger, top: int = 15) -> None:
+        """Stop timing and log the summary as one JSON line.
+
+        Args:
+            logger: Logger to write to.
+            top: Number of modules to list, by self time.
+        """
+        self.stop()
+        logger.info(json.dumps({"cold_start_profile": self.summary(top)}))
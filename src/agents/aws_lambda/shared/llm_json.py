@@ -0,0 +1,130 @@
+"""Parsing of JSON objects out of model responses, including truncated ones.
+
+Responses are usually bare JSON, sometimes wrapped in a code fence or followed
+by prose; the first object in the text is decoded. A response cut off at
+max_tokens is repaired instead of failing the whole call: the text is cut back
+to the last point where every open value was complete and the open arrays and
+objects are closed. Every complete element of an array (e.g. "rankings")
+survives, a partly written object element is dropped, and callers re-request
+only what is missing.
+
+This module is the one implementation: the FastAPI agents import it through
+shared.llm_json, and the Lambda packages copy it as it is.
+"""
+
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder()
+# Strings (so brackets inside them are skipped), an unterminated string, scalars
+# or structure
+_TOKENS = re.compile(
+    r'"(?:[^"\\]|\\.)*"|"|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null|[{}\[\],:]'
+)
+_CLOSERS = {"{": "}", "[": "]"}
+# Cut points tried, newest first, before giving up on a damaged response
+_MAX_REPAIR_ATTEMPTS = 20
+
+
+def load_json_object(text: str) -> tuple[dict, bool]:
+    """Parse the first JSON object in a model response.
+
+    Args:
+        text: Response text.
+
+    Returns:
+        The object, and whether it was complete (False if it was repaired
+        from a truncated response).
+
+    Raises:
+        ValueError: If the text holds no object that can be parsed or repaired.
+    """
+    start = text.find("{")
+    if start < 0:
+        raise ValueError(f"No JSON object in response: {text[:200]}")
+    try:
+        value, _ = _DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(value, dict):
+            return value, True
+
+    for cut, closers in reversed(_cut_points(text, start)[-_MAX_REPAIR_ATTEMPTS:]):
+        try:
+            value = json.loads(text[start:cut] + closers)
+        except json.JSONDecodeError:
+            continue
+        logger.warning(
+            f"Recovered truncated JSON response: kept {cut - start} "
+            f"of {len(text) - start} characters"
+        )
+        return value, False
+    raise ValueError(f"Failed to parse response as JSON: {text[:200]}")
+
+
+def json_array(value: dict, key: str) -> list:
+    """Get a list-valued field of a parsed response.
+
+    Args:
+        value: Parsed response object.
+        key: Field name.
+
+    Returns:
+        value[key] if it is a list, else an empty list.
+    """
+    items = value.get(key)
+    return items if isinstance(items, list) else []
+
+
+def _cut_points(text: str, start: int) -> list[tuple[int, str]]:
+    """(index, closing brackets) wherever text[start:index] holds only complete values.
+
+    A point is recorded after each finished value and before each comma. Points
+    inside an object that is an array element are skipped, so a truncated
+    element is dropped rather than kept with only some of its fields.
+    """
+    stack: list[str] = []
+    points = []
+    # Open objects that are array elements
+    open_items = 0
+    after_colon = False
+
+    def mark(index: int) -> None:
+        if not open_items:
+            points.append((index, "".join(reversed(stack))))
+
+    for match in _TOKENS.finditer(text, start):
+        token = match.group()
+        if token == '"':
+            break  # unterminated string: the response ends inside it
+        if token == ":":
+            after_colon = True
+            continue
+        is_value = after_colon or (stack and stack[-1] == "]")
+        after_colon = False
+        if token in _CLOSERS:
+            if token == "{" and stack and stack[-1] == "]":
+                open_items += 1
+            stack.append(_CLOSERS[token])
+            mark(match.end())
+        elif token == ",":
+            if stack:
+                mark(match.start())
+        elif token in ("}", "]"):
+            if not stack or stack.pop() != token:
+                break
+            if not stack:
+                break
+            if token == "}" and stack[-1] == "]":
+                open_items -= 1
+            mark(match.end())
+        elif is_value:
+            # A number that runs to the end of the text may have been cut short
+            if token[0] != '"' and match.end() == len(text):
+                break
+            mark(match.end())
+    return points
@@ -0,0 +1,267 @@
+"""Content-addressed cache for parsed resume results."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import BinaryIO
+
+from .s3_client import S3Client
+
+logger = logging.getLogger(__name__)
+
+
+def content_digest(content: bytes) -> str:
+    """Compute the SHA-256 hex digest of raw file bytes.
+
+    Args:
+        content: File contents.
+
+    Returns:
+        Hex digest string.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def stream_digest(stream: BinaryIO) -> str:
+    """Compute the SHA-256 hex digest of a seekable stream, then rewind it.
+
+    Args:
+        stream: File contents as a binary stream positioned at the start.
+
+    Returns:
+        Hex digest string, equal to content_digest() of the same bytes.
+    """
+    digest = hashlib.file_digest(stream, "sha256").hexdigest()
+    stream.seek(0)
+    return digest
+
+
+def make_cache_key(
+    digest: str, model_id: str, prompt_version: str, settings: tuple = ()
+) -> str:
+    """Build a cache key from a content digest, model, prompt version and settings.
+
+    Args:
+        digest: Content digest from content_digest().
+        model_id: Model used to produce the result.
+        prompt_version: Version of the prompt used to produce the result.
+        settings: Other values that decide what text the model sees, such as
+            the extraction and compaction settings.
+
+    Returns:
+        Hex cache key.
+    """
+    parts = [digest, model_id, prompt_version, *map(str, settings)]
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss/eviction counters for a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict:
+        """Return counters plus hit rate as a dictionary."""
+        lookups = self.hits + self.misses
+        return {**asdict(self), "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+class MemoryParseCache:
+    """In-process LRU cache. Survives across warm invocations of the same container."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction.
+            ttl_seconds: Time-to-live for each entry.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        """Look up a cached result.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached result, or None on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                    self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: dict) -> None:
+        """Store a result.
+
+        Args:
+            key: Cache key.
+            value: JSON-serializable result.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+
+class S3ParseCache:
+    """Cache stored as JSON objects under an S3 prefix.
+
+    Entries carry their own expiry timestamp, which is checked on read. Size is
+    bounded by an S3 lifecycle rule on the prefix rather than by this class.
+    """
+
+    def __init__(
+        self,
+        s3_client: S3Client | None = None,
+        prefix: str = "parse-cache/",
+        ttl_seconds: float = 604800,
+    ):
+        """Initialize the cache.
+
+        Args:
+            s3_client: S3 client instance. Created from env vars if not provided.
+            prefix: Key prefix under which entries are stored.
+            ttl_seconds: Time-to-live for each entry.
+        """
+        self._s3 = s3_client or S3Client()
+        self.prefix = prefix if prefix.endswith("/") else f"{prefix}/"
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        # get() runs on WorkerPool threads during batch parsing
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        """Look up a cached result.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached result, or None on a miss, expired entry or read error.
+        """
+        try:
+            entry = json.loads(self._s3.download_file(self._object_key(key)))
+        except FileNotFoundError:
+            entry = None
+        except Exception as e:
+            logger.warning(f"Parse cache read failed for {key}: {e}")
+            entry = None
+
+        expired = entry is not None and entry.get("expires_at", 0) < time.time()
+        with self._stats_lock:
+            if expired:
+                self.stats.evictions += 1
+            if entry is None or expired:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+        return entry["value"]
+
+    def set(self, key: str, value: dict) -> None:
+        """Store a result. Write failures are logged and otherwise ignored.
+
+        Args:
+            key: Cache key.
+            value: JSON-serializable result.
+        """
+        entry = {"expires_at": time.time() + self.ttl_seconds, "value": value}
+        try:
+            self._s3.upload_file(
+                self._object_key(key),
+                json.dumps(entry).encode("utf-8"),
+                content_type="application/json",
+            )
+        except Exception as e:
+            logger.warning(f"Parse cache write failed for {key}: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL, judged by object age.
+
+        Entries are listed page by page and deleted 1000 per request, without
+        downloading them. Use it after shortening the TTL, since the lifecycle
+        rule only expires entries after its own number of days.
+
+        Returns:
+            Number of entries deleted.
+        """
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            obj["Key"]
+            for obj in self._s3.iter_objects(self.prefix)
+            if obj["LastModified"].timestamp() < cutoff
+        ]
+        failed = self._s3.delete_files(expired)
+        if failed:
+            logger.warning(f"Parse cache purge could not delete {len(failed)} entries")
+        return len(expired) - len(failed)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}.json"
+
+
+_default_cache: MemoryParseCache | S3ParseCache | None = None
+
+
+def get_parse_cache(s3_client: S3Client | None = None) -> MemoryParseCache | S3ParseCache | None:
+    """Return the process-wide parse cache configured by environment variables.
+
+    PARSE_CACHE_BACKEND selects "none", "memory" or "s3" (default "none").
+    The instance is kept at module scope so it is reused by warm invocations.
+
+    Args:
+        s3_client: S3 client for the S3 backend. Created from env vars if not provided.
+
+    Returns:
+        The cache instance, or None if caching is disabled.
+    """
+    global _default_cache
+    if _default_cache is not None:
+        return _default_cache
+
+    backend = os.environ.get("PARSE_CACHE_BACKEND", "none").lower()
+    ttl_seconds = float(os.environ.get("PARSE_CACHE_TTL_SECONDS", "604800"))
+
+    if backend == "memory":
+        _default_cache = MemoryParseCache(
+            max_entries=int(os.environ.get("PARSE_CACHE_MAX_ENTRIES", "256")),
+            ttl_seconds=ttl_seconds,
+        )
+    elif backend == "s3":
+        _default_cache = S3ParseCache(
+            s3_client,
+            prefix=os.environ.get("PARSE_CACHE_PREFIX", "parse-cache/"),
+            ttl_seconds=ttl_seconds,
+        )
+    elif backend not in ("", "none", "off"):
+        raise ValueError(f"Unknown parse cache backend: {backend}")
+
+    return _default_cache
+
+
+def reset_parse_cache() -> None:
+    """Forget the process-wide parse cache so the next get_parse_cache() rebuilds it."""
+    global _default_cache
+    _default_cache = None
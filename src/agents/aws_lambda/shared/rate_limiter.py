@@ -0,0 +1,213 @@
+"""Client-side rate limiting for Bedrock calls.
+
+Bedrock enforces per-model quotas on requests per minute and tokens per
+minute. For the tokens quota, each request is charged input tokens plus
+`max_tokens` up front, and the unused output is credited back when the call
+completes. RateLimiter applies the same rule with two token buckets, so a
+container queues calls locally instead of sending them to be throttled.
+
+Throttling still happens when other containers share the quota. Each
+throttle makes every caller in the container pause for a jittered,
+exponentially growing delay. It also halves the bucket refill rate, which then
+recovers by 5% per successful call. Limits apply per container: set
+BEDROCK_REQUESTS_PER_MINUTE and BEDROCK_TOKENS_PER_MINUTE to the account quota
+divided by the expected number of concurrent containers. 0 (the default) turns
+off the corresponding bucket. The backoff applies either way.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 20.0
+MIN_RATE_SCALE = 0.1
+
+
+class TokenBucket:
+    """Bucket refilled continuously at `per_minute`, holding at most one minute's worth.
+
+    Amounts are reserved rather than waited for: the level may go negative,
+    and the caller sleeps until the refill would have covered the deficit.
+    That keeps callers in arrival order. Not thread-safe on its own;
+    RateLimiter holds a lock around it.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.level = per_minute
+        self.rate = per_minute / 60
+        self._updated = time.monotonic()
+
+    def refill(self, now: float, scale: float = 1.0) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate * scale)
+        self._updated = now
+
+    def reserve(self, amount: float, scale: float = 1.0) -> float:
+        """Take `amount`, returning the seconds until the bucket is no longer in debt."""
+        # A request larger than the bucket could never be served otherwise
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / (self.rate * scale))
+
+    def credit(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """Request and token buckets plus a shared throttling backoff for one model."""
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request quota for this container; 0 disables it.
+            tokens_per_minute: Input plus output token quota; 0 disables it.
+        """
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._lock = threading.Lock()
+        self._scale = 1.0
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+        self._counters = {
+            "requests": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "throttles": 0,
+        }
+
+    def acquire(self, tokens: int, max_wait: float | None = None) -> float:
+        """Reserve capacity for one request, sleeping until it is available.
+
+        Args:
+            tokens: Estimated input tokens plus max_tokens for the request.
+            max_wait: Give up instead of waiting longer than this many seconds.
+                A call that needs no wait always goes ahead, even when the
+                budget is already spent.
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            TimeoutError: If the wait would exceed `max_wait`. Nothing is reserved.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                if bucket is not None:
+                    bucket.refill(now, self._scale)
+                    wait = max(wait, bucket.reserve(amount, self._scale))
+
+            if max_wait is not None and wait > 0 and wait > max_wait:
+                for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                    if bucket is not None:
+                        bucket.credit(min(amount, bucket.capacity))
+                raise TimeoutError(f"no capacity within the wait budget (next slot in {wait:.1f}s)")
+
+            self._counters["requests"] += 1
+            if wait > 0:
+                self._counters["waits"] += 1
+                self._counters["wait_seconds"] += wait
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def settle(self, reserved_tokens: int, used_tokens: int) -> None:
+        """Credit back the part of a reservation the request did not use.
+
+        Args:
+            reserved_tokens: Amount passed to acquire().
+            used_tokens: Input plus output tokens reported by the response.
+        """
+        with self._lock:
+            self._scale = min(1.0, self._scale + 0.05)
+            self._consecutive_throttles = 0
+            if self._tokens is not None and used_tokens < reserved_tokens:
+                self._tokens.credit(reserved_tokens - used_tokens)
+
+    def release(self, reserved_tokens: int) -> None:
+        """Credit back a whole reservation whose request was throttled or failed.
+
+        Unlike settle(), this does not count as a success for the backoff.
+
+        Args:
+            reserved_tokens: Amount passed to acquire().
+        """
+        with self._lock:
+            if self._tokens is not None:
+                self._tokens.credit(min(reserved_tokens, self._tokens.capacity))
+
+    def throttled(self) -> float:
+        """Record a throttling response and pause all callers.
+
+        Returns:
+            The pause in seconds, jittered between half and all of a cap that
+            doubles with each consecutive throttle.
+        """
+        with self._lock:
+            now = time.monotonic()
+            for bucket in (self._requests, self._tokens):
+                if bucket is not None:
+                    bucket.refill(now, self._scale)
+            self._scale = max(MIN_RATE_SCALE, self._scale / 2)
+            cap = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**self._consecutive_throttles)
+            delay = random.uniform(cap / 2, cap)
+            self._consecutive_throttles += 1
+            self._paused_until = max(self._paused_until, now + delay)
+            self._counters["throttles"] += 1
+            throttles = self._counters["throttles"]
+        logger.warning(
+            f"Bedrock throttled (total {throttles}); pausing {delay:.1f}s, "
+            f"rate scaled to {self._scale:.2f}"
+        )
+        return delay
+
+    def stats(self) -> dict:
+        """Counters since the container started.
+
+        Returns:
+            Requests, waits, total wait seconds, throttles and the current rate scale.
+        """
+        with self._lock:
+            return {
+                **self._counters,
+                "wait_seconds": round(self._counters["wait_seconds"], 3),
+                "rate_scale": round(self._scale, 3),
+            }
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model_id: str) -> RateLimiter:
+    """Return the container-wide limiter for a model, configured from env vars.
+
+    Bedrock quotas are per model, so each model ID gets its own limiter, shared
+    by every BedrockClient in the container.
+
+    Args:
+        model_id: Bedrock model ID.
+
+    Returns:
+        The RateLimiter for the model.
+    """
+    with _limiters_lock:
+        if model_id not in _limiters:
+            _limiters[model_id] = RateLimiter(
+                requests_per_minute=float(os.environ.get("BEDROCK_REQUESTS_PER_MINUTE", "0")),
+                tokens_per_minute=float(os.environ.get("BEDROCK_TOKENS_PER_MINUTE", "0")),
+            )
+        return _limiters[model_id]
+
+
+def reset_rate_limiters() -> None:
+    """Drop all limiters so they are rebuilt from the current environment."""
+    with _limiters_lock:
+        _limiters.clear()
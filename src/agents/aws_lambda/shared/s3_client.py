@@ -1,13 +1,28 @@
 """S3 client wrapper for resume file operations."""
 
 import os
-from io import BytesIO
-from typing import BinaryIO
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from itertools import chain
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterator
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from .aws_session import create_client
+
+STREAM_CHUNK_BYTES = 1024 * 1024
+
+# S3 limits: DeleteObjects takes at most 1000 keys; multipart parts are >= 5 MiB
+DELETE_BATCH_SIZE = 1000
+MIN_PART_BYTES = 5 * 1024 * 1024
+
+
+class ObjectTooLargeError(ValueError):
+    """Raised when an S3 object exceeds the caller's size limit."""
+
 
 class S3Client:
     """Wrapper for S3 operations on resume files."""
@@ -25,9 +40,12 @@ class S3Client:
         if not self.bucket_name:
             raise ValueError("S3 bucket name is required")
 
-        config = Config(retries={"max_attempts": 3, "mode": "adaptive"})
+        # Bulk methods run up to max_pool_connections requests at once
+        config = Config(
+            retries={"max_attempts": 3, "mode": "adaptive"}, max_pool_connections=32
+        )
 
-        self._client = boto3.client("s3", region_name=self.region, config=config)
+        self._client = create_client("s3", self.region, config)
 
     def download_file(self, s3_key: str) -> bytes:
         """Download a file from S3.
@@ -51,21 +69,68 @@ class S3Client:
                 raise FileNotFoundError(f"File not found in S3: {s3_key}") from e
             raise RuntimeError(f"Failed to download from S3: {e}") from e
 
-    def download_file_to_stream(self, s3_key: str) -> BinaryIO:
-        """Download a file from S3 to a BytesIO stream.
+    def download_file_to_stream(
+        self,
+        s3_key: str,
+        max_bytes: int | None = None,
+        spool_bytes: int = 8 * 1024 * 1024,
+    ) -> BinaryIO:
+        """Download a file from S3 into a seekable stream, chunk by chunk.
+
+        The body is copied straight into a SpooledTemporaryFile, so the file is
+        never held as one `bytes` object; past `spool_bytes` it moves to /tmp.
+        The size limit is checked against ContentLength before any of the body
+        is read.
 
         Args:
             s3_key: The S3 object key (path within the bucket).
+            max_bytes: Reject objects larger than this many bytes.
+            spool_bytes: Size above which the stream is backed by a temp file.
 
         Returns:
-            A BytesIO stream containing the file contents.
+            A stream positioned at the start of the file. The caller closes it.
 
         Raises:
             FileNotFoundError: If the file doesn't exist.
+            ObjectTooLargeError: If the object is larger than `max_bytes`.
             RuntimeError: If the download fails.
         """
-        content = self.download_file(s3_key)
-        return BytesIO(content)
+        try:
+            response = self._client.get_object(Bucket=self.bucket_name, Key=s3_key)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "")
+            if error_code == "NoSuchKey":
+                raise FileNotFoundError(f"File not found in S3: {s3_key}") from e
+            raise RuntimeError(f"Failed to download from S3: {e}") from e
+
+        body = response["Body"]
+        size = response.get("ContentLength")
+        if max_bytes is not None and size is not None and size > max_bytes:
+            body.close()
+            raise ObjectTooLargeError(
+                f"File too large: {s3_key} is {size} bytes (limit {max_bytes})"
+            )
+
+        stream = SpooledTemporaryFile(max_size=spool_bytes)
+        try:
+            written = 0
+            for chunk in iter(lambda: body.read(STREAM_CHUNK_BYTES), b""):
+                written += len(chunk)
+                if max_bytes is not None and written > max_bytes:
+                    raise ObjectTooLargeError(
+                        f"File too large: {s3_key} exceeds {max_bytes} bytes"
+                    )
+                stream.write(chunk)
+        except ObjectTooLargeError:
+            stream.close()
+            body.close()
+            raise
+        except Exception as e:
+            stream.close()
+            raise RuntimeError(f"Failed to download from S3: {e}") from e
+
+        stream.seek(0)
+        return stream
 
     def upload_file(
         self, s3_key: str, content: bytes, content_type: str | None = None
@@ -109,6 +174,159 @@ class S3Client:
         except ClientError as e:
             raise RuntimeError(f"Failed to delete from S3: {e}") from e
 
+    def download_files(
+        self, s3_keys: list[str], max_workers: int = 8
+    ) -> tuple[dict[str, bytes], dict[str, Exception]]:
+        """Download several files concurrently.
+
+        Args:
+            s3_keys: Object keys to download.
+            max_workers: Maximum downloads in flight.
+
+        Returns:
+            Tuple of (contents by key, errors by key). A failed key does not
+            stop the others; its exception (FileNotFoundError, RuntimeError,
+            or e.g. a botocore connection error) is returned.
+        """
+        contents, errors = {}, {}
+        if not s3_keys:
+            return contents, errors
+
+        def fetch(key: str) -> None:
+            try:
+                contents[key] = self.download_file(key)
+            except Exception as e:
+                errors[key] = e
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(s3_keys))) as pool:
+            list(pool.map(fetch, s3_keys))
+        return contents, errors
+
+    def delete_files(self, s3_keys: list[str]) -> list[str]:
+        """Delete many files with DeleteObjects, 1000 keys per request.
+
+        Args:
+            s3_keys: Object keys to delete. Missing keys count as deleted.
+
+        Returns:
+            Keys that S3 reported it could not delete.
+
+        Raises:
+            RuntimeError: If a DeleteObjects request fails outright.
+        """
+        failed = []
+        for start in range(0, len(s3_keys), DELETE_BATCH_SIZE):
+            batch = s3_keys[start : start + DELETE_BATCH_SIZE]
+            try:
+                response = self._client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except ClientError as e:
+                raise RuntimeError(f"Failed to delete from S3: {e}") from e
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+        return failed
+
+    def iter_objects(self, prefix: str = "", page_size: int = 1000) -> Iterator[dict]:
+        """List objects under a prefix, fetching one page at a time.
+
+        Args:
+            prefix: Key prefix to list.
+            page_size: Keys requested per ListObjectsV2 call (at most 1000).
+
+        Yields:
+            Object summaries with Key, Size, LastModified and ETag.
+
+        Raises:
+            RuntimeError: If a listing request fails.
+        """
+        paginator = self._client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=self.bucket_name, Prefix=prefix, PaginationConfig={"PageSize": page_size}
+        )
+        try:
+            for page in pages:
+                yield from page.get("Contents", [])
+        except ClientError as e:
+            raise RuntimeError(f"Failed to list S3 objects: {e}") from e
+
+    def upload_stream(
+        self,
+        s3_key: str,
+        stream: BinaryIO,
+        content_type: str | None = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_workers: int = 4,
+    ) -> str:
+        """Upload a file from a stream, using a multipart upload if it is large.
+
+        Streams no larger than one part go up in a single PutObject. Larger
+        ones are sent as parts, up to `max_workers` at a time, so at most
+        that many parts are held in memory. A failed multipart upload is
+        aborted so no orphaned parts are left behind.
+
+        Args:
+            s3_key: The S3 object key (path within the bucket).
+            stream: Binary stream positioned at the start of the data.
+            content_type: Optional MIME type for the file.
+            part_size: Bytes per part; raised to S3's 5 MiB minimum if lower.
+            max_workers: Maximum parts uploading at once.
+
+        Returns:
+            The S3 URI (s3://bucket/key).
+
+        Raises:
+            RuntimeError: If the upload fails.
+        """
+        part_size = max(part_size, MIN_PART_BYTES)
+        first = stream.read(part_size)
+        second = stream.read(part_size)
+        if not second:
+            return self.upload_file(s3_key, first, content_type)
+
+        extra_args = {"ContentType": content_type} if content_type else {}
+        try:
+            upload_id = self._client.create_multipart_upload(
+                Bucket=self.bucket_name, Key=s3_key, **extra_args
+            )["UploadId"]
+        except ClientError as e:
+            raise RuntimeError(f"Failed to upload to S3: {e}") from e
+
+        def upload_part(number: int, data: bytes) -> dict:
+            response = self._client.upload_part(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                PartNumber=number,
+                Body=data,
+            )
+            return {"PartNumber": number, "ETag": response["ETag"]}
+
+        parts, in_flight = [], deque()
+        try:
+            chunks = chain((first, second), iter(lambda: stream.read(part_size), b""))
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for number, data in enumerate(chunks, start=1):
+                    if len(in_flight) >= max_workers:
+                        parts.append(in_flight.popleft().result())
+                    in_flight.append(pool.submit(upload_part, number, data))
+                while in_flight:
+                    parts.append(in_flight.popleft().result())
+
+            self._client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception as e:
+            with suppress(ClientError):
+                self._client.abort_multipart_upload(
+                    Bucket=self.bucket_name, Key=s3_key, UploadId=upload_id
+                )
+            raise RuntimeError(f"Failed to upload to S3: {e}") from e
+        return f"s3://{self.bucket_name}/{s3_key}"
+
     def file_exists(self, s3_key: str) -> bool:
         """Check if a file exists in S3.
 
@@ -0,0 +1,280 @@
+"""Per-invocation metrics in CloudWatch Embedded Metric Format, and event logging.
+
+`instrument_handler` wraps a Lambda handler. Each invocation prints one EMF
+JSON document to stdout; CloudWatch Logs turns it into metrics without any
+PutMetricData calls. The document records whether the invocation was a cold
+start, the size of the payload, and whatever the code records with `record()`
+or `timed()` along the way: S3 download time, text extraction time, Bedrock
+latency and tokens. A Lambda container handles one invocation at a time, so
+values recorded on worker pool threads go to the current invocation. Outside
+an invocation (tests, scripts) recording is a no-op.
+
+The incoming event is no longer logged in full. A one-line summary is always
+logged; the event itself is logged for a sample of invocations
+(LOG_EVENT_SAMPLE_RATE) and cut to LOG_EVENT_MAX_BYTES.
+"""
+
+import functools
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+# A metric may have at most 100 values per EMF document
+MAX_VALUES_PER_DOCUMENT = 100
+
+_cold_start = True
+_current: "InvocationMetrics | None" = None
+_current_lock = threading.Lock()
+
+
+class InvocationMetrics:
+    """Metric values and properties collected during one invocation."""
+
+    def __init__(self, service: str, namespace: str | None = None):
+        """Initialize the collector.
+
+        Args:
+            service: Value of the Service dimension.
+            namespace: CloudWatch namespace. Defaults to EMF_NAMESPACE or "ResumeRank".
+        """
+        self.service = service
+        self.namespace = namespace or os.environ.get("EMF_NAMESPACE", "ResumeRank")
+        self.values: dict[str, list[float]] = {}
+        self.units: dict[str, str] = {}
+        self.properties: dict = {}
+        self._lock = threading.Lock()
+
+    def put(self, name: str, value: float, unit: str = "None") -> None:
+        """Add a value to a metric; each value becomes a separate sample.
+
+        Args:
+            name: Metric name.
+            value: Sample value.
+            unit: CloudWatch unit, e.g. "Milliseconds", "Bytes" or "Count".
+        """
+        with self._lock:
+            self.values.setdefault(name, []).append(value)
+            self.units[name] = unit
+
+    def set_property(self, name: str, value) -> None:
+        """Attach a searchable property (not a metric) to the document.
+
+        Args:
+            name: Property name.
+            value: JSON-serializable value.
+        """
+        self.properties[name] = value
+
+    def to_documents(self) -> list[dict]:
+        """Build the EMF documents, splitting metrics with more than 100 values.
+
+        Returns:
+            One document, or more if a metric exceeds MAX_VALUES_PER_DOCUMENT values.
+        """
+        with self._lock:
+            values = {name: list(v) for name, v in self.values.items()}
+        pages = max([1] + [-(-len(v) // MAX_VALUES_PER_DOCUMENT) for v in values.values()])
+        documents = []
+        for page in range(pages):
+            start = page * MAX_VALUES_PER_DOCUMENT
+            page_values = {
+                name: v[start : start + MAX_VALUES_PER_DOCUMENT]
+                for name, v in values.items()
+                if v[start : start + MAX_VALUES_PER_DOCUMENT]
+            }
+            documents.append(
+                {
+                    "_aws": {
+                        "Timestamp": int(time.time() * 1000),
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": self.namespace,
+                                "Dimensions": [["Service"]],
+                                "Metrics": [
+                                    {"Name": name, "Unit": self.units[name]}
+                                    for name in page_values
+                                ],
+                            }
+                        ],
+                    },
+                    "Service": self.service,
+                    **self.properties,
+                    **{name: v[0] if len(v) == 1 else v for name, v in page_values.items()},
+                }
+            )
+        return documents
+
+    def flush(self) -> None:
+        """Print the EMF documents to stdout, one JSON line each."""
+        for document in self.to_documents():
+            sys.stdout.write(json.dumps(document) + "\n")
+        sys.stdout.flush()
+
+
+def record(name: str, value: float, unit: str = "None") -> None:
+    """Add a value to the current invocation's metrics, if there is one.
+
+    Args:
+        name: Metric name.
+        value: Sample value.
+        unit: CloudWatch unit.
+    """
+    current = _current
+    if current is not None:
+        current.put(name, value, unit)
+
+
+def timed(name: str) -> "_Timer":
+    """Record the duration of a `with` block as metric `name`, in milliseconds.
+
+    Args:
+        name: Metric name.
+
+    Returns:
+        The context manager.
+    """
+    return _Timer(name)
+
+
+class _Timer:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, round((time.perf_counter() - self.started) * 1000, 3), "Milliseconds")
+
+
+def emf_enabled() -> bool:
+    """Whether EMF output is on (EMF_METRICS, default true)."""
+    return os.environ.get("EMF_METRICS", "true").lower() in ("1", "true", "yes")
+
+
+def log_event(event_logger: logging.Logger, event: dict, payload_bytes: int) -> None:
+    """Log a summary of the event, and the event itself for a sample of invocations.
+
+    Args:
+        event_logger: Logger to write to.
+        event: Lambda event.
+        payload_bytes: Size of the payload, from payload_size().
+    """
+    records = event.get("Records")
+    event_logger.info(
+        "Received event: "
+        + json.dumps(
+            {
+                "source": _event_source(event),
+                "records": len(records) if isinstance(records, list) else None,
+                "payload_bytes": payload_bytes,
+            }
+        )
+    )
+    sample_rate = float(os.environ.get("LOG_EVENT_SAMPLE_RATE", "0.01"))
+    if sample_rate <= 0 or random.random() >= sample_rate:
+        return
+    max_bytes = int(os.environ.get("LOG_EVENT_MAX_BYTES", "2048"))
+    text = json.dumps(event)
+    if len(text) > max_bytes:
+        text = f"{text[:max_bytes]}... [{len(text) - max_bytes} more characters]"
+    event_logger.info(f"Sampled event: {text}")
+
+
+def payload_size(event: dict) -> int:
+    """Approximate size of the request payload in bytes, without serializing it.
+
+    For API Gateway events this is the length of the body string. Other events
+    (SQS batches, S3 notifications, direct invocations carrying every resume)
+    are estimated from their strings and the first item of each list, since
+    this runs on every invocation and serializing the event would not be cheap.
+
+    Args:
+        event: Lambda event.
+
+    Returns:
+        Payload size in bytes (characters for strings).
+    """
+    body = event.get("body")
+    if isinstance(body, str):
+        return len(body)
+    return _estimate_size(event)
+
+
+def _estimate_size(value) -> int:
+    # A list counts as its length times its first item, which suits events
+    # whose lists hold similar items (records, resumes)
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, dict):
+        return 2 + sum(len(key) + 4 + _estimate_size(item) for key, item in value.items())
+    if isinstance(value, list):
+        return 2 + (len(value) * (_estimate_size(value[0]) + 1) if value else 0)
+    return len(str(value))
+
+
+def instrument_handler(service: str) -> Callable:
+    """Decorate a Lambda handler with event logging and per-invocation EMF metrics.
+
+    Args:
+        service: Value of the Service dimension.
+
+    Returns:
+        The decorator.
+    """
+
+    def decorator(handler: Callable) -> Callable:
+        handler_logger = logging.getLogger(handler.__module__)
+
+        @functools.wraps(handler)
+        def wrapper(event: dict, context):
+            global _cold_start, _current
+            size = payload_size(event)
+            log_event(handler_logger, event, size)
+            if not emf_enabled():
+                _cold_start = False
+                return handler(event, context)
+
+            metrics = InvocationMetrics(service)
+            metrics.put("ColdStart", 1 if _cold_start else 0, "Count")
+            metrics.put("PayloadSize", size, "Bytes")
+            if context is not None:
+                metrics.set_property("RequestId", getattr(context, "aws_request_id", None))
+            _cold_start = False
+            with _current_lock:
+                _current = metrics
+            try:
+                result = handler(event, context)
+                if isinstance(result, dict) and "statusCode" in result:
+                    metrics.set_property("StatusCode", result["statusCode"])
+                return result
+            finally:
+                with _current_lock:
+                    _current = None
+                try:
+                    metrics.flush()
+                except Exception as e:
+                    logger.warning(f"Failed to write EMF metrics: {e}")
+
+        return wrapper
+
+    return decorator
+
+
+def _event_source(event: dict) -> str:
+    records = event.get("Records")
+    if records and isinstance(records, list):
+        return records[0].get("eventSource", "records")
+    if "requestContext" in event:
+        return "apigateway"
+    return "direct"
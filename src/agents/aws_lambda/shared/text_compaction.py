@@ -0,0 +1,210 @@
+"""Compaction of extracted resume text into the parse prompt's token budget.
+
+Extraction separates pages with form feeds (PAGE_BREAK). Compaction then:
+
+- collapses whitespace and drops blank lines, separator rules and page numbers (a bare
+  number only at the top or bottom of a page, so years and dates survive);
+- removes lines repeated at the top or bottom of most pages (running headers
+  and footers), keeping the first occurrence since it often holds the name;
+- splits the text into sections at recognized headings (Skills, Experience,
+  Education, ...), the text before the first heading being the contact header;
+- if the result is still over budget, keeps whole sections in priority order
+  (header, skills, experience, summary, ...), then cuts the ones that did not
+  fit into the remaining budget at line boundaries. Kept sections are returned
+  in document order.
+"""
+
+import re
+from collections import Counter
+
+PAGE_BREAK = "\f"
+
+# Part of the parse cache key; bump when a change alters the compacted text
+COMPACTION_VERSION = "2"
+
+# Section headings by kind, matched lowercased and without punctuation against
+# a whole line or the label before a colon
+SECTION_HEADINGS = {
+    "skills": (
+        "skills", "technical skills", "key skills", "core skills", "skills summary",
+        "core competencies", "competencies", "technologies", "tech stack",
+        "technical proficiencies", "tools and technologies", "expertise",
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "relevant experience",
+    ),
+    "summary": (
+        "summary", "profile", "professional summary", "career summary", "about me",
+        "objective", "career objective", "professional profile",
+    ),
+    "education": ("education", "academic background", "education and training", "qualifications"),
+    "certifications": (
+        "certifications", "certificates", "licenses", "licenses and certifications",
+        "courses", "training",
+    ),
+    "projects": ("projects", "key projects", "selected projects", "personal projects"),
+    "other": (
+        "languages", "publications", "awards", "achievements", "honors", "volunteering",
+        "volunteer experience", "activities", "additional information",
+    ),
+    "ignored": ("interests", "hobbies", "hobbies and interests", "references", "referees"),
+}
+
+# Packing order; "ignored" sections are only kept whole and after everything else
+SECTION_PRIORITY = (
+    "header", "skills", "experience", "summary", "education", "certifications",
+    "projects", "other", "ignored",
+)
+
+_HEADING_KIND = {
+    heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings
+}
+_SPACES = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+_RULE = re.compile(r"^[\W_]{3,}$")
+# "Page 2", "Page 2 of 3", "2 of 3"; not "2015" or "03/2015", which are dates
+_PAGE_NUMBER = re.compile(r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+\s+of\s+\d+)$", re.IGNORECASE)
+# A bare number is only taken for a page number on the first or last line of a
+# page in a multi-page document; elsewhere it is usually a year or a count
+_BARE_PAGE_NUMBER = re.compile(r"^\d{1,3}$")
+# "Jane Doe - Page 2 of 3" in a running header or footer
+_PAGE_LABEL = re.compile(r"[\s|·•-]*\bpage\s*\d+(\s*(of|/)\s*\d+)?\b[\s|·•-]*", re.IGNORECASE)
+_EDGE_LINES = 3
+_MIN_PARTIAL_LINE = 80
+
+
+def compact_resume_text(text: str, token_budget: int) -> str:
+    """Normalize resume text and fit it into a token budget.
+
+    Args:
+        text: Extracted text, pages separated by PAGE_BREAK.
+        token_budget: Estimated tokens (about four characters each) to keep.
+
+    Returns:
+        The compacted text, lines joined by newlines.
+    """
+    raw_pages = text.split(PAGE_BREAK)
+    pages = [_normalize_page(page, len(raw_pages) > 1) for page in raw_pages]
+    lines = _drop_running_lines([page for page in pages if page])
+    compacted = "\n".join(lines)
+    if estimate_tokens(compacted) <= token_budget:
+        return compacted
+    return _pack(split_sections(lines), token_budget)
+
+
+def split_sections(lines: list[str]) -> list[tuple[str, list[str]]]:
+    """Split lines into sections at recognized headings.
+
+    Args:
+        lines: Normalized resume lines.
+
+    Returns:
+        (kind, lines) pairs in document order; each section's lines start
+        with its heading, except the leading "header" section.
+    """
+    sections = [("header", [])]
+    for line in lines:
+        kind = _heading_kind(line)
+        if kind is not None:
+            sections.append((kind, []))
+        sections[-1][1].append(line)
+    return [(kind, body) for kind, body in sections if body]
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly four characters per token for English text."""
+    return len(text) // 4 + 1
+
+
+def _normalize_page(page: str, multi_page: bool) -> list[str]:
+    raw = [_PAGE_LABEL.sub(" ", _SPACES.sub(" ", line)).strip() for line in page.splitlines()]
+    raw = [line for line in raw if line]
+    lines = []
+    for index, line in enumerate(raw):
+        number = line.strip("-– ")
+        if _RULE.match(line) or _PAGE_NUMBER.match(number):
+            continue
+        at_edge = index == 0 or index == len(raw) - 1
+        if multi_page and at_edge and _BARE_PAGE_NUMBER.match(number):
+            continue
+        # Repeated lines, e.g. text drawn twice for a bold effect
+        if lines and lines[-1] == line:
+            continue
+        lines.append(line)
+    return lines
+
+
+def _drop_running_lines(pages: list[list[str]]) -> list[str]:
+    if len(pages) < 2:
+        return [line for page in pages for line in page]
+
+    def is_edge(page: list[str], index: int) -> bool:
+        return index < _EDGE_LINES or index >= len(page) - _EDGE_LINES
+
+    counts = Counter(
+        line for page in pages for line in {l for i, l in enumerate(page) if is_edge(page, i)}
+    )
+    threshold = max(2, (len(pages) + 1) // 2)
+    running = {line for line, count in counts.items() if count >= threshold}
+
+    lines, seen = [], set()
+    for page in pages:
+        for index, line in enumerate(page):
+            if line in running and is_edge(page, index):
+                if line in seen:
+                    continue
+                seen.add(line)
+            lines.append(line)
+    return lines
+
+
+def _heading_kind(line: str) -> str | None:
+    """Kind of section a line starts: a heading on its own or an inline "Skills: ..." label."""
+    label = line.split(":", 1)[0] if ":" in line else line
+    if len(label) > 40:
+        return None
+    return _HEADING_KIND.get(" ".join(re.sub(r"[^a-z]+", " ", label.lower()).split()))
+
+
+def _pack(sections: list[tuple[str, list[str]]], token_budget: int) -> str:
+    budget = token_budget * 4
+    order = sorted(
+        range(len(sections)),
+        key=lambda i: (SECTION_PRIORITY.index(sections[i][0]), i),
+    )
+    # Whole sections first, so one long section cannot crowd out short ones
+    kept: dict[int, list[str]] = {}
+    oversized, ignored = [], []
+    for i in order:
+        size = sum(len(line) + 1 for line in sections[i][1])
+        if sections[i][0] == "ignored":
+            ignored.append((i, size))
+        elif size <= budget:
+            kept[i] = sections[i][1]
+            budget -= size
+        else:
+            oversized.append(i)
+
+    # Then cut the sections that did not fit into what is left, at line boundaries
+    for i in oversized:
+        taken, used = [], 0
+        for line in sections[i][1]:
+            if used + len(line) + 1 > budget:
+                # Long paragraphs (common in DOCX) are cut at a word instead
+                room = budget - used - 1
+                if room >= _MIN_PARTIAL_LINE:
+                    taken.append(line[:room].rsplit(" ", 1)[0])
+                    used += len(taken[-1]) + 1
+                break
+            taken.append(line)
+            used += len(line) + 1
+        # A heading on its own is not worth sending
+        if len(taken) > 1 or (taken and _heading_kind(taken[0]) is None):
+            kept[i] = taken
+            budget -= used
+
+    for i, size in ignored:
+        if size <= budget:
+            kept[i] = sections[i][1]
+            budget -= size
+    return "\n".join(line for i in sorted(kept) for line in kept[i])
@@ -0,0 +1,125 @@
+"""Persisted store of extracted resume text under an S3 prefix, keyed by content hash."""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+
+from .parse_cache import CacheStats
+from .s3_client import S3Client
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction output changes so stored text is invalidated
+EXTRACTION_VERSION = "1"
+
+
+def text_key(digest: str, backend: str, char_limit: int) -> str:
+    """Build a store key from a content digest and the extraction settings.
+
+    Args:
+        digest: Content digest from content_digest() or stream_digest().
+        backend: PDF text backend used for extraction.
+        char_limit: Characters extracted per file.
+
+    Returns:
+        Hex store key.
+    """
+    return hashlib.sha256(
+        f"{digest}:{backend}:{char_limit}:{EXTRACTION_VERSION}".encode()
+    ).hexdigest()
+
+
+class S3TextStore:
+    """Extracted text stored as gzip objects under an S3 prefix.
+
+    The full text is kept before compaction, which depends on the token
+    budget, so re-parses after a prompt change and prompt experiments skip
+    text extraction. Entries do not expire; use an S3 lifecycle rule on the
+    prefix to bound its size.
+    """
+
+    def __init__(self, s3_client: S3Client | None = None, prefix: str = "extracted-text/"):
+        """Initialize the store.
+
+        Args:
+            s3_client: S3 client instance. Created from env vars if not provided.
+            prefix: Key prefix under which text is stored.
+        """
+        self._s3 = s3_client or S3Client()
+        self.prefix = prefix if prefix.endswith("/") else f"{prefix}/"
+        self.stats = CacheStats()
+        # get() runs on WorkerPool threads during batch parsing
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        """Look up stored text.
+
+        Args:
+            key: Store key from text_key().
+
+        Returns:
+            The extracted text, or None if it is not stored or cannot be read.
+        """
+        text = None
+        try:
+            text = gzip.decompress(self._s3.download_file(self._object_key(key))).decode("utf-8")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Text store read failed for {key}: {e}")
+        with self._stats_lock:
+            if text is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        """Store extracted text. Write failures are logged and otherwise ignored.
+
+        Args:
+            key: Store key from text_key().
+            text: Extracted text.
+        """
+        try:
+            self._s3.upload_file(
+                self._object_key(key),
+                gzip.compress(text.encode("utf-8"), compresslevel=6),
+                content_type="application/gzip",
+            )
+        except Exception as e:
+            logger.warning(f"Text store write failed for {key}: {e}")
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}.txt.gz"
+
+
+_default_store: S3TextStore | None = None
+
+
+def get_text_store(s3_client: S3Client | None = None) -> S3TextStore | None:
+    """Return the process-wide text store configured by TEXT_STORE_PREFIX.
+
+    An empty prefix (the default) disables the store. The instance is kept at
+    module scope so it is reused by warm invocations.
+
+    Args:
+        s3_client: S3 client for the store. Created from env vars if not provided.
+
+    Returns:
+        The store instance, or None if it is disabled.
+    """
+    global _default_store
+    if _default_store is None:
+        prefix = os.environ.get("TEXT_STORE_PREFIX", "")
+        if prefix:
+            _default_store = S3TextStore(s3_client, prefix)
+    return _default_store
+
+
+def reset_text_store() -> None:
+    """Forget the process-wide text store so the next get_text_store() rebuilds it."""
+    global _default_store
+    _default_store = None
@@ -0,0 +1,201 @@
+"""Concurrent execution of independent work items within one Lambda invocation.
+
+Items run on a thread pool so S3 downloads and Bedrock calls overlap. The
+CPU-bound stage (text extraction) is bounded separately by `cpu_slot()`,
+sized to the vCPUs Lambda allocates for the configured memory (one vCPU per
+1,769 MB, up to 6). Process pools are not an option on Lambda, which has no
+/dev/shm for multiprocessing's semaphores and queues.
+
+Work is cut off by a Deadline derived from
+`context.get_remaining_time_in_millis()`: items that have not started once
+the remaining time drops below the reserve are returned as skipped, so the
+caller can hand them back for a retry instead of being killed mid-item.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+MB_PER_VCPU = 1769
+MAX_VCPUS = 6
+
+
+def lambda_vcpus(memory_mb: int | None = None) -> int:
+    """Estimate the vCPUs available to this function from its memory size.
+
+    Args:
+        memory_mb: Configured memory. Defaults to AWS_LAMBDA_FUNCTION_MEMORY_SIZE;
+            outside Lambda the local CPU count is used.
+
+    Returns:
+        Number of vCPUs, at least 1.
+    """
+    if memory_mb is None:
+        configured = os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE")
+        if not configured:
+            return os.cpu_count() or 1
+        memory_mb = int(configured)
+    return max(1, min(MAX_VCPUS, math.ceil(memory_mb / MB_PER_VCPU)))
+
+
+class Deadline:
+    """Remaining-time budget for an invocation, with a reserve kept free."""
+
+    def __init__(self, remaining_ms: Callable[[], int], reserve_ms: int):
+        """Initialize the deadline.
+
+        Args:
+            remaining_ms: Returns the milliseconds left in the invocation.
+            reserve_ms: Time to leave for finishing in-flight work and replying.
+        """
+        self._remaining_ms = remaining_ms
+        self.reserve_ms = reserve_ms
+
+    @classmethod
+    def from_context(cls, context, reserve_ms: int | None = None) -> "Deadline | None":
+        """Build a deadline from a Lambda context.
+
+        Args:
+            context: Lambda context object, or None outside Lambda.
+            reserve_ms: Reserve to keep. Defaults to WORKER_DEADLINE_RESERVE_MS
+                (30000), limited to WORKER_DEADLINE_RESERVE_FRACTION (0.25) of
+                the time remaining now, so short timeouts still leave time to work.
+
+        Returns:
+            The deadline, or None if the context has no remaining-time method.
+        """
+        if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+            return None
+        if reserve_ms is None:
+            fraction = float(os.environ.get("WORKER_DEADLINE_RESERVE_FRACTION", "0.25"))
+            reserve_ms = min(
+                int(os.environ.get("WORKER_DEADLINE_RESERVE_MS", "30000")),
+                int(context.get_remaining_time_in_millis() * fraction),
+            )
+        return cls(context.get_remaining_time_in_millis, reserve_ms)
+
+    @classmethod
+    def after(cls, seconds: float, reserve_ms: int = 0) -> "Deadline":
+        """Build a deadline that expires a fixed time from now (for scripts and tests).
+
+        Args:
+            seconds: Budget from now.
+            reserve_ms: Reserve to keep.
+
+        Returns:
+            The deadline.
+        """
+        end = time.monotonic() + seconds
+        return cls(lambda: int((end - time.monotonic()) * 1000), reserve_ms)
+
+    def remaining_ms(self) -> int:
+        """Milliseconds left before the reserve is reached."""
+        return self._remaining_ms() - self.reserve_ms
+
+    def expired(self) -> bool:
+        """Whether new work should no longer be started."""
+        return self.remaining_ms() <= 0
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one work item: a value, an error, or skipped for lack of time."""
+
+    item: Any
+    value: Any = None
+    error: BaseException | None = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+class WorkerPool:
+    """Thread pool for I/O-heavy items plus a semaphore for their CPU-bound stage."""
+
+    def __init__(self, max_concurrency: int | None = None, cpu_workers: int | None = None):
+        """Initialize the pool.
+
+        Args:
+            max_concurrency: Threads, i.e. items in flight at once. Defaults to
+                WORKER_MAX_CONCURRENCY (8).
+            cpu_workers: Items allowed in their CPU-bound stage at once. Defaults
+                to WORKER_CPU_WORKERS, or the Lambda vCPU count.
+        """
+        self.max_concurrency = max_concurrency or int(os.environ.get("WORKER_MAX_CONCURRENCY", "8"))
+        self.cpu_workers = cpu_workers or int(os.environ.get("WORKER_CPU_WORKERS", "0")) or lambda_vcpus()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="worker"
+        )
+        self._cpu = threading.BoundedSemaphore(self.cpu_workers)
+
+    @contextmanager
+    def cpu_slot(self) -> Iterator[None]:
+        """Hold one of the `cpu_workers` slots for a CPU-bound section."""
+        with self._cpu:
+            yield
+
+    def map(
+        self,
+        fn: Callable[[Any], Any],
+        items: list,
+        deadline: Deadline | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[TaskResult]:
+        """Run `fn` over `items` concurrently; never raises for a single item.
+
+        `fn` must not call map() itself: it would wait on the threads it occupies.
+
+        Args:
+            fn: Function applied to each item.
+            items: Work items.
+            deadline: Items not yet started when it expires are skipped.
+            max_concurrency: Optional lower cap for this call only.
+
+        Returns:
+            One TaskResult per item, in input order.
+        """
+        limit = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+        def run(item) -> TaskResult:
+            if limit is not None:
+                limit.acquire()
+            try:
+                if deadline is not None and deadline.expired():
+                    return TaskResult(item, skipped=True)
+                return TaskResult(item, value=fn(item))
+            except Exception as e:
+                return TaskResult(item, error=e)
+            finally:
+                if limit is not None:
+                    limit.release()
+
+        results = list(self._executor.map(run, items))
+        skipped = sum(1 for r in results if r.skipped)
+        if skipped:
+            logger.warning(f"Skipped {skipped} of {len(items)} item(s): invocation deadline reached")
+        return results
+
+
+_default_pool: WorkerPool | None = None
+
+
+def get_worker_pool() -> WorkerPool:
+    """Return the process-wide pool, kept at module scope for warm invocations.
+
+    Returns:
+        The shared WorkerPool instance.
+    """
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = WorkerPool()
+    return _default_pool
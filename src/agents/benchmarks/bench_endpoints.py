@@ -0,0 +1,39 @@
+"""End-to-end /parse and /rank against the fake LLM (BENCH_LLM_LATENCY_MS, default 20)."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.bench_prompts import JOB, _resumes
+
+
+@pytest.fixture(scope="module")
+def parser_client(fake_llm):
+    from resume_parser.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def ranking_client(fake_llm):
+    from ranking_agent.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("size", ["small", "large"])
+@pytest.mark.parametrize("kind", ["pdf", "docx"])
+def bench_parse(benchmark, parser_client, corpus, size, kind):
+    body = {"file_path": corpus[size][kind][0]}
+    response = benchmark(parser_client.post, "/parse", json=body)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("mode", ["llm", "local", "shortlist"])
+@pytest.mark.parametrize("count", [20, 100])
+def bench_rank(benchmark, ranking_client, count, mode):
+    body = {"resumes": _resumes(count), "job": JOB, "mode": mode}
+    response = benchmark(ranking_client.post, "/rank", json=body)
+    assert response.status_code == 200
+    assert len(response.json()["rankings"]) == count
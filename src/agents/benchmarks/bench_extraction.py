@@ -0,0 +1,40 @@
+"""Text extraction and compaction on the synthetic corpus, per size and PDF backend."""
+
+import pytest
+
+from benchmarks.corpus import SIZES
+from resume_parser.agent import ResumeParserAgent
+from resume_parser.pdf_text import extract_pdf_text
+from resume_parser.text_compaction import compact_resume_text
+from shared.config import PARSE_EXTRACT_CHAR_LIMIT, PARSE_TEXT_TOKEN_BUDGET
+
+
+@pytest.fixture(scope="module")
+def agent():
+    return ResumeParserAgent()
+
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_extract_pdf(benchmark, agent, corpus, size):
+    text = benchmark(agent._extract_pdf, corpus[size]["pdf"][0])
+    assert text
+
+
+@pytest.mark.parametrize("backend", ["pdfium", "pdfplumber"])
+@pytest.mark.parametrize("size", SIZES)
+def bench_extract_pdf_backend(benchmark, corpus, size, backend):
+    text = benchmark(extract_pdf_text, corpus[size]["pdf"][0], PARSE_EXTRACT_CHAR_LIMIT, backend)
+    assert text
+
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_extract_docx(benchmark, agent, corpus, size):
+    text = benchmark(agent._extract_docx, corpus[size]["docx"][0])
+    assert text
+
+
+@pytest.mark.parametrize("size", SIZES)
+def bench_compact_text(benchmark, corpus, size):
+    text = extract_pdf_text(corpus[size]["pdf"][0], PARSE_EXTRACT_CHAR_LIMIT, "pdfium")
+    compacted = benchmark(compact_resume_text, text, PARSE_TEXT_TOKEN_BUDGET)
+    assert 0 < len(compacted) <= PARSE_TEXT_TOKEN_BUDGET * 4
@@ -0,0 +1,76 @@
+"""Prompt construction, chunking and LLM response parsing."""
+
+import json
+
+import pytest
+
+from aws_lambda.shared.bedrock_client import BedrockClient
+from benchmarks.corpus import LEVELS, SKILLS
+from ranking_agent.prompt import _format_resumes, build_ranking_prompt, chunk_resumes
+
+
+def _resumes(count: int) -> list[dict]:
+    return [
+        {
+            "resume_id": i,
+            "candidate_name": f"Candidate {i}",
+            "skills": SKILLS[i % 8 : i % 8 + 10],
+            "experience_level": LEVELS[i % len(LEVELS)],
+            "summary": "Engineer with experience shipping data and web products. " * 3,
+        }
+        for i in range(count)
+    ]
+
+
+JOB = {
+    "job_id": "job-1",
+    "title": "Backend Engineer",
+    "description": "Build and operate services on AWS. " * 10,
+    "required_skills": ["Python", "SQL", "AWS"],
+    "preferred_skills": ["Docker", "Kubernetes"],
+    "experience_level": "Mid",
+}
+
+
+@pytest.mark.parametrize("count", [20, 200])
+def bench_format_resumes(benchmark, count):
+    benchmark(_format_resumes, _resumes(count))
+
+
+@pytest.mark.parametrize("count", [20, 200])
+def bench_build_ranking_prompt(benchmark, count):
+    benchmark(build_ranking_prompt, _resumes(count))
+
+
+def bench_chunk_resumes(benchmark):
+    chunks = benchmark(chunk_resumes, _resumes(1000), 8000, 20)
+    assert sum(len(c) for c in chunks) == 1000
+
+
+_RANKINGS = json.dumps(
+    {
+        "rankings": [
+            {
+                "resume_id": i,
+                "skill_match_score": 80,
+                "experience_match_score": 70,
+                "overall_score": 76,
+                "summary": "Strong match on the required skills.",
+            }
+            for i in range(20)
+        ]
+    }
+)
+
+RESPONSES = {
+    "clean": _RANKINGS,
+    "wrapped": f"Here are the rankings:\n```json\n{_RANKINGS}\n```\nLet me know if you need more.",
+}
+
+
+@pytest.mark.parametrize("shape", RESPONSES)
+def bench_invoke_json(benchmark, monkeypatch, shape):
+    client = BedrockClient(region="us-east-1")
+    monkeypatch.setattr(client, "invoke", lambda *args, **kwargs: RESPONSES[shape])
+    parsed = benchmark(client.invoke_json, "prompt")
+    assert len(parsed["rankings"]) == 20
@@ -0,0 +1,70 @@
+"""Cold import time of each Lambda handler, measured with `python -X importtime`.
+
+Each run is a fresh interpreter with the same flat layout as the deployment zip
+(handler module and its siblings next to `shared/`). Reports the median
+cumulative import time of the handler module and the modules with the highest
+self time from the last run.
+
+Usage (from src/agents):
+    python -m benchmarks.cold_start --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "aws_lambda")
+
+HANDLERS = {"resume_parser": "parser", "ranking_agent": "ranker"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for function_dir in HANDLERS:
+        totals, modules = [], {}
+        for _ in range(args.runs):
+            modules = import_times(function_dir)
+            totals.append(modules["handler"][1])
+        loaded = {"boto3", "pdfplumber", "pypdfium2", "docx", "shared.s3_client"} & set(modules)
+        print(f"\n{function_dir}: median {statistics.median(totals) / 1000:.1f} ms "
+              f"over {args.runs} runs, {len(modules)} modules")
+        print(f"  heavy modules loaded: {', '.join(sorted(loaded)) or 'none'}")
+        print(f"  {'module':<40}{'self ms':>10}{'cumulative ms':>16}")
+        slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[: args.top]
+        for name, (own, cumulative) in slowest:
+            print(f"  {name:<40}{own / 1000:>10.1f}{cumulative / 1000:>16.1f}")
+
+
+def import_times(function_dir: str) -> dict[str, tuple[int, int]]:
+    """Import the handler in a fresh interpreter; returns {module: (self_us, cumulative_us)}."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([os.path.join(LAMBDA_DIR, function_dir), LAMBDA_DIR]),
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    env.pop("COLD_START_PROFILE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import handler"],
+        cwd=LAMBDA_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+# Configuration is read at import time, so set it before the agents are imported.
+# Caches are off so every round measures real work.
+os.environ.setdefault("ANTHROPIC_API_KEY", "fake")
+os.environ["PARSE_CACHE_BACKEND"] = "none"
+os.environ["RANKING_CACHE_BACKEND"] = "none"
+
+# Fake LLM latency for the end-to-end benchmarks
+LLM_LATENCY_MS = float(os.environ.get("BENCH_LLM_LATENCY_MS", "20"))
+
+
+@pytest.fixture(scope="session")
+def corpus(tmp_path_factory):
+    from benchmarks.corpus import write_corpus
+
+    return write_corpus(str(tmp_path_factory.mktemp("corpus")))
+
+
+@pytest.fixture(scope="session")
+def fake_llm():
+    from benchmarks.fake_llm import FakeLLMServer
+
+    with FakeLLMServer(LLM_LATENCY_MS) as server:
+        os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+        yield server
@@ -0,0 +1,100 @@
+"""Synthetic PDF and DOCX resumes of varying size for the benchmarks.
+
+PDFs are written by hand (one Helvetica text stream per page) so no PDF
+authoring library is needed; DOCX files use python-docx.
+"""
+
+import os
+import random
+
+SKILLS = [
+    "Python", "SQL", "AWS", "Docker", "Kubernetes", "React", "TypeScript", "Go",
+    "PostgreSQL", "Terraform", "Spark", "Airflow", "Java", "C#", ".NET", "Azure",
+    "Salesforce", "Tableau", "Power BI", "Excel", "Agile", "Scrum", "CI/CD", "Git",
+]
+TITLES = ["Software Engineer", "Data Analyst", "DevOps Engineer", "Product Manager", "QA Engineer"]
+LEVELS = ["Junior", "Mid", "Senior", "Lead"]
+
+# Pages per PDF (and roughly 50 lines per page) for each corpus size
+SIZES = {"small": 1, "medium": 3, "large": 25}
+
+_LINES_PER_PAGE = 50
+
+
+def resume_lines(index: int, pages: int) -> list[str]:
+    rng = random.Random(index)
+    skills = rng.sample(SKILLS, 8)
+    lines = [
+        f"Candidate {index}",
+        f"{rng.choice(LEVELS)} {rng.choice(TITLES)}",
+        f"Skills: {', '.join(skills)}",
+    ]
+    while len(lines) < pages * _LINES_PER_PAGE:
+        year = 2024 - len(lines) // 10
+        lines.append(
+            f"{year}: {rng.choice(TITLES)} - delivered projects with {rng.choice(skills)} and {rng.choice(skills)}"
+        )
+    return lines
+
+
+def make_pdf(lines: list[str]) -> bytes:
+    pages = [lines[i : i + _LINES_PER_PAGE] for i in range(0, len(lines), _LINES_PER_PAGE)]
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page_lines in pages:
+        shown = " ".join(f"({_escape(line)}) '" for line in page_lines)
+        stream = f"BT /F1 10 Tf 50 790 Td 14 TL {shown} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def make_docx(lines: list[str], path: str) -> None:
+    from docx import Document
+
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def write_corpus(directory: str, per_size: int = 1) -> dict[str, dict[str, list[str]]]:
+    """Write `per_size` PDF and DOCX resumes per size; returns {size: {"pdf": [...], "docx": [...]}}."""
+    corpus = {}
+    index = 0
+    for size, pages in SIZES.items():
+        corpus[size] = {"pdf": [], "docx": []}
+        for _ in range(per_size):
+            lines = resume_lines(index, pages)
+            pdf_path = os.path.join(directory, f"resume_{size}_{index}.pdf")
+            with open(pdf_path, "wb") as f:
+                f.write(make_pdf(lines))
+            docx_path = os.path.join(directory, f"resume_{size}_{index}.docx")
+            make_docx(lines, docx_path)
+            corpus[size]["pdf"].append(pdf_path)
+            corpus[size]["docx"].append(docx_path)
+            index += 1
+    return corpus
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
@@ -0,0 +1,212 @@
+"""Local stand-in for the Anthropic Messages API with configurable latency.
+
+Answers parse prompts with a fixed resume and ranking prompts with a score for
+every `resume_id` found in the prompt, so the agents can be exercised end to end
+without network access or API spend. Message Batches are supported too: a
+batch ends once the latency has passed and its results are computed when read.
+Point the SDK at it with ANTHROPIC_BASE_URL.
+"""
+
+import asyncio
+import json
+import re
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+_RESUME_ID = re.compile(r"resume_id: (\d+)")
+
+
+def create_app(latency_ms: float = 500) -> FastAPI:
+    app = FastAPI(title="Fake LLM")
+    app.state.latency_ms = latency_ms
+    app.state.requests = 0
+    app.state.cached_prefixes = set()
+    app.state.batches = {}
+    # custom_ids whose batch result is "errored"
+    app.state.batch_errors = set()
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        await asyncio.sleep(app.state.latency_ms / 1000)
+        return fake_message(app.state, body)
+
+    @app.post("/v1/messages/batches")
+    async def create_batch(request: Request):
+        body = await request.json()
+        batch_id = f"msgbatch_fake_{len(app.state.batches) + 1}"
+        app.state.batches[batch_id] = {
+            "created": time.time(),
+            "requests": body["requests"],
+        }
+        return _batch_object(app.state, batch_id, request)
+
+    @app.get("/v1/messages/batches/{batch_id}")
+    async def retrieve_batch(batch_id: str, request: Request):
+        if batch_id not in app.state.batches:
+            return JSONResponse({"type": "error", "error": {"type": "not_found_error"}}, 404)
+        return _batch_object(app.state, batch_id, request)
+
+    @app.get("/v1/messages/batches/{batch_id}/results")
+    async def batch_results(batch_id: str):
+        lines = []
+        for item in app.state.batches[batch_id]["requests"]:
+            app.state.requests += 1
+            if item["custom_id"] in app.state.batch_errors:
+                result = {
+                    "type": "errored",
+                    "error": {"type": "error", "error": {"type": "api_error", "message": "fake"}},
+                }
+            else:
+                result = {"type": "succeeded", "message": fake_message(app.state, item["params"])}
+            lines.append(json.dumps({"custom_id": item["custom_id"], "result": result}))
+        return PlainTextResponse("\n".join(lines) + "\n", media_type="application/binary")
+
+    return app
+
+
+def fake_message(state, body: dict) -> dict:
+    text = json.dumps(fake_completion(prompt_text(body)))
+    return {
+        "id": f"msg_fake_{state.requests}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "fake"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {**cache_usage(state, body), "output_tokens": len(text) // 4},
+    }
+
+
+def _batch_object(state, batch_id: str, request: Request) -> dict:
+    """A batch ends once the configured latency has passed since it was created."""
+    batch = state.batches[batch_id]
+    created = batch["created"]
+    ended = time.time() - created >= state.latency_ms / 1000
+    count = len(batch["requests"])
+    return {
+        "id": batch_id,
+        "type": "message_batch",
+        "processing_status": "ended" if ended else "in_progress",
+        "request_counts": {
+            "processing": 0 if ended else count,
+            "succeeded": count if ended else 0,
+            "errored": 0,
+            "canceled": 0,
+            "expired": 0,
+        },
+        "created_at": _iso(created),
+        "expires_at": _iso(created + 86400),
+        "ended_at": _iso(created + state.latency_ms / 1000) if ended else None,
+        "results_url": f"{str(request.base_url).rstrip('/')}/v1/messages/batches/{batch_id}/results"
+        if ended
+        else None,
+        "archived_at": None,
+        "cancel_initiated_at": None,
+    }
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def prompt_text(body: dict) -> str:
+    """Flatten system and message content (plain strings or text blocks) into one string."""
+    parts = []
+    for content in [body.get("system")] + [m["content"] for m in body.get("messages", [])]:
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(block.get("text", "") for block in content)
+    return "\n".join(parts)
+
+
+def cache_usage(state, body: dict) -> dict:
+    """Input token counts split the way prompt caching reports them.
+
+    The system prefix up to the last `cache_control` block is a cache write the
+    first time it is seen and a cache read afterwards. Unlike the real API,
+    there is no minimum length and no expiry.
+    """
+    system = body.get("system")
+    blocks = system if isinstance(system, list) else []
+    marked = [i for i, block in enumerate(blocks) if block.get("cache_control")]
+    prefix = "".join(block.get("text", "") for block in blocks[: marked[-1] + 1]) if marked else ""
+    total = len(prompt_text(body)) // 4
+    if not prefix:
+        return {"input_tokens": total, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+    cached = len(prefix) // 4
+    hit = prefix in state.cached_prefixes
+    state.cached_prefixes.add(prefix)
+    return {
+        "input_tokens": total - cached,
+        "cache_creation_input_tokens": 0 if hit else cached,
+        "cache_read_input_tokens": cached if hit else 0,
+    }
+
+
+def fake_completion(prompt: str) -> dict:
+    resume_ids = [int(i) for i in _RESUME_ID.findall(prompt)]
+    if "rankings" in prompt and resume_ids:
+        return {
+            "rankings": [
+                {
+                    "resume_id": resume_id,
+                    "skill_match_score": 50 + resume_id % 50,
+                    "experience_match_score": 70.0,
+                    "overall_score": 0.6 * (50 + resume_id % 50) + 28.0,
+                    "summary": "Solid match on core skills.",
+                }
+                for resume_id in resume_ids
+            ]
+        }
+    return {
+        "candidate_name": "Jane Doe",
+        "skills": ["Python", "SQL", "AWS"],
+        "experience_level": "Mid",
+        "summary": "Backend engineer with five years of experience.",
+        "suitable_roles": [{"role": "Backend Engineer", "score": 9}],
+    }
+
+
+class FakeLLMServer:
+    """Runs the fake API on a free local port in a background thread."""
+
+    def __init__(self, latency_ms: float = 500):
+        self.app = create_app(latency_ms)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self) -> "FakeLLMServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=5199)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms), host="127.0.0.1", port=args.port)
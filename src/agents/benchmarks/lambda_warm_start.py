@@ -0,0 +1,127 @@
+"""Per-invocation overhead of the Lambda handlers with and without client reuse.
+
+AWS clients are real (service model loading, credential resolution, config)
+but S3 GetObject and Bedrock InvokeModel are answered by `before-call` hooks,
+so no network or AWS account is needed. "per-invocation clients" swaps the
+handler's getter for the constructor, which reproduces building a new
+parser/agent on each call; "reused clients" is the warm path.
+
+Usage (from src/agents):
+    python -m benchmarks.lambda_warm_start --invocations 200
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_llm import fake_completion, prompt_text
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "aws_lambda")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--invocations", type=int, default=200)
+    args = parser.parse_args()
+
+    # Dummy credentials keep resolution local instead of probing instance metadata
+    os.environ.update(
+        AWS_ACCESS_KEY_ID="testing",
+        AWS_SECRET_ACCESS_KEY="testing",
+        AWS_REGION="us-east-1",
+        S3_BUCKET_NAME="bench-bucket",
+        PARSE_CACHE_BACKEND="none",
+        EMF_METRICS="false",
+        LOG_EVENT_SAMPLE_RATE="0",
+    )
+    sys.path[:0] = [
+        LAMBDA_DIR,
+        os.path.join(LAMBDA_DIR, "resume_parser"),
+        os.path.join(LAMBDA_DIR, "ranking_agent"),
+    ]
+
+    from botocore.awsrequest import AWSResponse
+    from botocore.session import Session
+
+    from benchmarks.corpus import make_docx, resume_lines
+
+    created = {"clients": 0}
+    real_create_client = Session.create_client
+
+    def stubbed_create_client(self, service_name, *a, **kw):
+        client = real_create_client(self, service_name, *a, **kw)
+        client.meta.events.register("before-call.*.*", _fake_response)
+        created["clients"] += 1
+        return client
+
+    Session.create_client = stubbed_create_client
+    _fake_response.http = AWSResponse("https://stub", 200, {}, None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = os.path.join(tmp, "resume.docx")
+        make_docx(resume_lines(0, 1), docx_path)
+        with open(docx_path, "rb") as f:
+            _fake_response.docx = f.read()
+
+        parse_handler = _load("parse_handler", "resume_parser")
+        rank_handler = _load("rank_handler", "ranking_agent")
+        parse_event = {"file_path": "resumes/resume.docx"}
+        rank_event = {
+            "resumes": [{"resume_id": i, "candidate_name": f"C{i}", "skills": ["Python"]} for i in range(5)],
+            "job": {
+                "job_id": "job-1",
+                "title": "Engineer",
+                "description": "Build things",
+                "required_skills": ["Python"],
+                "preferred_skills": [],
+                "experience_level": "Mid",
+            },
+        }
+
+        print(f"{args.invocations} invocations per scenario")
+        print(f"{'scenario':<34}{'ms/invocation':>15}{'clients built':>15}")
+        for name, handler, getter, event in (
+            ("parse", parse_handler, "get_parser", parse_event),
+            ("rank", rank_handler, "get_agent", rank_event),
+        ):
+            reused = getattr(handler, getter)
+            constructor = parse_handler.ResumeParser if name == "parse" else rank_handler.RankingAgent
+            for reuse in (False, True):
+                handler.reset()
+                setattr(handler, getter, reused if reuse else constructor)
+                created["clients"] = 0
+                handler.lambda_handler(event, None)  # first (cold) invocation is not timed
+                start = time.perf_counter()
+                for _ in range(args.invocations):
+                    response = handler.lambda_handler(event, None)
+                    assert response["statusCode"] == 200, response
+                elapsed = (time.perf_counter() - start) * 1000 / args.invocations
+                label = f"{name} ({'reused' if reuse else 'per-invocation'} clients)"
+                print(f"{label:<34}{elapsed:>15.2f}{created['clients']:>15}")
+
+
+def _fake_response(model, params, **kwargs):
+    """Answer GetObject and InvokeModel locally; returning a value skips the HTTP call."""
+    if model.name == "GetObject":
+        return _fake_response.http, {"Body": io.BytesIO(_fake_response.docx)}
+    if model.name == "InvokeModel":
+        reply = fake_completion(prompt_text(json.loads(params["body"])))
+        body = json.dumps({"content": [{"type": "text", "text": json.dumps(reply)}]}).encode()
+        return _fake_response.http, {"body": io.BytesIO(body)}
+    return None
+
+
+def _load(name: str, function_dir: str):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(LAMBDA_DIR, function_dir, "handler.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Throughput of the sync vs async agents against the fake LLM server.
+
+The sync agents block the event loop for the whole LLM round-trip, so a uvicorn
+worker using them completes one request per LLM latency. The async agents share
+one connection pool and overlap up to LLM_MAX_IN_FLIGHT calls.
+
+Usage (from src/agents):
+    python -m benchmarks.load_test --requests 40 --latency-ms 500
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    args = parser.parse_args()
+
+    from benchmarks.fake_llm import FakeLLMServer
+
+    with FakeLLMServer(args.latency_ms) as server:
+        # Configuration is read at import time, so set it before importing the agents
+        os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+        os.environ["ANTHROPIC_API_KEY"] = "fake"
+        os.environ["PARSE_CACHE_BACKEND"] = "none"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            files = _write_resumes(tmp, args.requests)
+            results = [
+                ("parse (sync)", _run_sync_parse(files)),
+                ("parse (async)", asyncio.run(_run_async_parse(files))),
+                ("rank (sync)", _run_sync_rank(args.requests)),
+                ("rank (async)", asyncio.run(_run_async_rank(args.requests))),
+            ]
+
+    print(f"{args.requests} requests, {args.latency_ms:.0f} ms fake LLM latency")
+    print(f"{'scenario':<16}{'seconds':>10}{'req/s':>10}")
+    for name, elapsed in results:
+        print(f"{name:<16}{elapsed:>10.2f}{args.requests / elapsed:>10.1f}")
+
+
+def _write_resumes(directory: str, count: int) -> list[str]:
+    from docx import Document
+
+    paths = []
+    for i in range(count):
+        doc = Document()
+        doc.add_paragraph(f"Candidate {i}")
+        doc.add_paragraph("Skills: Python, SQL, AWS")
+        path = os.path.join(directory, f"resume_{i}.docx")
+        doc.save(path)
+        paths.append(path)
+    return paths
+
+
+def _rank_request(i: int):
+    from ranking_agent.models import JobData, ResumeData
+
+    resumes = [
+        ResumeData(
+            resume_id=i * 10 + n,
+            candidate_name=f"Candidate {n}",
+            skills=["Python", "SQL"],
+            experience_level="Mid",
+            summary="Backend engineer.",
+        )
+        for n in range(5)
+    ]
+    job = JobData(
+        job_id="software-engineer",
+        title="Software Engineer",
+        description="Build backend services.",
+        required_skills=["Python"],
+        preferred_skills=["AWS"],
+        experience_level="Mid",
+    )
+    return resumes, job
+
+
+def _run_sync_parse(files: list[str]) -> float:
+    from resume_parser.agent import ResumeParserAgent
+
+    agent = ResumeParserAgent()
+    start = time.perf_counter()
+    for path in files:
+        agent.parse(path)
+    return time.perf_counter() - start
+
+
+async def _run_async_parse(files: list[str]) -> float:
+    from resume_parser.agent import AsyncResumeParserAgent
+    from shared.llm import close_async_client
+
+    agent = AsyncResumeParserAgent()
+    start = time.perf_counter()
+    await asyncio.gather(*(agent.parse(path) for path in files))
+    elapsed = time.perf_counter() - start
+    await close_async_client()
+    return elapsed
+
+
+def _run_sync_rank(count: int) -> float:
+    from ranking_agent.agent import RankingAgent
+
+    agent = RankingAgent()
+    start = time.perf_counter()
+    for i in range(count):
+        agent.rank(*_rank_request(i))
+    return time.perf_counter() - start
+
+
+async def _run_async_rank(count: int) -> float:
+    from ranking_agent.agent import AsyncRankingAgent
+    from shared.llm import close_async_client
+
+    agent = AsyncRankingAgent()
+    start = time.perf_counter()
+    await asyncio.gather(*(agent.rank(*_rank_request(i)) for i in range(count)))
+    elapsed = time.perf_counter() - start
+    await close_async_client()
+    return elapsed
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,405 @@
-import json
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 
 from anthropic import Anthropic
+from anthropic.types import Message
 
-from shared.config import ANTHROPIC_API_KEY
+from shared.cache import create_cache
+from shared.config import (
+    ANTHROPIC_API_KEY,
+    ANTHROPIC_MODEL,
+    RANKING_CACHE_BACKEND,
+    RANKING_CACHE_MAX_ENTRIES,
+    RANKING_CACHE_PATH,
+    RANKING_CACHE_TTL_SECONDS,
+    RANKING_CHUNK_CONCURRENCY,
+    RANKING_CHUNK_MAX_RESUMES,
+    RANKING_CHUNK_TOKEN_BUDGET,
+    RANKING_MAX_RETRIES,
+    RANKING_SHORTLIST_SIZE,
+)
+from shared.llm import get_async_client, llm_slot, record_usage, system_blocks
+from shared.llm_json import json_array, load_json_object
+from shared.metrics import llm_in_flight, stage
 
-from .models import JobData, RankingScore, ResumeData
-from .prompt import build_ranking_prompt
+from .models import JobData, RankingMode, RankingScore, ResumeData
+from .prompt import (
+    RANKING_PROMPT_VERSION,
+    RANKING_SYSTEM_PROMPT,
+    build_job_prompt,
+    build_ranking_prompt,
+    chunk_resumes,
+)
+from .score_cache import RankingScoreCache
+from .scoring import score_resumes
 
+logger = logging.getLogger(__name__)
 
-class RankingAgent:
-    """Ranks resumes against job descriptions using Claude API."""
 
-    def __init__(self):
-        self._client = Anthropic(api_key=ANTHROPIC_API_KEY)
+class _RankingAgentBase:
+    """Chunking, prompt construction and response handling shared by the sync and async agents.
+
+    Candidates are split into token-budgeted chunks that are scored
+    independently. Any resume_id missing from a chunk's response (or belonging
+    to a chunk that failed) is re-requested up to RANKING_MAX_RETRIES times.
+    A truncated response keeps its complete, valid rankings, so only the rest
+    of the chunk is re-requested.
+
+    In "shortlist" mode only the best candidates by local score go to the LLM;
+    the rest keep their local scores and are listed after the shortlist.
+
+    LLM scores are cached per (resume, job) pair, so re-ranking a job only
+    sends new or changed candidates to the LLM.
+    """
+
+    def __init__(self, score_cache: RankingScoreCache | None = None):
+        if score_cache is None:
+            cache = create_cache(
+                RANKING_CACHE_BACKEND,
+                path=RANKING_CACHE_PATH,
+                max_entries=RANKING_CACHE_MAX_ENTRIES,
+                ttl_seconds=RANKING_CACHE_TTL_SECONDS,
+            )
+            if cache is not None:
+                score_cache = RankingScoreCache(
+                    cache, model=ANTHROPIC_MODEL, prompt_version=RANKING_PROMPT_VERSION
+                )
+        self.score_cache = score_cache
+
+    def cached_scores(
+        self, resumes: list[ResumeData], job: JobData
+    ) -> dict[int, RankingScore]:
+        """Scores of `resumes` for `job` already in the score cache, by resume_id."""
+        if self.score_cache is None:
+            return {}
+        scores = self.score_cache.lookup(resumes, job)
+        logger.info(
+            "Ranking job %s: %d candidate(s) from cache, %d to score",
+            job.job_id,
+            len(scores),
+            len(resumes) - len(scores),
+        )
+        return scores
+
+    def _store_scores(
+        self, resumes: list[ResumeData], job: JobData, scores: dict[int, RankingScore]
+    ) -> None:
+        if self.score_cache is not None:
+            self.score_cache.store(resumes, job, scores)
+
+    def _shortlist(
+        self, resumes: list[ResumeData], job: JobData, shortlist_size: int | None
+    ) -> tuple[list[ResumeData], list[RankingScore]]:
+        local = self._score_locally(resumes, job)
+        by_id = {r.resume_id: r for r in resumes}
+        size = shortlist_size or RANKING_SHORTLIST_SIZE
+        return [by_id[s.resume_id] for s in local[:size]], local
 
-    def rank(self, resumes: list[ResumeData], job: JobData) -> list[RankingScore]:
-        resumes_dict = [r.model_dump() for r in resumes]
-        job_dict = job.model_dump()
+    def _score_locally(self, resumes: list[ResumeData], job: JobData) -> list[RankingScore]:
+        with stage("local_scoring"):
+            return score_resumes(resumes, job)
 
-        prompt = build_ranking_prompt(resumes_dict, job_dict)
+    def _shortlist_failed(self, job: JobData, error: Exception) -> list[RankingScore]:
+        # The local scores are already computed; they stand in for the LLM's
+        logger.warning(
+            "LLM re-scoring of the shortlist for job %s failed, keeping local scores: %s",
+            job.job_id,
+            error,
+        )
+        return []
+
+    def _combine_shortlist(
+        self, llm_scores: list[RankingScore], local: list[RankingScore], size: int
+    ) -> list[RankingScore]:
+        scored = {s.resume_id for s in llm_scores}
+        # Shortlisted candidates the LLM never scored fall back to their local score
+        shortlist = llm_scores + [s for s in local[:size] if s.resume_id not in scored]
+        shortlist.sort(key=lambda s: s.overall_score, reverse=True)
+        return shortlist + local[size:]
 
-        message = self._client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}],
+    def chunks(self, resumes: list[ResumeData]) -> list[list[ResumeData]]:
+        """Split candidates into the token-budgeted chunks scored by one LLM request each."""
+        by_id = {r.resume_id: r for r in resumes}
+        chunks = chunk_resumes(
+            [r.model_dump() for r in resumes],
+            RANKING_CHUNK_TOKEN_BUDGET,
+            RANKING_CHUNK_MAX_RESUMES,
         )
+        return [[by_id[r["resume_id"]] for r in chunk] for chunk in chunks]
+
+    def message_params(self, resumes: list[ResumeData], job: JobData) -> dict:
+        """Messages API parameters for scoring one chunk, also usable as a batch request."""
+        with stage("prompt_build"):
+            resumes_dict = [r.model_dump() for r in resumes]
 
-        response_text = message.content[0].text
+            prompt = build_ranking_prompt(resumes_dict)
+            return {
+                "model": ANTHROPIC_MODEL,
+                "max_tokens": 4096,
+                # Instructions, then the job: chunks of one job share the whole prefix
+                "system": system_blocks(
+                    RANKING_SYSTEM_PROMPT, build_job_prompt(job.model_dump())
+                ),
+                "messages": [{"role": "user", "content": prompt}],
+            }
 
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError:
-            # Fallback: try to extract JSON from response
-            start = response_text.find("{")
-            end = response_text.rfind("}") + 1
-            if start >= 0 and end > start:
-                parsed = json.loads(response_text[start:end])
-            else:
-                raise ValueError("Failed to parse ranking response as JSON")
+    def scores_from_message(
+        self, message: Message, resumes: list[ResumeData], job: JobData
+    ) -> dict[int, RankingScore]:
+        """Scores of `resumes` from the reply to their chunk request, stored in the score cache."""
+        scores: dict[int, RankingScore] = {}
+        self._merge(resumes, [self._chunk_rankings(message, resumes, job)], scores)
+        self._store_scores(resumes, job, scores)
+        return scores
+
+    def _chunk_rankings(
+        self, message: Message, resumes: list[ResumeData], job: JobData
+    ) -> list[RankingScore]:
+        rankings = self._to_rankings(message.content[0].text, job)
+        missing = {r.resume_id for r in resumes} - {s.resume_id for s in rankings}
+        if missing:
+            logger.warning(
+                "Ranking response for job %s (stop reason %s) is missing %d candidate(s): %s",
+                job.job_id,
+                message.stop_reason,
+                len(missing),
+                sorted(missing),
+            )
+        return rankings
 
+    def _to_rankings(self, response_text: str, job: JobData) -> list[RankingScore]:
+        with stage("json_parse"):
+            parsed, _ = load_json_object(response_text)
+        with stage("validation"):
+            return self._validate(parsed, job)
+
+    def _validate(self, parsed: dict, job: JobData) -> list[RankingScore]:
         rankings = []
-        for item in parsed["rankings"]:
-            rankings.append(
-                RankingScore(
-                    resume_id=item["resume_id"],
-                    job_id=job.job_id,
-                    skill_match_score=round(item["skill_match_score"], 1),
-                    experience_match_score=round(item["experience_match_score"], 1),
-                    overall_score=round(item["overall_score"], 1),
-                    summary=item["summary"],
+        for item in json_array(parsed, "rankings"):
+            # An invalid item (e.g. the last one of a truncated response) is
+            # dropped; its candidate is re-requested like any missing one
+            try:
+                rankings.append(
+                    RankingScore(
+                        resume_id=item["resume_id"],
+                        job_id=job.job_id,
+                        skill_match_score=round(item["skill_match_score"], 1),
+                        experience_match_score=round(item["experience_match_score"], 1),
+                        overall_score=round(item["overall_score"], 1),
+                        summary=item["summary"],
+                    )
                 )
-            )
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug("Dropping invalid ranking item %r: %s", item, e)
 
         return rankings
+
+    def _merge(
+        self,
+        pending: list[ResumeData],
+        outcomes: list[list[RankingScore] | BaseException],
+        scores: dict[int, RankingScore],
+    ) -> tuple[list[ResumeData], BaseException | None]:
+        """Add chunk results to `scores`; return the still-unscored resumes and the last error."""
+        pending_ids = {r.resume_id for r in pending}
+        error = None
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                error = outcome
+                continue
+            for score in outcome:
+                # Ignore ids the model invented or repeated from another chunk
+                if score.resume_id in pending_ids:
+                    scores[score.resume_id] = score
+        return [r for r in pending if r.resume_id not in scores], error
+
+    def _finish(
+        self,
+        job: JobData,
+        scores: dict[int, RankingScore],
+        pending: list[ResumeData],
+        error: BaseException | None,
+    ) -> list[RankingScore]:
+        if pending:
+            if not scores and error is not None:
+                raise error
+            logger.warning(
+                "Ranking for job %s is missing %d candidate(s) after retries: %s",
+                job.job_id,
+                len(pending),
+                [r.resume_id for r in pending],
+            )
+        return sorted(scores.values(), key=lambda s: s.overall_score, reverse=True)
+
+
+class RankingAgent(_RankingAgentBase):
+    """Ranks resumes against job descriptions using Claude API."""
+
+    def __init__(self, score_cache: RankingScoreCache | None = None):
+        super().__init__(score_cache)
+        self.client = Anthropic(api_key=ANTHROPIC_API_KEY)
+
+    def rank(
+        self,
+        resumes: list[ResumeData],
+        job: JobData,
+        mode: RankingMode = "llm",
+        shortlist_size: int | None = None,
+    ) -> list[RankingScore]:
+        if mode == "local":
+            return self._score_locally(resumes, job)
+        if mode == "shortlist":
+            shortlist, local = self._shortlist(resumes, job, shortlist_size)
+            try:
+                llm_scores = self._rank_with_llm(shortlist, job)
+            except Exception as e:
+                llm_scores = self._shortlist_failed(job, e)
+            return self._combine_shortlist(llm_scores, local, len(shortlist))
+        return self._rank_with_llm(resumes, job)
+
+    def _rank_with_llm(
+        self, resumes: list[ResumeData], job: JobData
+    ) -> list[RankingScore]:
+        scores = self.cached_scores(resumes, job)
+        to_score = [r for r in resumes if r.resume_id not in scores]
+        pending, error = to_score, None
+        for _ in range(RANKING_MAX_RETRIES + 1):
+            if not pending:
+                break
+            chunks = self.chunks(pending)
+            with ThreadPoolExecutor(
+                max_workers=min(len(chunks), RANKING_CHUNK_CONCURRENCY)
+            ) as pool:
+                futures = [pool.submit(self._rank_chunk, chunk, job) for chunk in chunks]
+                outcomes = [f.exception() or f.result() for f in futures]
+            pending, error = self._merge(pending, outcomes, scores)
+        self._store_scores(to_score, job, scores)
+        return self._finish(job, scores, pending, error)
+
+    def _rank_chunk(self, resumes: list[ResumeData], job: JobData) -> list[RankingScore]:
+        params = self.message_params(resumes, job)
+        with stage("llm"), llm_in_flight():
+            message = self.client.messages.create(**params)
+        record_usage(message.usage)
+        return self._chunk_rankings(message, resumes, job)
+
+
+class AsyncRankingAgent(_RankingAgentBase):
+    """Async variant for the FastAPI service, using the shared AsyncAnthropic client.
+
+    Chunks are scored concurrently, at most RANKING_CHUNK_CONCURRENCY per
+    request and bounded overall by the shared in-flight semaphore.
+    rank_stream() yields each score as soon as its chunk completes.
+    """
+
+    async def rank(
+        self,
+        resumes: list[ResumeData],
+        job: JobData,
+        mode: RankingMode = "llm",
+        shortlist_size: int | None = None,
+    ) -> list[RankingScore]:
+        if mode == "local":
+            return self._score_locally(resumes, job)
+        if mode == "shortlist":
+            shortlist, local = self._shortlist(resumes, job, shortlist_size)
+            try:
+                llm_scores = await self._rank_with_llm(shortlist, job)
+            except Exception as e:
+                llm_scores = self._shortlist_failed(job, e)
+            return self._combine_shortlist(llm_scores, local, len(shortlist))
+        return await self._rank_with_llm(resumes, job)
+
+    async def rank_stream(
+        self,
+        resumes: list[ResumeData],
+        job: JobData,
+        mode: RankingMode = "llm",
+        shortlist_size: int | None = None,
+    ) -> AsyncIterator[RankingScore]:
+        """Yield scores in completion order: cached first, then chunk by chunk.
+
+        Unlike rank(), the output is not sorted.
+        """
+        if mode == "local":
+            for score in self._score_locally(resumes, job):
+                yield score
+            return
+
+        if mode == "shortlist":
+            shortlist, local = self._shortlist(resumes, job, shortlist_size)
+            emitted = set()
+            try:
+                async for score in self._iter_llm_scores(shortlist, job):
+                    emitted.add(score.resume_id)
+                    yield score
+            except Exception as e:
+                self._shortlist_failed(job, e)
+            # Shortlisted candidates the LLM never scored, then everyone else
+            for score in local:
+                if score.resume_id not in emitted:
+                    yield score
+            return
+
+        async for score in self._iter_llm_scores(resumes, job):
+            yield score
+
+    async def _rank_with_llm(
+        self, resumes: list[ResumeData], job: JobData
+    ) -> list[RankingScore]:
+        scores = [s async for s in self._iter_llm_scores(resumes, job)]
+        return sorted(scores, key=lambda s: s.overall_score, reverse=True)
+
+    async def _iter_llm_scores(
+        self, resumes: list[ResumeData], job: JobData
+    ) -> AsyncIterator[RankingScore]:
+        scores = self.cached_scores(resumes, job)
+        for score in scores.values():
+            yield score
+
+        # Per request, so one large pool cannot take every shared in-flight slot
+        chunk_slots = asyncio.Semaphore(RANKING_CHUNK_CONCURRENCY)
+
+        async def rank_chunk(chunk: list[ResumeData]) -> list[RankingScore]:
+            async with chunk_slots:
+                return await self._rank_chunk(chunk, job)
+
+        to_score = [r for r in resumes if r.resume_id not in scores]
+        pending, error = to_score, None
+        for _ in range(RANKING_MAX_RETRIES + 1):
+            if not pending:
+                break
+            pending_ids = {r.resume_id for r in pending}
+            tasks = [asyncio.ensure_future(rank_chunk(chunk)) for chunk in self.chunks(pending)]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        chunk_scores = await next_done
+                    except Exception as e:
+                        error = e
+                        continue
+                    for score in chunk_scores:
+                        # Ignore ids the model invented or repeated from another chunk
+                        if score.resume_id in pending_ids and score.resume_id not in scores:
+                            scores[score.resume_id] = score
+                            yield score
+            finally:
+                # The consumer may stop early (e.g. a streaming client disconnects)
+                for task in tasks:
+                    task.cancel()
+            pending = [r for r in pending if r.resume_id not in scores]
+
+        self._store_scores(to_score, job, scores)
+        self._finish(job, scores, pending, error)
+
+    async def _rank_chunk(
+        self, resumes: list[ResumeData], job: JobData
+    ) -> list[RankingScore]:
+        params = self.message_params(resumes, job)
+        async with llm_slot():
+            with stage("llm"), llm_in_flight():
+                message = await get_async_client().messages.create(**params)
+        record_usage(message.usage)
+        return self._chunk_rankings(message, resumes, job)
@@ -0,0 +1,107 @@
+"""Offline bulk re-ranking through the Message Batches API.
+
+Input is a JSONL file of RankRequest objects ({"job", "resumes"}, mode is
+ignored). Each job's candidates are split into the same chunks the online agent
+uses and every chunk becomes one batch request; chunks whose scores are all in
+the score cache are written out without one. Scores are stored in the score
+cache and appended to the output JSONL, one record per chunk:
+{"custom_id", "job_id", "rankings", "missing_resume_ids"}. Rerunning with the
+same output resumes an interrupted run; see shared.message_batches.
+
+Usage (from src/agents):
+    python -m ranking_agent.bulk jobs.jsonl --output rankings.jsonl
+"""
+
+import argparse
+import hashlib
+import logging
+
+from anthropic.types import Message
+
+from shared.config import BATCH_POLL_INTERVAL_SECONDS
+from shared.message_batches import BatchRunSummary, MessageBatchRunner
+
+from .agent import RankingAgent
+from .models import JobData, RankingScore, RankRequest, ResumeData
+from .score_cache import fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def read_requests(path: str) -> list[RankRequest]:
+    with open(path, encoding="utf-8") as f:
+        return [RankRequest.model_validate_json(line) for line in f if line.strip()]
+
+
+def custom_id(job: JobData, chunk: list[ResumeData]) -> str:
+    digest = hashlib.sha256(fingerprint(job).encode())
+    for resume in chunk:
+        digest.update(fingerprint(resume).encode())
+    return digest.hexdigest()[:40]
+
+
+def run_bulk_rank(
+    rank_requests: list[RankRequest],
+    output_path: str,
+    state_path: str | None = None,
+    poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+    agent: RankingAgent | None = None,
+) -> BatchRunSummary:
+    agent = agent or RankingAgent()
+    runner = MessageBatchRunner(agent.client, output_path, state_path, poll_interval)
+
+    chunks: dict[str, tuple[JobData, list[ResumeData], dict[int, RankingScore]]] = {}
+    requests = {}
+    for rank_request in rank_requests:
+        job = rank_request.job
+        # Chunks cover all candidates, cached or not, so their ids stay stable
+        # between runs while the cache fills up
+        for chunk in agent.chunks(rank_request.resumes):
+            cid = custom_id(job, chunk)
+            if cid in chunks or runner.already_done(cid):
+                continue
+            cached = agent.cached_scores(chunk, job)
+            to_score = [r for r in chunk if r.resume_id not in cached]
+            if not to_score:
+                runner.write_result(cid, _record(job, chunk, cached))
+                continue
+            chunks[cid] = (job, chunk, cached)
+            requests[cid] = agent.message_params(to_score, job)
+
+    def handle(cid: str, message: Message) -> dict:
+        job, chunk, cached = chunks[cid]
+        to_score = [r for r in chunk if r.resume_id not in cached]
+        scores = {**cached, **agent.scores_from_message(message, to_score, job)}
+        return _record(job, chunk, scores)
+
+    return runner.run(requests, handle)
+
+
+def _record(job: JobData, chunk: list[ResumeData], scores: dict[int, RankingScore]) -> dict:
+    missing = [r.resume_id for r in chunk if r.resume_id not in scores]
+    if missing:
+        logger.warning("Ranking for job %s is missing candidate(s): %s", job.job_id, missing)
+    return {
+        "job_id": job.job_id,
+        "rankings": [s.model_dump() for s in scores.values()],
+        "missing_resume_ids": missing,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", help="JSONL file of rank requests")
+    parser.add_argument("--output", required=True, help="Results JSONL (appended to)")
+    parser.add_argument("--state", help="Run state file (default: <output>.state.json)")
+    parser.add_argument("--poll-interval", type=float, default=BATCH_POLL_INTERVAL_SECONDS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    summary = run_bulk_rank(
+        read_requests(args.input), args.output, args.state, args.poll_interval
+    )
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,46 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 
-from .agent import RankingAgent
-from .models import RankRequest, RankResponse
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-app = FastAPI(title="Ranking Agent", version="1.0.0")
-agent = RankingAgent()
+from shared.config import METRICS_ENABLED, SKILL_INDEX_PATH, SKILL_INDEX_SAVE_DELAY_SECONDS
+from shared.llm import close_async_client, usage_stats
+from shared.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware, register_cache
+
+from .agent import AsyncRankingAgent
+from .models import (
+    IndexQueryRequest,
+    IndexQueryResponse,
+    IndexResumesRequest,
+    IndexResumesResponse,
+    RankRequest,
+    RankResponse,
+)
+from .skill_index import SkillIndex
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await _flush_index()
+    await close_async_client()
+
+
+app = FastAPI(title="Ranking Agent", version="1.0.0", lifespan=lifespan)
+agent = AsyncRankingAgent()
+skill_index = SkillIndex(SKILL_INDEX_PATH or None)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    if agent.score_cache is not None:
+        register_cache("ranking_scores", agent.score_cache.cache)
 
 
 @app.post("/rank", response_model=RankResponse)
@@ -12,12 +48,139 @@ async def rank_resumes(request: RankRequest) -> RankResponse:
     if not request.resumes:
         raise HTTPException(status_code=400, detail="No resumes provided")
     try:
-        rankings = agent.rank(request.resumes, request.job)
+        rankings = await agent.rank(
+            request.resumes, request.job, request.mode, request.shortlist_size
+        )
         return RankResponse(rankings=rankings)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ranking failed: {str(e)}")
 
 
+@app.post("/rank/stream")
+async def rank_resumes_stream(request: RankRequest, http_request: Request):
+    """Stream each RankingScore as soon as it is available, in completion order.
+
+    Responds with Server-Sent Events when the client accepts text/event-stream,
+    otherwise with newline-delimited JSON. A failure after streaming has started
+    is reported as a final {"error": ...} record.
+    """
+    if not request.resumes:
+        raise HTTPException(status_code=400, detail="No resumes provided")
+
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    scores = agent.rank_stream(
+        request.resumes, request.job, request.mode, request.shortlist_size
+    )
+
+    async def body():
+        count = 0
+        try:
+            async for score in scores:
+                count += 1
+                payload = score.model_dump_json()
+                yield f"event: ranking\ndata: {payload}\n\n" if sse else payload + "\n"
+        except Exception as e:
+            payload = json.dumps({"error": f"Ranking failed: {str(e)}"})
+            yield f"event: error\ndata: {payload}\n\n" if sse else payload + "\n"
+            return
+        if sse:
+            yield f"event: done\ndata: {json.dumps({'count': count})}\n\n"
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type)
+
+
+@app.post("/index/resumes", response_model=IndexResumesResponse)
+async def index_resumes(request: IndexResumesRequest) -> IndexResumesResponse:
+    for resume in request.resumes:
+        skill_index.add(resume.resume_id, resume.skills)
+    _schedule_index_save()
+    return IndexResumesResponse(indexed=len(request.resumes), total=len(skill_index))
+
+
+@app.delete("/index/resumes/{resume_id}")
+async def remove_indexed_resume(resume_id: int):
+    if not skill_index.remove(resume_id):
+        raise HTTPException(status_code=404, detail=f"Resume not indexed: {resume_id}")
+    _schedule_index_save()
+    return {"removed": resume_id, "total": len(skill_index)}
+
+
+@app.post("/index/query", response_model=IndexQueryResponse)
+async def query_index(request: IndexQueryRequest) -> IndexQueryResponse:
+    matches = skill_index.query(request.job, request.limit, request.min_score)
+    return IndexQueryResponse(
+        matches=[asdict(m) for m in matches], total_indexed=len(skill_index)
+    )
+
+
+# Persistence is debounced: each change marks the index dirty, and one task
+# writes it SKILL_INDEX_SAVE_DELAY_SECONDS later, covering every change made
+# meanwhile. Both run on the event loop, so they need no lock.
+_index_dirty = False
+_index_saver: asyncio.Task | None = None
+
+
+def _schedule_index_save() -> None:
+    global _index_dirty, _index_saver
+    if not skill_index.path:
+        return
+    _index_dirty = True
+    if _index_saver is None or _index_saver.done():
+        _index_saver = asyncio.create_task(_save_index_later())
+
+
+async def _save_index_later() -> None:
+    while _index_dirty:
+        await asyncio.sleep(SKILL_INDEX_SAVE_DELAY_SECONDS)
+        await _save_index()
+
+
+async def _save_index() -> None:
+    global _index_dirty
+    _index_dirty = False
+    # Snapshot on the event loop so later mutations can't race the write
+    snapshot = skill_index.snapshot()
+    try:
+        await run_in_threadpool(skill_index.save, snapshot=snapshot)
+    except OSError as e:
+        logger.warning("Failed to persist the skill index: %s", e)
+        _index_dirty = True
+
+
+async def _flush_index() -> None:
+    if _index_saver is not None:
+        _index_saver.cancel()
+    if _index_dirty:
+        await _save_index()
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    if agent.score_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **agent.score_cache.stats_dict()}
+
+
+@app.delete("/cache/jobs/{job_id}")
+async def invalidate_job_cache(job_id: str):
+    if agent.score_cache is None:
+        return {"job_id": job_id, "version": None}
+    return {"job_id": job_id, "version": agent.score_cache.invalidate_job(job_id)}
+
+
+@app.get("/llm/usage")
+async def llm_usage():
+    return usage_stats()
+
+
+@app.get("/metrics")
+async def metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health():
     return {"status": "healthy", "service": "ranking_agent"}
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class ResumeData(BaseModel):
@@ -18,9 +20,17 @@ class JobData(BaseModel):
     experience_level: str
 
 
+RankingMode = Literal["llm", "local", "shortlist"]
+
+
 class RankRequest(BaseModel):
     resumes: list[ResumeData]
     job: JobData
+    # llm: every candidate is scored by the LLM
+    # local: deterministic scoring only, no LLM call
+    # shortlist: local scoring, then the top `shortlist_size` are re-scored by the LLM
+    mode: RankingMode = "llm"
+    shortlist_size: int | None = Field(default=None, ge=1)
 
 
 class RankingScore(BaseModel):
@@ -34,3 +44,36 @@ class RankingScore(BaseModel):
 
 class RankResponse(BaseModel):
     rankings: list[RankingScore]
+
+
+class IndexedResume(BaseModel):
+    """A parsed resume to index; a ParsedResumeResponse plus its resume_id validates as this."""
+    resume_id: int = Field(ge=0, le=2**32 - 1)
+    skills: list[str]
+
+
+class IndexResumesRequest(BaseModel):
+    resumes: list[IndexedResume]
+
+
+class IndexResumesResponse(BaseModel):
+    indexed: int
+    total: int
+
+
+class IndexQueryRequest(BaseModel):
+    job: JobData
+    limit: int = Field(default=50, ge=1, le=10000)
+    min_score: float = Field(default=0.0, ge=0, le=100)
+
+
+class IndexMatchResult(BaseModel):
+    resume_id: int
+    score: float
+    matched_required: int
+    matched_preferred: int
+
+
+class IndexQueryResponse(BaseModel):
+    matches: list[IndexMatchResult]
+    total_indexed: int
@@ -1,15 +1,8 @@
-def build_ranking_prompt(resumes: list[dict], job: dict) -> str:
-    return f"""You are an expert technical recruiter AI. Analyze the following resumes against the job description and provide structured scoring.
+# Bump whenever the prompt changes so cached ranking scores are invalidated.
+RANKING_PROMPT_VERSION = "2"
 
-## Job Description
-- **Title**: {job['title']}
-- **Description**: {job['description']}
-- **Required Skills**: {', '.join(job['required_skills'])}
-- **Preferred Skills**: {', '.join(job['preferred_skills'])}
-- **Experience Level Required**: {job['experience_level']}
-
-## Candidates to Evaluate
-{_format_resumes(resumes)}
+# Identical on every call: the first cacheable system block
+RANKING_SYSTEM_PROMPT = """You are an expert technical recruiter AI. Analyze the candidates against the job description and provide structured scoring.
 
 ## Scoring Instructions
 For each candidate, provide:
@@ -24,30 +17,71 @@ For each candidate, provide:
 
 ## Response Format
 Respond ONLY with valid JSON in this exact structure:
-{{
+{
   "rankings": [
-    {{
+    {
       "resume_id": <integer>,
       "skill_match_score": <float 0-100>,
       "experience_match_score": <float 0-100>,
       "overall_score": <float 0-100>,
       "summary": "<string>"
-    }}
+    }
   ]
-}}
+}
 
 Do not include any text outside the JSON object. Ensure all resume_ids from the input are represented in the output."""
 
 
+def build_job_prompt(job: dict) -> str:
+    """Job description block; identical for every chunk of the same job, so cached too."""
+    return f"""## Job Description
+- **Title**: {job['title']}
+- **Description**: {job['description']}
+- **Required Skills**: {', '.join(job['required_skills'])}
+- **Preferred Skills**: {', '.join(job['preferred_skills'])}
+- **Experience Level Required**: {job['experience_level']}"""
+
+
+def build_ranking_prompt(resumes: list[dict]) -> str:
+    return f"""## Candidates to Evaluate
+{_format_resumes(resumes)}"""
+
+
+def chunk_resumes(
+    resumes: list[dict], token_budget: int, max_per_chunk: int
+) -> list[list[dict]]:
+    """Split resumes into chunks whose formatted text fits the token budget.
+
+    A resume that alone exceeds the budget still gets a chunk of its own.
+    """
+    chunks: list[list[dict]] = []
+    current: list[dict] = []
+    used = 0
+    for r in resumes:
+        tokens = estimate_tokens(_format_resume(len(current) + 1, r))
+        if current and (used + tokens > token_budget or len(current) >= max_per_chunk):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(r)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English text
+    return len(text) // 4 + 1
+
+
 def _format_resumes(resumes: list[dict]) -> str:
-    parts = []
-    for i, r in enumerate(resumes, 1):
-        parts.append(
-            f"""### Candidate {i} (resume_id: {r['resume_id']})
+    return "\n".join(_format_resume(i, r) for i, r in enumerate(resumes, 1))
+
+
+def _format_resume(i: int, r: dict) -> str:
+    return f"""### Candidate {i} (resume_id: {r['resume_id']})
 - **Name**: {r['candidate_name']}
 - **Skills**: {', '.join(r['skills']) if r['skills'] else 'Not specified'}
-- **Experience Level**: {r.get('experience_level', 'Unknown')}
-- **Summary**: {r.get('summary', 'No summary available')[:300]}
+- **Experience Level**: {r.get('experience_level') or 'Unknown'}
+- **Summary**: {(r.get('summary') or 'No summary available')[:300]}
 """
-        )
-    return "\n".join(parts)
@@ -0,0 +1,96 @@
+"""Cache of LLM ranking scores per (resume, job) pair.
+
+Keys are derived from the full contents of the ResumeData and JobData plus the
+model and prompt version, so editing a resume or the job description yields new
+keys; the old entries are never read again and age out through LRU eviction or
+the TTL. Each key also carries the job's cache version, kept in the cache
+itself: invalidating a job bumps its version instead of finding and deleting
+its entries, so it works the same across restarts of the sqlite backend.
+"""
+
+import hashlib
+import json
+import threading
+import uuid
+from dataclasses import asdict, dataclass
+
+from shared.cache import Cache
+
+from .models import JobData, RankingScore, ResumeData
+
+
+def fingerprint(model: ResumeData | JobData) -> str:
+    payload = json.dumps(model.model_dump(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ScoreCacheStats:
+    candidates_from_cache: int = 0
+    candidates_scored: int = 0
+    jobs_invalidated: int = 0
+
+
+class RankingScoreCache:
+    def __init__(self, cache: Cache, *, model: str, prompt_version: str):
+        self.cache = cache
+        self.model = model
+        self.prompt_version = prompt_version
+        self.stats = ScoreCacheStats()
+        self._lock = threading.Lock()
+
+    def lookup(self, resumes: list[ResumeData], job: JobData) -> dict[int, RankingScore]:
+        """Cached scores for the given resumes, keyed by resume_id."""
+        job_key = self._job_key(job)
+        scores = {}
+        for resume in resumes:
+            cached = self.cache.get(self._key(fingerprint(resume), job_key))
+            if cached is not None:
+                scores[resume.resume_id] = RankingScore(**cached)
+        with self._lock:
+            self.stats.candidates_from_cache += len(scores)
+        return scores
+
+    def store(
+        self, resumes: list[ResumeData], job: JobData, scores: dict[int, RankingScore]
+    ) -> None:
+        """Cache the scores of `resumes` that are present in `scores`."""
+        job_key = self._job_key(job)
+        stored = 0
+        for resume in resumes:
+            score = scores.get(resume.resume_id)
+            if score is None:
+                continue
+            self.cache.set(self._key(fingerprint(resume), job_key), score.model_dump())
+            stored += 1
+        with self._lock:
+            self.stats.candidates_scored += stored
+
+    def invalidate_job(self, job_id: str) -> str:
+        """Make every cached score of `job_id` unreachable. Returns the job's new version."""
+        version = uuid.uuid4().hex
+        self.cache.set(self._version_key(job_id), {"version": version})
+        with self._lock:
+            self.stats.jobs_invalidated += 1
+        return version
+
+    def stats_dict(self) -> dict:
+        with self._lock:
+            stats = asdict(self.stats)
+        return {**stats, **self.cache.stats.as_dict(), "entries": len(self.cache)}
+
+    def _job_key(self, job: JobData) -> str:
+        # The version record is read on every lookup and store, so it is never
+        # older in LRU order, nor set earlier, than the entries it supersedes:
+        # eviction or expiry drops them before it. It is not a score, so the
+        # read stays out of the hit rate
+        record = self.cache.get(self._version_key(job.job_id), record_stats=False)
+        version = record["version"] if record else ""
+        return f"{fingerprint(job)}:{version}"
+
+    def _version_key(self, job_id: str) -> str:
+        return hashlib.sha256(f"job-version:{job_id}".encode()).hexdigest()
+
+    def _key(self, resume_fp: str, job_key: str) -> str:
+        raw = f"{resume_fp}:{job_key}:{self.model}:{self.prompt_version}"
+        return hashlib.sha256(raw.encode()).hexdigest()
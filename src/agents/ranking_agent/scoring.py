@@ -0,0 +1,242 @@
+"""Deterministic skill and experience scoring, mirroring the rules in prompt.py.
+
+Each job skill is expanded into the alternative terms that satisfy it
+("Power BI/Tableau" -> {"power bi", "tableau"}, "CRM (Salesforce)" ->
+{"crm", "salesforce"}) after normalization and synonym mapping. Job skills
+are assigned bit positions, so scoring a candidate is a handful of dict lookups
+and popcounts regardless of how many candidates are scored.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .models import JobData, RankingScore, ResumeData
+
+REQUIRED_WEIGHT = 0.7
+PREFERRED_WEIGHT = 0.3
+SKILL_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.4
+
+# Midpoints of the ranges given to the LLM in prompt.py
+EXACT_LEVEL_SCORE = 95.0
+ONE_ABOVE_SCORE = 85.0
+ONE_BELOW_SCORE = 60.0
+FAR_OFF_SCORE = 35.0
+UNKNOWN_LEVEL_SCORE = 50.0
+
+_LEVELS = {
+    "intern": 0,
+    "entry": 0,
+    "junior": 0,
+    "associate": 0,
+    "mid": 1,
+    "intermediate": 1,
+    "senior": 2,
+    "lead": 3,
+    "staff": 3,
+    "principal": 3,
+}
+
+SKILL_SYNONYMS = {
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mssql": "sql server",
+    "ms sql server": "sql server",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "dotnet": ".net",
+    ".net core": ".net",
+    "asp.net core": "asp.net",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "amazon web services": "aws",
+    "microsoft azure": "azure",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "continuous integration": "ci/cd",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "ms office": "microsoft office",
+    "ms project": "microsoft project",
+    "powerbi": "power bi",
+    "ehr": "electronic health records",
+    "emr": "electronic health records",
+    "seo": "search engine optimization",
+    "sem": "search engine marketing",
+    "crm": "customer relationship management",
+    "hris": "human resources information system",
+    "ux": "user experience",
+    "ui": "user interface",
+}
+
+# Qualifiers and generic words that describe a skill rather than name one
+_QUALIFIERS = {"advanced", "basic", "intermediate", "expert", "proficient", "preferred"}
+_GENERIC_SUFFIXES = ("experience", "knowledge", "skills", "certification", "certified", "systems")
+
+_PARENS = re.compile(r"\(([^)]*)\)")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_skill(skill: str) -> str:
+    term = _SPACES.sub(" ", skill.lower()).strip(" ,;:")
+    return SKILL_SYNONYMS.get(term, term)
+
+
+@lru_cache(maxsize=65536)
+def skill_terms(skill: str) -> frozenset[str]:
+    """All normalized terms that name `skill` or one of its alternatives."""
+    terms = set()
+    raw = skill.lower()
+
+    for inner in _PARENS.findall(raw):
+        terms.update(_split_alternatives(inner))
+    base = _PARENS.sub(" ", raw)
+    terms.add(normalize_skill(base))
+    terms.update(_split_alternatives(base))
+
+    for term in list(terms):
+        for suffix in _GENERIC_SUFFIXES:
+            if term.endswith(" " + suffix):
+                terms.add(normalize_skill(term[: -len(suffix)]))
+    terms -= _QUALIFIERS
+    terms.discard("")
+    return frozenset(terms)
+
+
+def _split_alternatives(text: str) -> set[str]:
+    parts = re.split(r"/|,| & | and | or ", text)
+    return {normalize_skill(p) for p in parts} if len(parts) > 1 else {normalize_skill(text)}
+
+
+def experience_rank(level: str | None) -> int | None:
+    if not level:
+        return None
+    for word in re.findall(r"[a-z]+", level.lower()):
+        if word in _LEVELS:
+            return _LEVELS[word]
+    return None
+
+
+@dataclass
+class SkillMatch:
+    resume_id: int
+    skill_match_score: float
+    experience_match_score: float
+    overall_score: float
+    matched_required: list[str]
+    missing_required: list[str]
+    matched_preferred: list[str]
+
+
+class JobScorer:
+    """Scores candidates against one job. Build once per job, then score many resumes."""
+
+    def __init__(self, job: JobData):
+        self.job = job
+        self._skills = list(job.required_skills) + list(job.preferred_skills)
+        self._required_mask = (1 << len(job.required_skills)) - 1
+        self._preferred_mask = ((1 << len(self._skills)) - 1) ^ self._required_mask
+        self._term_bits: dict[str, int] = {}
+        for position, skill in enumerate(self._skills):
+            for term in skill_terms(skill):
+                self._term_bits[term] = self._term_bits.get(term, 0) | (1 << position)
+        self._job_level = experience_rank(job.experience_level)
+
+    @property
+    def term_bits(self) -> dict[str, int]:
+        """Normalized term -> bitmask of the job skills it satisfies."""
+        return self._term_bits
+
+    def skill_mask(self, skills: list[str]) -> int:
+        mask = 0
+        for skill in skills:
+            for term in skill_terms(skill):
+                mask |= self._term_bits.get(term, 0)
+        return mask
+
+    def skill_score(self, mask: int) -> float:
+        required = len(self.job.required_skills)
+        preferred = len(self.job.preferred_skills)
+        required_fraction = (mask & self._required_mask).bit_count() / required if required else 0.0
+        preferred_fraction = (mask & self._preferred_mask).bit_count() / preferred if preferred else 0.0
+        if required and preferred:
+            return 100 * (REQUIRED_WEIGHT * required_fraction + PREFERRED_WEIGHT * preferred_fraction)
+        if required:
+            return 100 * required_fraction
+        if preferred:
+            return 100 * preferred_fraction
+        return 100.0
+
+    def experience_score(self, level: str | None) -> float:
+        candidate_level = experience_rank(level)
+        if candidate_level is None or self._job_level is None:
+            return UNKNOWN_LEVEL_SCORE
+        distance = candidate_level - self._job_level
+        if distance == 0:
+            return EXACT_LEVEL_SCORE
+        if distance == 1:
+            return ONE_ABOVE_SCORE
+        if distance == -1:
+            return ONE_BELOW_SCORE
+        return FAR_OFF_SCORE
+
+    def score(self, resume: ResumeData) -> SkillMatch:
+        mask = self.skill_mask(resume.skills)
+        skill = self.skill_score(mask)
+        experience = self.experience_score(resume.experience_level)
+        required = self.job.required_skills
+        preferred = self.job.preferred_skills
+        return SkillMatch(
+            resume_id=resume.resume_id,
+            skill_match_score=round(skill, 1),
+            experience_match_score=round(experience, 1),
+            overall_score=round(SKILL_WEIGHT * skill + EXPERIENCE_WEIGHT * experience, 1),
+            matched_required=[s for i, s in enumerate(required) if mask >> i & 1],
+            missing_required=[s for i, s in enumerate(required) if not mask >> i & 1],
+            matched_preferred=[
+                s for i, s in enumerate(preferred, len(required)) if mask >> i & 1
+            ],
+        )
+
+
+def score_resumes(resumes: list[ResumeData], job: JobData) -> list[RankingScore]:
+    """Rank resumes locally, highest overall_score first, with a generated summary."""
+    scorer = JobScorer(job)
+    scores = []
+    for resume in resumes:
+        match = scorer.score(resume)
+        scores.append(
+            RankingScore(
+                resume_id=match.resume_id,
+                job_id=job.job_id,
+                skill_match_score=match.skill_match_score,
+                experience_match_score=match.experience_match_score,
+                overall_score=match.overall_score,
+                summary=_summarize(match, resume, job),
+            )
+        )
+    return sorted(scores, key=lambda s: s.overall_score, reverse=True)
+
+
+def _summarize(match: SkillMatch, resume: ResumeData, job: JobData) -> str:
+    summary = (
+        f"Matches {len(match.matched_required)}/{len(job.required_skills)} required "
+        f"and {len(match.matched_preferred)}/{len(job.preferred_skills)} preferred skills."
+    )
+    if match.missing_required:
+        summary += f" Missing: {', '.join(match.missing_required[:5])}."
+    level = resume.experience_level or "Unknown"
+    return summary + f" Experience: {level} (job requires {job.experience_level})."
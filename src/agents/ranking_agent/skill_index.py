@@ -0,0 +1,135 @@
+"""Inverted index from normalized skill term to resume ids.
+
+Postings are sorted arrays of unsigned ints, so 50k resumes with ~30 skills
+each fit in a few MB. Skills are expanded with the same normalization and
+synonyms as the local scorer, and queries are scored with JobScorer, so a
+candidate's index score equals its local skill_match_score.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from .models import JobData
+from .scoring import JobScorer, skill_terms
+
+INDEX_FORMAT_VERSION = 1
+
+
+@dataclass
+class IndexMatch:
+    resume_id: int
+    score: float
+    matched_required: int
+    matched_preferred: int
+
+
+class SkillIndex:
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._postings: dict[str, array] = {}
+        self._skills: dict[int, list[str]] = {}
+        self._terms: dict[int, frozenset[str]] = {}
+        self._save_lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def __contains__(self, resume_id: int) -> bool:
+        return resume_id in self._skills
+
+    def add(self, resume_id: int, skills: list[str]) -> None:
+        """Index a resume, replacing any previous entry for the same id."""
+        if resume_id in self._skills:
+            self.remove(resume_id)
+        terms = frozenset(t for skill in skills for t in skill_terms(skill))
+        for term in terms:
+            postings = self._postings.setdefault(term, array("I"))
+            postings.insert(bisect_left(postings, resume_id), resume_id)
+        self._skills[resume_id] = list(skills)
+        self._terms[resume_id] = terms
+
+    def remove(self, resume_id: int) -> bool:
+        if resume_id not in self._skills:
+            return False
+        for term in self._terms.pop(resume_id):
+            postings = self._postings[term]
+            del postings[bisect_left(postings, resume_id)]
+            if not postings:
+                del self._postings[term]
+        del self._skills[resume_id]
+        return True
+
+    def query(self, job: JobData, limit: int = 50, min_score: float = 0.0) -> list[IndexMatch]:
+        """Resumes matching at least one job skill, best weighted overlap first."""
+        scorer = JobScorer(job)
+        masks: dict[int, int] = {}
+        for term, bits in scorer.term_bits.items():
+            for resume_id in self._postings.get(term, ()):
+                masks[resume_id] = masks.get(resume_id, 0) | bits
+
+        required = len(job.required_skills)
+        matches = []
+        for resume_id, mask in masks.items():
+            score = round(scorer.skill_score(mask), 1)
+            if score >= min_score:
+                matched = mask.bit_count()
+                matched_required = (mask & ((1 << required) - 1)).bit_count()
+                matches.append(
+                    IndexMatch(resume_id, score, matched_required, matched - matched_required)
+                )
+        matches.sort(key=lambda m: (-m.score, m.resume_id))
+        return matches[:limit]
+
+    def snapshot(self) -> dict:
+        """Serializable copy of the index contents; postings are rebuilt on load."""
+        return {
+            "version": INDEX_FORMAT_VERSION,
+            "resumes": [[rid, skills] for rid, skills in self._skills.items()],
+        }
+
+    def save(self, path: str | None = None, snapshot: dict | None = None) -> None:
+        path = path or self.path
+        if not path:
+            raise ValueError("No path configured for the skill index")
+        data = snapshot if snapshot is not None else self.snapshot()
+        payload = gzip.compress(
+            json.dumps(data, separators=(",", ":")).encode("utf-8"), compresslevel=6
+        )
+        # A temporary file of its own per save, and one rename at a time, so
+        # concurrent saves never write to the same file
+        with self._save_lock:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def load(self, path: str) -> None:
+        with open(path, "rb") as f:
+            data = json.loads(gzip.decompress(f.read()))
+        if data.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported skill index version: {data.get('version')}")
+
+        postings: dict[str, list[int]] = {}
+        self._skills.clear()
+        self._terms.clear()
+        for resume_id, skills in data["resumes"]:
+            terms = frozenset(t for skill in skills for t in skill_terms(skill))
+            for term in terms:
+                postings.setdefault(term, []).append(resume_id)
+            self._skills[resume_id] = skills
+            self._terms[resume_id] = terms
+        self._postings = {term: array("I", sorted(ids)) for term, ids in postings.items()}
@@ -1,113 +1,223 @@
-import json
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from anthropic import Anthropic
+from anthropic.types import Message
 
-from shared.config import ANTHROPIC_API_KEY
+from shared.cache import Cache, content_digest, create_cache, make_cache_key
+from shared.config import (
+    ANTHROPIC_API_KEY,
+    ANTHROPIC_MODEL,
+    PARSE_CACHE_BACKEND,
+    PARSE_CACHE_MAX_ENTRIES,
+    PARSE_CACHE_PATH,
+    PARSE_CACHE_TTL_SECONDS,
+    PARSE_EXTRACT_CHAR_LIMIT,
+    PARSE_TEXT_TOKEN_BUDGET,
+    PDF_PAGE_WORKERS,
+    PDF_PAGES_PER_TASK,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_TEXT_BACKEND,
+    TEXT_STORE_DIR,
+)
+from shared.llm import get_async_client, llm_slot, record_usage, system_blocks
+from shared.llm_json import json_array, load_json_object
+from shared.metrics import in_context, llm_in_flight, stage
 
+from .extraction import ExtractionPool, extract_docx_text, extract_file_text
 from .models import ParsedResumeResponse, SuitableRole
+from .pdf_text import extract_pdf_text
+from .prompt import PARSE_PROMPT_VERSION, PARSE_SYSTEM_PROMPT, build_parse_prompt
+from .text_compaction import COMPACTION_VERSION, compact_resume_text
+from .text_store import TextStore, create_text_store, text_key
 
+# Default for `cache`: the cache configured by PARSE_CACHE_BACKEND. None means no cache.
+_DEFAULT_CACHE: Any = object()
 
-class ResumeParserAgent:
-    """Parses resume files (PDF, DOCX) into structured data using LLM."""
 
-    def __init__(self):
-        self._client = Anthropic(api_key=ANTHROPIC_API_KEY)
+@dataclass
+class ExtractedResume:
+    """Output of the extraction stage: either a cache hit or text for the LLM."""
 
-    def parse(self, file_path: str) -> ParsedResumeResponse:
+    file_path: str
+    text: str = ""
+    cache_key: str | None = None
+    cached: ParsedResumeResponse | None = None
+
+
+class _ResumeParserBase:
+    """Extraction, caching and response handling shared by the sync and async agents.
+
+    `page_pool` (a process pool) lets long PDFs extract page ranges in parallel.
+    `extraction_pool` instead runs each file's extraction in a worker process,
+    off the calling process's GIL. With a text store, extracted text is reused
+    across parses of the same file.
+    """
+
+    def __init__(
+        self,
+        cache: Cache | None = _DEFAULT_CACHE,
+        page_pool: Executor | None = None,
+        text_store: TextStore | None = None,
+        extraction_pool: ExtractionPool | None = None,
+    ):
+        if cache is _DEFAULT_CACHE:
+            cache = create_cache(
+                PARSE_CACHE_BACKEND,
+                path=PARSE_CACHE_PATH,
+                max_entries=PARSE_CACHE_MAX_ENTRIES,
+                ttl_seconds=PARSE_CACHE_TTL_SECONDS,
+            )
+        self.cache = cache
+        self.text_store = text_store or create_text_store(TEXT_STORE_DIR)
+        self._page_pool = page_pool
+        self._extraction_pool = extraction_pool
+
+    def extract(self, file_path: str) -> ExtractedResume:
+        """Cache lookup and text extraction; everything before the LLM call."""
         ext = Path(file_path).suffix.lower()
-        if ext == ".pdf":
-            text = self._extract_pdf(file_path)
-        elif ext == ".docx":
-            text = self._extract_docx(file_path)
-        else:
+        if ext not in (".pdf", ".docx"):
             raise ValueError(f"Unsupported file type: {ext}")
 
-        return self._extract_structured_data(text, file_path)
+        digest = self._digest(file_path)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(
+                digest,
+                model=ANTHROPIC_MODEL,
+                prompt_version=PARSE_PROMPT_VERSION,
+                settings=(
+                    PDF_TEXT_BACKEND,
+                    PARSE_EXTRACT_CHAR_LIMIT,
+                    PARSE_TEXT_TOKEN_BUDGET,
+                    COMPACTION_VERSION,
+                ),
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return ExtractedResume(
+                    file_path, cache_key=cache_key, cached=ParsedResumeResponse(**cached)
+                )
 
-    def _extract_pdf(self, file_path: str) -> str:
-        import pdfplumber
+        text = self._extracted_text(file_path, ext, digest)
+        with stage("compaction"):
+            text = compact_resume_text(text, PARSE_TEXT_TOKEN_BUDGET)
+        return ExtractedResume(file_path, text=text, cache_key=cache_key)
+
+    def extract_text(self, file_path: str) -> str:
+        """Full extracted text of a file, before compaction, through the text store."""
+        ext = Path(file_path).suffix.lower()
+        if ext not in (".pdf", ".docx"):
+            raise ValueError(f"Unsupported file type: {ext}")
+        return self._extracted_text(file_path, ext, self._digest(file_path))
 
-        text_parts = []
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-        return "\n".join(text_parts)
+    def _digest(self, file_path: str) -> str | None:
+        if self.cache is None and self.text_store is None:
+            return None
+        with stage("file_read"):
+            content = Path(file_path).read_bytes()
+        return content_digest(content)
+
+    def _extracted_text(self, file_path: str, ext: str, digest: str | None) -> str:
+        key = None
+        if self.text_store is not None and digest is not None:
+            key = text_key(digest, backend=PDF_TEXT_BACKEND, char_limit=PARSE_EXTRACT_CHAR_LIMIT)
+            with stage("text_store"):
+                text = self.text_store.get(key)
+            if text is not None:
+                return text
+
+        with stage("extract_pdf" if ext == ".pdf" else "extract_docx"):
+            if self._extraction_pool is not None:
+                text = self._extraction_pool.run(
+                    extract_file_text, file_path, ext, PARSE_EXTRACT_CHAR_LIMIT, PDF_TEXT_BACKEND
+                )
+            elif ext == ".pdf":
+                text = self._extract_pdf(file_path)
+            else:
+                text = self._extract_docx(file_path)
+        if key is not None:
+            with stage("text_store"):
+                self.text_store.put(key, text)
+        return text
+
+    def _store(
+        self, extracted: ExtractedResume, result: ParsedResumeResponse, complete: bool
+    ) -> None:
+        # Empty documents never reach the LLM; their fallback name comes from the path.
+        # A result repaired from a truncated response is not cached, so the next
+        # parse of the file asks again instead of serving it for the whole TTL.
+        if extracted.cache_key is not None and extracted.text.strip() and complete:
+            self.cache.set(extracted.cache_key, result.model_dump())
+
+    def _extract_pdf(self, file_path: str) -> str:
+        return extract_pdf_text(
+            file_path,
+            PARSE_EXTRACT_CHAR_LIMIT,
+            backend=PDF_TEXT_BACKEND,
+            pool=self._page_pool,
+            parallel_min_pages=PDF_PARALLEL_MIN_PAGES,
+            pages_per_task=PDF_PAGES_PER_TASK,
+            max_in_flight=PDF_PAGE_WORKERS,
+        )
 
     def _extract_docx(self, file_path: str) -> str:
-        from docx import Document
+        return extract_docx_text(file_path)
 
-        doc = Document(file_path)
-        return "\n".join(para.text for para in doc.paragraphs if para.text.strip())
+    def local_result(self, extracted: ExtractedResume) -> ParsedResumeResponse | None:
+        """The result when no LLM call is needed (a cache hit or an empty document), else None."""
+        if extracted.cached is not None:
+            return extracted.cached
+        if not extracted.text.strip():
+            return self._empty_response(extracted.file_path)
+        return None
 
-    def _extract_structured_data(
-        self, text: str, file_path: str
+    def message_params(self, extracted: ExtractedResume) -> dict:
+        """Messages API parameters for structuring `extracted`, also usable as a batch request."""
+        return self._message_params(extracted.text)
+
+    def result_from_message(
+        self, extracted: ExtractedResume, message: Message
     ) -> ParsedResumeResponse:
-        if not text.strip():
-            return ParsedResumeResponse(
-                candidate_name=Path(file_path).stem.replace("_", " "),
-                skills=[],
-                experience_level="Unknown",
-                summary=None,
-                suitable_roles=[],
-            )
+        """The parsed resume from the LLM's reply, stored in the parse cache when complete."""
+        result, complete = self._to_response(message.content[0].text, extracted.file_path)
+        self._store(extracted, result, complete)
+        return result
 
-        prompt = f"""Analyze the following resume text and extract structured information.
-
-## Resume Text
-{text[:3000]}
-
-## Instructions
-Extract the following and respond ONLY with valid JSON:
-{{
-  "candidate_name": "<full name of the candidate>",
-  "skills": ["<list of technical and professional skills mentioned>"],
-  "experience_level": "<one of: Junior, Mid, Senior, based on years of experience and role titles>",
-  "summary": "<2-3 sentence professional summary of the candidate>",
-  "suitable_roles": [
-    {{"role": "<job title>", "score": <1-10>}},
-    ...
-  ]
-}}
-
-Rules:
-- For candidate_name: Extract the person's full name. It's usually at the top of the resume.
-- For skills: List all specific technical skills, tools, frameworks, certifications, and professional competencies mentioned. Be thorough but only include skills explicitly stated.
-- For experience_level: Junior = 0-2 years or entry-level titles, Mid = 3-6 years or mid-level titles, Senior = 7+ years or senior/lead/principal titles.
-- For summary: Write a brief professional summary based on the resume content.
-- For suitable_roles: Based on the candidate's skills and experience, suggest 3-6 job titles/roles they could realistically perform with a suitability score:
-  - Score 9-10: Excellent fit - candidate's primary expertise matches this role
-  - Score 7-8: Good fit - candidate has strong relevant skills
-  - Score 5-6: Moderate fit - candidate could transition with some upskilling
-  - Score 3-4: Stretch role - significant skill gaps but transferable experience
-  - Score 1-2: Weak fit - minimal alignment
-  - Sort roles by score (highest first)
-
-Respond ONLY with the JSON object, no other text."""
-
-        message = self._client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}],
+    def _empty_response(self, file_path: str) -> ParsedResumeResponse:
+        return ParsedResumeResponse(
+            candidate_name=Path(file_path).stem.replace("_", " "),
+            skills=[],
+            experience_level="Unknown",
+            summary=None,
+            suitable_roles=[],
         )
 
-        response_text = message.content[0].text
+    def _message_params(self, text: str) -> dict:
+        with stage("prompt_build"):
+            return {
+                "model": ANTHROPIC_MODEL,
+                "max_tokens": 1024,
+                "system": system_blocks(PARSE_SYSTEM_PROMPT),
+                "messages": [{"role": "user", "content": build_parse_prompt(text)}],
+            }
 
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError:
-            # Fallback: try to extract JSON from response
-            start = response_text.find("{")
-            end = response_text.rfind("}") + 1
-            if start >= 0 and end > start:
-                parsed = json.loads(response_text[start:end])
-            else:
-                raise ValueError("Failed to parse LLM response as JSON")
+    def _to_response(
+        self, response_text: str, file_path: str
+    ) -> tuple[ParsedResumeResponse, bool]:
+        """The parsed resume, and whether the response was complete (not repaired)."""
+        with stage("json_parse"):
+            # A truncated response keeps the fields that were complete
+            parsed, complete = load_json_object(response_text)
+        with stage("validation"):
+            return self._validate(parsed, file_path), complete
 
+    def _validate(self, parsed: dict, file_path: str) -> ParsedResumeResponse:
         # Parse suitable_roles - handle both old (list[str]) and new (list[dict]) formats
-        raw_roles = parsed.get("suitable_roles", [])
+        raw_roles = json_array(parsed, "suitable_roles")
         suitable_roles = []
         for item in raw_roles:
             if isinstance(item, dict):
@@ -121,8 +231,95 @@ Respond ONLY with the JSON object, no other text."""
 
         return ParsedResumeResponse(
             candidate_name=parsed.get("candidate_name", Path(file_path).stem),
-            skills=parsed.get("skills", []),
+            skills=json_array(parsed, "skills"),
             experience_level=parsed.get("experience_level", "Unknown"),
             summary=parsed.get("summary"),
             suitable_roles=suitable_roles,
         )
+
+
+class ResumeParserAgent(_ResumeParserBase):
+    """Parses resume files (PDF, DOCX) into structured data using LLM."""
+
+    def __init__(
+        self,
+        cache: Cache | None = _DEFAULT_CACHE,
+        page_pool: Executor | None = None,
+        text_store: TextStore | None = None,
+        extraction_pool: ExtractionPool | None = None,
+    ):
+        super().__init__(cache, page_pool, text_store, extraction_pool)
+        self.client = Anthropic(api_key=ANTHROPIC_API_KEY)
+
+    def parse(self, file_path: str) -> ParsedResumeResponse:
+        extracted = self.extract(file_path)
+        if extracted.cached is not None:
+            return extracted.cached
+        return self.structure(extracted)
+
+    def structure(self, extracted: ExtractedResume) -> ParsedResumeResponse:
+        """LLM extraction of structured data from previously extracted text."""
+        result, complete = self._extract_structured_data(extracted.text, extracted.file_path)
+        self._store(extracted, result, complete)
+        return result
+
+    def _extract_structured_data(
+        self, text: str, file_path: str
+    ) -> tuple[ParsedResumeResponse, bool]:
+        if not text.strip():
+            return self._empty_response(file_path), True
+
+        params = self._message_params(text)
+        with stage("llm"), llm_in_flight():
+            message = self.client.messages.create(**params)
+        record_usage(message.usage)
+        return self._to_response(message.content[0].text, file_path)
+
+
+class AsyncResumeParserAgent(_ResumeParserBase):
+    """Async variant for the FastAPI service.
+
+    LLM calls go through the shared AsyncAnthropic client and in-flight
+    semaphore, so a single worker can have many parses waiting on the network.
+    Text extraction is CPU-bound and runs on `executor` (default thread pool).
+    """
+
+    def __init__(
+        self,
+        cache: Cache | None = _DEFAULT_CACHE,
+        executor: Executor | None = None,
+        page_pool: Executor | None = None,
+        text_store: TextStore | None = None,
+        extraction_pool: ExtractionPool | None = None,
+    ):
+        super().__init__(cache, page_pool, text_store, extraction_pool)
+        self._executor = executor
+
+    async def parse(self, file_path: str) -> ParsedResumeResponse:
+        loop = asyncio.get_running_loop()
+        extracted = await loop.run_in_executor(
+            self._executor, in_context(self.extract), file_path
+        )
+        if extracted.cached is not None:
+            return extracted.cached
+        return await self.structure(extracted)
+
+    async def structure(self, extracted: ExtractedResume) -> ParsedResumeResponse:
+        result, complete = await self._extract_structured_data(
+            extracted.text, extracted.file_path
+        )
+        self._store(extracted, result, complete)
+        return result
+
+    async def _extract_structured_data(
+        self, text: str, file_path: str
+    ) -> tuple[ParsedResumeResponse, bool]:
+        if not text.strip():
+            return self._empty_response(file_path), True
+
+        params = self._message_params(text)
+        async with llm_slot():
+            with stage("llm"), llm_in_flight():
+                message = await get_async_client().messages.create(**params)
+        record_usage(message.usage)
+        return self._to_response(message.content[0].text, file_path)
@@ -0,0 +1,99 @@
+"""Offline bulk parsing through the Message Batches API.
+
+Text is extracted locally; files already in the parse cache (or empty) are
+written out directly, and the rest are submitted as batches. Each result is
+stored in the parse cache and appended to the output JSONL as
+{"custom_id", "file_path", "result"}. Rerunning with the same output resumes
+an interrupted run; see shared.message_batches.
+
+Usage (from src/agents):
+    python -m resume_parser.bulk resumes/ more/cv.pdf --output parsed.jsonl
+"""
+
+import argparse
+import hashlib
+import logging
+from pathlib import Path
+
+from anthropic.types import Message
+
+from shared.config import BATCH_POLL_INTERVAL_SECONDS
+from shared.message_batches import BatchRunSummary, MessageBatchRunner
+
+from .agent import ExtractedResume, ResumeParserAgent
+
+logger = logging.getLogger(__name__)
+
+RESUME_SUFFIXES = (".pdf", ".docx")
+
+
+def resume_files(paths: list[str]) -> list[str]:
+    """Expand directories (recursively) into their PDF and DOCX files."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(
+                str(p) for p in sorted(path.rglob("*")) if p.suffix.lower() in RESUME_SUFFIXES
+            )
+        else:
+            files.append(str(path))
+    return files
+
+
+def custom_id(file_path: str) -> str:
+    return hashlib.sha256(str(Path(file_path).resolve()).encode()).hexdigest()[:40]
+
+
+def run_bulk_parse(
+    files: list[str],
+    output_path: str,
+    state_path: str | None = None,
+    poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+    agent: ResumeParserAgent | None = None,
+) -> BatchRunSummary:
+    agent = agent or ResumeParserAgent()
+    runner = MessageBatchRunner(agent.client, output_path, state_path, poll_interval)
+
+    extracted: dict[str, ExtractedResume] = {}
+    requests = {}
+    for file_path in files:
+        cid = custom_id(file_path)
+        if cid in extracted or runner.already_done(cid):
+            continue
+        try:
+            item = agent.extract(file_path)
+        except Exception as e:
+            logger.warning("Skipping %s: %s", file_path, e)
+            continue
+        result = agent.local_result(item)
+        if result is not None:
+            runner.write_result(cid, {"file_path": file_path, "result": result.model_dump()})
+        else:
+            extracted[cid] = item
+            requests[cid] = agent.message_params(item)
+
+    def handle(cid: str, message: Message) -> dict:
+        item = extracted[cid]
+        result = agent.result_from_message(item, message)
+        return {"file_path": item.file_path, "result": result.model_dump()}
+
+    return runner.run(requests, handle)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", help="Resume files or directories")
+    parser.add_argument("--output", required=True, help="Results JSONL (appended to)")
+    parser.add_argument("--state", help="Run state file (default: <output>.state.json)")
+    parser.add_argument("--poll-interval", type=float, default=BATCH_POLL_INTERVAL_SECONDS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    summary = run_bulk_parse(
+        resume_files(args.paths), args.output, args.state, args.poll_interval
+    )
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
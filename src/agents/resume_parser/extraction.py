@@ -0,0 +1,122 @@
+"""Text extraction in worker processes, so parsing one large PDF does not hold
+the service's GIL.
+
+ExtractionPool bounds submissions to its worker count: a task handed to the
+process pool starts right away, so its timeout measures extraction rather than
+queueing. Callers waiting for a free worker are counted by the
+`resumerank_extraction_queue_depth` gauge. Workers are replaced after
+`max_tasks_per_child` tasks to contain the memory pdfminer accumulates. A task
+that overruns its timeout cannot be cancelled, so its pool is torn down and
+replaced; other tasks it was running are retried once on the new pool.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from shared.metrics import REGISTRY
+
+from .pdf_text import extract_pdf_text
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_QUEUE_DEPTH = REGISTRY.gauge(
+    "resumerank_extraction_queue_depth", "Extractions waiting for a worker process"
+)
+EXTRACTION_IN_FLIGHT = REGISTRY.gauge(
+    "resumerank_extraction_in_flight", "Extractions running in worker processes"
+)
+EXTRACTION_TIMEOUTS = REGISTRY.counter(
+    "resumerank_extraction_timeouts_total", "Extractions that overran their timeout"
+)
+
+
+class ExtractionTimeoutError(TimeoutError):
+    pass
+
+
+def extract_docx_text(file_path: str) -> str:
+    from docx import Document
+
+    doc = Document(file_path)
+    return "\n".join(para.text for para in doc.paragraphs if para.text.strip())
+
+
+def extract_file_text(file_path: str, ext: str, char_limit: int, backend: str) -> str:
+    """Full text of a PDF or DOCX file. Module-level so it can run in a process pool."""
+    if ext == ".pdf":
+        return extract_pdf_text(file_path, char_limit, backend=backend)
+    return extract_docx_text(file_path)
+
+
+class ExtractionPool:
+    def __init__(self, workers: int, max_tasks_per_child: int | None, timeout_seconds: float):
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.timeout_seconds = timeout_seconds
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._pool = self._new_pool()
+
+    def run(self, fn: Callable, *args):
+        """Run `fn(*args)` in a worker process; blocks the calling thread until done."""
+        EXTRACTION_QUEUE_DEPTH.inc()
+        try:
+            self._slots.acquire()
+        finally:
+            EXTRACTION_QUEUE_DEPTH.dec()
+        try:
+            with EXTRACTION_IN_FLIGHT.track():
+                try:
+                    return self._run(fn, args)
+                except BrokenProcessPool:
+                    # The pool was torn down under this task (another task timed out,
+                    # or a worker crashed); it gets one more try on a new pool
+                    return self._run(fn, args)
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn: Callable, args: tuple):
+        try:
+            # Under the lock, so the pool cannot be shut down by _replace() first
+            with self._lock:
+                pool = self._pool
+                future = pool.submit(fn, *args)
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            EXTRACTION_TIMEOUTS.inc()
+            self._replace(pool, hung=True)
+            raise ExtractionTimeoutError(
+                f"Text extraction timed out after {self.timeout_seconds:g}s"
+            ) from None
+        except BrokenProcessPool:
+            self._replace(pool, hung=False)
+            raise
+
+    def _replace(self, pool: ProcessPoolExecutor, hung: bool) -> None:
+        with self._lock:
+            if self._pool is not pool:
+                return  # already replaced by another thread
+            self._pool = self._new_pool()
+        logger.warning("Replacing the extraction process pool")
+        # A broken pool's workers exit on their own after shutdown. A hung task
+        # never returns, though, and ProcessPoolExecutor has no public way to
+        # stop a running task: its worker would keep a CPU busy for the life of
+        # the service. So for a timeout the workers are terminated through the
+        # private _processes map, guarded in case a Python version drops it.
+        processes = list((getattr(pool, "_processes", None) or {}).values()) if hung else []
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, max_tasks_per_child=self.max_tasks_per_child
+        )
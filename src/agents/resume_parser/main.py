@@ -1,12 +1,75 @@
+import asyncio
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 
-from .agent import ResumeParserAgent
-from .models import ParseRequest, ParsedResumeResponse
+from shared.config import (
+    METRICS_ENABLED,
+    PARSE_BATCH_MAX_FILES,
+    PARSE_EXTRACTION_MAX_TASKS_PER_CHILD,
+    PARSE_EXTRACTION_PROCESSES,
+    PARSE_EXTRACTION_TIMEOUT_SECONDS,
+    PARSE_EXTRACTION_WORKERS,
+    PARSE_LLM_CONCURRENCY,
+    PDF_PAGE_WORKERS,
+)
+from shared.llm import close_async_client, usage_stats
+from shared.metrics import (
+    CONTENT_TYPE,
+    REGISTRY,
+    MetricsMiddleware,
+    in_context,
+    register_cache,
+)
 
-app = FastAPI(title="Resume Parser Agent", version="1.0.0")
-agent = ResumeParserAgent()
+from .agent import AsyncResumeParserAgent
+from .extraction import ExtractionPool
+from .models import (
+    BatchParseRequest,
+    BatchParseResponse,
+    BatchParseResult,
+    ExtractTextResponse,
+    ParseRequest,
+    ParsedResumeResponse,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_async_client()
+    if page_pool is not None:
+        page_pool.shutdown(cancel_futures=True)
+    if process_pool is not None:
+        process_pool.shutdown()
+
+
+app = FastAPI(title="Resume Parser Agent", version="1.0.0", lifespan=lifespan)
+
+extraction_pool = ThreadPoolExecutor(
+    max_workers=PARSE_EXTRACTION_WORKERS, thread_name_prefix="extract"
+)
+page_pool = ProcessPoolExecutor(max_workers=PDF_PAGE_WORKERS) if PDF_PAGE_WORKERS > 0 else None
+# Extraction threads then only wait on the worker processes
+process_pool = (
+    ExtractionPool(
+        PARSE_EXTRACTION_PROCESSES,
+        PARSE_EXTRACTION_MAX_TASKS_PER_CHILD,
+        PARSE_EXTRACTION_TIMEOUT_SECONDS,
+    )
+    if PARSE_EXTRACTION_PROCESSES > 0
+    else None
+)
+agent = AsyncResumeParserAgent(
+    executor=extraction_pool, page_pool=page_pool, extraction_pool=process_pool
+)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    if agent.cache is not None:
+        register_cache("parse", agent.cache)
 
 
 @app.post("/parse", response_model=ParsedResumeResponse)
@@ -16,13 +79,106 @@ async def parse_resume(request: ParseRequest) -> ParsedResumeResponse:
             status_code=404, detail=f"File not found: {request.file_path}"
         )
     try:
-        return agent.parse(request.file_path)
+        return await agent.parse(request.file_path)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Parsing failed: {str(e)}")
 
 
+@app.post("/extract", response_model=ExtractTextResponse)
+async def extract_text(request: ParseRequest) -> ExtractTextResponse:
+    if not os.path.exists(request.file_path):
+        raise HTTPException(
+            status_code=404, detail=f"File not found: {request.file_path}"
+        )
+    loop = asyncio.get_running_loop()
+    try:
+        text = await loop.run_in_executor(
+            extraction_pool, in_context(agent.extract_text), request.file_path
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Extraction failed: {str(e)}")
+    return ExtractTextResponse(
+        file_path=request.file_path, text=text, stored=agent.text_store is not None
+    )
+
+
+@app.post("/parse/batch", response_model=BatchParseResponse)
+async def parse_resume_batch(request: BatchParseRequest) -> BatchParseResponse:
+    if not request.file_paths:
+        raise HTTPException(status_code=400, detail="No file paths provided")
+    if len(request.file_paths) > PARSE_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files: {len(request.file_paths)} (max {PARSE_BATCH_MAX_FILES})",
+        )
+
+    # Each batch gets its own PARSE_LLM_CONCURRENCY calls; LLM_MAX_IN_FLIGHT
+    # still bounds the process as a whole
+    llm_slots = asyncio.Semaphore(PARSE_LLM_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_parse_one(path, llm_slots) for path in request.file_paths)
+    )
+    succeeded = sum(1 for r in results if r.error is None)
+    return BatchParseResponse(
+        results=results, succeeded=succeeded, failed=len(results) - succeeded
+    )
+
+
+async def _parse_one(file_path: str, llm_slots: asyncio.Semaphore) -> BatchParseResult:
+    if not os.path.exists(file_path):
+        return BatchParseResult(
+            file_path=file_path, status_code=404, error=f"File not found: {file_path}"
+        )
+
+    loop = asyncio.get_running_loop()
+    try:
+        extracted = await loop.run_in_executor(
+            extraction_pool, in_context(agent.extract), file_path
+        )
+        if extracted.cached is not None:
+            result = extracted.cached
+        else:
+            async with llm_slots:
+                result = await agent.structure(extracted)
+    except ValueError as e:
+        return BatchParseResult(file_path=file_path, status_code=400, error=str(e))
+    except Exception as e:
+        return BatchParseResult(
+            file_path=file_path, status_code=500, error=f"Parsing failed: {str(e)}"
+        )
+    return BatchParseResult(file_path=file_path, status_code=200, result=result)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    if agent.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "entries": len(agent.cache), **agent.cache.stats.as_dict()}
+
+
+@app.get("/text-store/stats")
+async def text_store_stats():
+    if agent.text_store is None:
+        return {"enabled": False}
+    return {"enabled": True, **agent.text_store.stats.as_dict()}
+
+
+@app.get("/llm/usage")
+async def llm_usage():
+    return usage_stats()
+
+
+@app.get("/metrics")
+async def metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health():
     return {"status": "healthy", "service": "resume_parser"}
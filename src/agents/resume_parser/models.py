@@ -17,3 +17,28 @@ class ParsedResumeResponse(BaseModel):
     experience_level: str | None
     summary: str | None
     suitable_roles: list[SuitableRole]
+
+
+class ExtractTextResponse(BaseModel):
+    """Extracted text before compaction; `stored` is whether a text store keeps it."""
+    file_path: str
+    text: str
+    stored: bool
+
+
+class BatchParseRequest(BaseModel):
+    file_paths: list[str]
+
+
+class BatchParseResult(BaseModel):
+    """Outcome for one file in a batch; exactly one of result/error is set."""
+    file_path: str
+    status_code: int
+    result: ParsedResumeResponse | None = None
+    error: str | None = None
+
+
+class BatchParseResponse(BaseModel):
+    results: list[BatchParseResult]
+    succeeded: int
+    failed: int
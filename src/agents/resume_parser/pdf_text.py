@@ -0,0 +1,154 @@
+"""PDF text extraction that stops once the character budget is filled.
+
+Pages are separated by PAGE_BREAK for text compaction. Extraction stops after
+PARSE_EXTRACT_CHAR_LIMIT characters, so the remaining pages are never read.
+The "pdfium" backend (pypdfium2) is several times faster than pdfplumber;
+"auto" uses it and falls back to the layout-aware pdfplumber when it fails or
+finds no text. Long documents can fan page ranges out across a process pool; at
+most `max_in_flight` ranges run ahead of the one being consumed, so little work
+is wasted once the budget is reached.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Executor
+
+from .text_compaction import PAGE_BREAK
+
+PDF_BACKENDS = ("auto", "pdfium", "pdfplumber")
+
+# PDFium is not thread-safe; extraction threads in one process take turns
+_pdfium_lock = threading.Lock()
+
+
+def extract_pdf_text(
+    file_path: str,
+    char_limit: int,
+    backend: str = "auto",
+    pool: Executor | None = None,
+    parallel_min_pages: int = 8,
+    pages_per_task: int = 2,
+    max_in_flight: int = 4,
+) -> str:
+    options = (pool, parallel_min_pages, pages_per_task, max_in_flight)
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF text backend: {backend}")
+    if backend != "auto":
+        return _extract(file_path, char_limit, backend, *options)
+
+    try:
+        text = _extract(file_path, char_limit, "pdfium", *options)
+    except Exception:
+        text = ""
+    if text.strip():
+        return text
+    return _extract(file_path, char_limit, "pdfplumber", *options)
+
+
+def _extract(
+    file_path: str,
+    char_limit: int,
+    backend: str,
+    pool: Executor | None,
+    parallel_min_pages: int,
+    pages_per_task: int,
+    max_in_flight: int,
+) -> str:
+    page_count = count_pages(file_path, backend)
+    if pool is None or page_count < parallel_min_pages:
+        return PAGE_BREAK.join(extract_page_range(file_path, 0, page_count, backend, char_limit))
+
+    starts = iter(range(0, page_count, pages_per_task))
+    in_flight = deque()
+
+    def submit_next() -> None:
+        start = next(starts, None)
+        if start is not None:
+            stop = min(start + pages_per_task, page_count)
+            in_flight.append(pool.submit(extract_page_range, file_path, start, stop, backend))
+
+    for _ in range(max(1, max_in_flight)):
+        submit_next()
+
+    parts, size = [], 0
+    try:
+        while in_flight and size < char_limit:
+            for page_text in in_flight.popleft().result():
+                parts.append(page_text)
+                size += len(page_text) + 1
+            submit_next()
+    finally:
+        for future in in_flight:
+            future.cancel()
+    return PAGE_BREAK.join(parts)
+
+
+def count_pages(file_path: str, backend: str) -> int:
+    if backend == "pdfium":
+        import pypdfium2 as pdfium
+
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page_range(
+    file_path: str, start: int, stop: int, backend: str, char_limit: int | None = None
+) -> list[str]:
+    """Text of the non-empty pages in [start, stop), stopping early past `char_limit`.
+
+    Module-level so it can run in a process pool.
+    """
+    if backend == "pdfium":
+        return _pdfium_pages(file_path, start, stop, char_limit)
+    return _pdfplumber_pages(file_path, start, stop, char_limit)
+
+
+def _pdfium_pages(file_path: str, start: int, stop: int, char_limit: int | None) -> list[str]:
+    import pypdfium2 as pdfium
+
+    parts, size = [], 0
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            for index in range(start, stop):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    page_text = textpage.get_text_bounded().replace("\r\n", "\n").strip()
+                finally:
+                    textpage.close()
+                    page.close()
+                if page_text:
+                    parts.append(page_text)
+                    size += len(page_text) + 1
+                if char_limit is not None and size >= char_limit:
+                    break
+        finally:
+            pdf.close()
+    return parts
+
+
+def _pdfplumber_pages(file_path: str, start: int, stop: int, char_limit: int | None) -> list[str]:
+    import pdfplumber
+
+    parts, size = [], 0
+    with pdfplumber.open(file_path, pages=range(start + 1, stop + 1)) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            # Release the parsed layout objects; long PDFs otherwise hold every page
+            page.close()
+            if page_text:
+                parts.append(page_text)
+                size += len(page_text) + 1
+            if char_limit is not None and size >= char_limit:
+                break
+    return parts
@@ -0,0 +1,40 @@
+# Bump whenever the prompt changes so cached parse results are invalidated.
+PARSE_PROMPT_VERSION = "3"
+
+# Identical on every call, so it is sent as a cacheable system block
+PARSE_SYSTEM_PROMPT = """You analyze resume text and extract structured information.
+
+## Instructions
+Extract the following and respond ONLY with valid JSON:
+{
+  "candidate_name": "<full name of the candidate>",
+  "skills": ["<list of technical and professional skills mentioned>"],
+  "experience_level": "<one of: Junior, Mid, Senior, based on years of experience and role titles>",
+  "summary": "<2-3 sentence professional summary of the candidate>",
+  "suitable_roles": [
+    {"role": "<job title>", "score": <1-10>},
+    ...
+  ]
+}
+
+Rules:
+- For candidate_name: Extract the person's full name. It's usually at the top of the resume.
+- For skills: List all specific technical skills, tools, frameworks, certifications, and professional competencies mentioned. Be thorough but only include skills explicitly stated.
+- For experience_level: Junior = 0-2 years or entry-level titles, Mid = 3-6 years or mid-level titles, Senior = 7+ years or senior/lead/principal titles.
+- For summary: Write a brief professional summary based on the resume content.
+- For suitable_roles: Based on the candidate's skills and experience, suggest 3-6 job titles/roles they could realistically perform with a suitability score:
+  - Score 9-10: Excellent fit - candidate's primary expertise matches this role
+  - Score 7-8: Good fit - candidate has strong relevant skills
+  - Score 5-6: Moderate fit - candidate could transition with some upskilling
+  - Score 3-4: Stretch role - significant skill gaps but transferable experience
+  - Score 1-2: Weak fit - minimal alignment
+  - Sort roles by score (highest first)
+
+Respond ONLY with the JSON object, no other text."""
+
+
+def build_parse_prompt(text: str) -> str:
+    return f"""Analyze the following resume text and extract structured information.
+
+## Resume Text
+{text}"""
@@ -0,0 +1,15 @@
+"""Compaction of extracted resume text into the parse prompt's token budget.
+
+The implementation lives in aws_lambda/shared/text_compaction.py, which the
+Lambda packages copy as a standalone module; the agents use the same code.
+"""
+
+from aws_lambda.shared.text_compaction import (
+    COMPACTION_VERSION,
+    PAGE_BREAK,
+    SECTION_HEADINGS,
+    SECTION_PRIORITY,
+    compact_resume_text,
+    estimate_tokens,
+    split_sections,
+)
@@ -0,0 +1,107 @@
+"""Persisted store of extracted resume text, keyed by content hash.
+
+Text extraction is the CPU-heavy step of a parse. With TEXT_STORE_DIR set,
+the full extracted text of each file (before compaction, which depends on the
+token budget) is kept gzip-compressed under <dir>/<key[:2]>/<key>.txt.gz. The
+key hashes the file contents with the extraction settings. Re-parsing after a
+prompt change, prompt experiments and re-indexing then skip extraction.
+
+Files can be extracted ahead of time, e.g. when they are uploaded (from src/agents):
+    python -m resume_parser.text_store resumes/ more/cv.pdf
+"""
+
+import argparse
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from shared.cache import CacheStats
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction output changes so stored text is invalidated
+EXTRACTION_VERSION = "1"
+
+
+def text_key(digest: str, *, backend: str, char_limit: int) -> str:
+    """Combine a content digest with the settings that shape the extracted text."""
+    return hashlib.sha256(
+        f"{digest}:{backend}:{char_limit}:{EXTRACTION_VERSION}".encode()
+    ).hexdigest()
+
+
+class TextStore:
+    """Extracted text as gzip files in a directory; safe to share between processes."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> str | None:
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            logger.warning("Unreadable stored text %s: %s", key, e)
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(gzip.compress(text.encode("utf-8"), compresslevel=6))
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            logger.warning("Failed to store extracted text %s: %s", key, e)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt.gz"
+
+
+def create_text_store(directory: str) -> TextStore | None:
+    return TextStore(directory) if directory else None
+
+
+def main() -> None:
+    from .agent import ResumeParserAgent
+    from .bulk import resume_files
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", help="Resume files or directories")
+    parser.add_argument("--dir", help="Store directory (default: TEXT_STORE_DIR)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    text_store = create_text_store(args.dir or os.environ.get("TEXT_STORE_DIR", ""))
+    if text_store is None:
+        parser.error("set TEXT_STORE_DIR or pass --dir")
+    agent = ResumeParserAgent(cache=None, text_store=text_store)
+    files = resume_files(args.paths)
+    failed = 0
+    for file_path in files:
+        try:
+            agent.extract_text(file_path)
+        except Exception as e:
+            logger.warning("Skipping %s: %s", file_path, e)
+            failed += 1
+    print(f"{len(files) - failed} stored ({text_store.stats.hits} already present), {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Key/value caches for LLM results, with pluggable backends.
+
+Values are JSON-serializable dicts. Every backend enforces a TTL and a maximum
+entry count (least recently used entries are evicted first) and keeps
+hit/miss/eviction counters.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+
+def content_digest(content: bytes) -> str:
+    """SHA-256 hex digest of raw file bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def make_cache_key(
+    digest: str, *, model: str, prompt_version: str, settings: tuple = ()
+) -> str:
+    """Combine a content digest with the model, prompt version and other settings.
+
+    Changing the model, the prompt or any of `settings` (the extraction and
+    compaction settings that decide what text the model sees) yields a new key,
+    so stale results are never served after a configuration change.
+    """
+    parts = [digest, model, prompt_version, *map(str, settings)]
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {**asdict(self), "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+class Cache(ABC):
+    """Base class for cache backends."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, key: str, *, record_stats: bool = True) -> dict | None:
+        """Value for `key`; record_stats=False keeps bookkeeping reads out of the hit rate."""
+
+    @abstractmethod
+    def set(self, key: str, value: dict) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+class MemoryCache(Cache):
+    """In-process LRU cache."""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600):
+        super().__init__(max_entries, ttl_seconds)
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def get(self, key: str, *, record_stats: bool = True) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                    self.stats.evictions += 1
+                if record_stats:
+                    self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if record_stats:
+                self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(Cache):
+    """On-disk cache backed by a single SQLite file, shared across restarts."""
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl_seconds: float = 604800):
+        super().__init__(max_entries, ttl_seconds)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, *, record_stats: bool = True) -> dict | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.stats.evictions += 1
+                if record_stats:
+                    self.stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            if record_stats:
+                self.stats.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl_seconds, now),
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE expires_at < ? OR key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (now, self.max_entries),
+            )
+            self.stats.evictions += cursor.rowcount
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+def create_cache(
+    backend: str, *, path: str = "", max_entries: int = 1000, ttl_seconds: float = 3600
+) -> Cache | None:
+    """Build a cache from configuration values. Returns None when disabled."""
+    backend = backend.lower()
+    if backend in ("", "none", "off"):
+        return None
+    if backend == "memory":
+        return MemoryCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteCache(path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown cache backend: {backend}")
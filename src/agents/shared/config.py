@@ -1,5 +1,70 @@
 import os
 
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
+ANTHROPIC_MODEL = os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
 RESUME_PARSER_PORT = int(os.environ.get("RESUME_PARSER_PORT", "5100"))
 RANKING_AGENT_PORT = int(os.environ.get("RANKING_AGENT_PORT", "5101"))
+
+# Parse cache: "none", "memory" or "sqlite"
+PARSE_CACHE_BACKEND = os.environ.get("PARSE_CACHE_BACKEND", "memory")
+PARSE_CACHE_PATH = os.environ.get("PARSE_CACHE_PATH", "parse_cache.sqlite3")
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get("PARSE_CACHE_MAX_ENTRIES", "1000"))
+PARSE_CACHE_TTL_SECONDS = int(os.environ.get("PARSE_CACHE_TTL_SECONDS", "604800"))
+
+# Batch parsing: text extraction worker threads and concurrent LLM calls
+PARSE_EXTRACTION_WORKERS = int(os.environ.get("PARSE_EXTRACTION_WORKERS", str(os.cpu_count() or 4)))
+PARSE_LLM_CONCURRENCY = int(os.environ.get("PARSE_LLM_CONCURRENCY", "8"))
+PARSE_BATCH_MAX_FILES = int(os.environ.get("PARSE_BATCH_MAX_FILES", "1000"))
+
+# Extraction worker processes (0 extracts on the extraction threads), recycled after
+# PARSE_EXTRACTION_MAX_TASKS_PER_CHILD files; a file taking longer than the timeout fails
+PARSE_EXTRACTION_PROCESSES = int(os.environ.get("PARSE_EXTRACTION_PROCESSES", "0"))
+PARSE_EXTRACTION_MAX_TASKS_PER_CHILD = int(os.environ.get("PARSE_EXTRACTION_MAX_TASKS_PER_CHILD", "100"))
+PARSE_EXTRACTION_TIMEOUT_SECONDS = float(os.environ.get("PARSE_EXTRACTION_TIMEOUT_SECONDS", "60"))
+
+# Resume text: characters extracted per file, then compacted into the prompt's token budget
+PARSE_EXTRACT_CHAR_LIMIT = int(os.environ.get("PARSE_EXTRACT_CHAR_LIMIT", "24000"))
+PARSE_TEXT_TOKEN_BUDGET = int(os.environ.get("PARSE_TEXT_TOKEN_BUDGET", "750"))
+
+# Extracted text store: gzip files under this directory, keyed by content hash; empty disables it
+TEXT_STORE_DIR = os.environ.get("TEXT_STORE_DIR", "")
+
+# PDF text: "auto" (pypdfium2, pdfplumber fallback), "pdfium" or "pdfplumber".
+# PDF_PAGE_WORKERS > 0 splits PDFs of PDF_PARALLEL_MIN_PAGES+ pages across processes.
+PDF_TEXT_BACKEND = os.environ.get("PDF_TEXT_BACKEND", "auto")
+PDF_PAGE_WORKERS = int(os.environ.get("PDF_PAGE_WORKERS", "0"))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_PAGES_PER_TASK = int(os.environ.get("PDF_PAGES_PER_TASK", "2"))
+
+# Async LLM client: pooled connections and max concurrent requests per process
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "64"))
+LLM_MAX_IN_FLIGHT = int(os.environ.get("LLM_MAX_IN_FLIGHT", "32"))
+
+# Mark static system prompt blocks for Anthropic prompt caching
+LLM_PROMPT_CACHING = os.environ.get("LLM_PROMPT_CACHING", "true").lower() in ("1", "true", "yes")
+
+# Prometheus-style /metrics and per-stage timings; METRICS_LOG logs one JSON line per request
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+METRICS_LOG = os.environ.get("METRICS_LOG", "false").lower() in ("1", "true", "yes")
+
+# Offline bulk mode (Message Batches API): status poll interval and requests per batch
+BATCH_POLL_INTERVAL_SECONDS = float(os.environ.get("BATCH_POLL_INTERVAL_SECONDS", "30"))
+BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", "10000"))
+
+# Ranking: candidates are scored in chunks so large pools fit the output limit
+RANKING_CHUNK_TOKEN_BUDGET = int(os.environ.get("RANKING_CHUNK_TOKEN_BUDGET", "8000"))
+RANKING_CHUNK_MAX_RESUMES = int(os.environ.get("RANKING_CHUNK_MAX_RESUMES", "20"))
+RANKING_CHUNK_CONCURRENCY = int(os.environ.get("RANKING_CHUNK_CONCURRENCY", "4"))
+RANKING_MAX_RETRIES = int(os.environ.get("RANKING_MAX_RETRIES", "1"))
+RANKING_SHORTLIST_SIZE = int(os.environ.get("RANKING_SHORTLIST_SIZE", "20"))
+
+# Skill index persistence file (gzipped JSON); empty keeps the index in memory only
+SKILL_INDEX_PATH = os.environ.get("SKILL_INDEX_PATH", "")
+# Changes to the index within this many seconds are persisted by one write
+SKILL_INDEX_SAVE_DELAY_SECONDS = float(os.environ.get("SKILL_INDEX_SAVE_DELAY_SECONDS", "2"))
+
+# Ranking score cache per (resume, job): "none", "memory" or "sqlite"
+RANKING_CACHE_BACKEND = os.environ.get("RANKING_CACHE_BACKEND", "memory")
+RANKING_CACHE_PATH = os.environ.get("RANKING_CACHE_PATH", "ranking_cache.sqlite3")
+RANKING_CACHE_MAX_ENTRIES = int(os.environ.get("RANKING_CACHE_MAX_ENTRIES", "20000"))
+RANKING_CACHE_TTL_SECONDS = int(os.environ.get("RANKING_CACHE_TTL_SECONDS", "604800"))
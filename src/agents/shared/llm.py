@@ -0,0 +1,111 @@
+"""Process-wide async Anthropic client shared by the FastAPI agents.
+
+One AsyncAnthropic instance (and therefore one httpx connection pool) is reused
+by every request, and a semaphore caps how many LLM calls are in flight at once.
+Token usage, including prompt cache reads and writes, is totalled per process.
+"""
+
+import asyncio
+import threading
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+from shared.config import (
+    ANTHROPIC_API_KEY,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_IN_FLIGHT,
+    LLM_PROMPT_CACHING,
+)
+from shared.metrics import REGISTRY
+
+_client: AsyncAnthropic | None = None
+_in_flight: asyncio.Semaphore | None = None
+
+_USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+_usage = dict.fromkeys(("requests",) + _USAGE_FIELDS, 0)
+_usage_lock = threading.Lock()
+
+
+def get_async_client() -> AsyncAnthropic:
+    global _client
+    if _client is None:
+        _client = AsyncAnthropic(
+            api_key=ANTHROPIC_API_KEY,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                )
+            ),
+        )
+    return _client
+
+
+def llm_slot() -> asyncio.Semaphore:
+    """Semaphore to hold for the duration of each LLM call."""
+    global _in_flight
+    if _in_flight is None:
+        _in_flight = asyncio.Semaphore(LLM_MAX_IN_FLIGHT)
+    return _in_flight
+
+
+async def close_async_client() -> None:
+    """Close the shared client; the next get_async_client() builds a new one.
+
+    Both the client and the semaphore are bound to the running event loop, so
+    this must be called before the loop shuts down.
+    """
+    global _client, _in_flight
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _in_flight = None
+
+
+def system_blocks(*texts: str) -> list[dict]:
+    """System prompt as text blocks, each ending a prompt cache breakpoint.
+
+    The cache key is the whole prefix up to a breakpoint, so put the most
+    stable text first. A prefix shorter than the model's minimum (1024 tokens,
+    2048 for Haiku models) is processed normally and simply not cached.
+    """
+    blocks = [{"type": "text", "text": text} for text in texts]
+    if LLM_PROMPT_CACHING:
+        for block in blocks:
+            block["cache_control"] = {"type": "ephemeral"}
+    return blocks
+
+
+def record_usage(usage) -> None:
+    """Add a response's `usage` to the process totals."""
+    with _usage_lock:
+        _usage["requests"] += 1
+        for field in _USAGE_FIELDS:
+            _usage[field] += getattr(usage, field, None) or 0
+
+
+def usage_stats() -> dict:
+    """Token totals since the process started, including prompt cache reads and writes."""
+    with _usage_lock:
+        return dict(_usage)
+
+
+def _token_samples() -> dict:
+    usage = usage_stats()
+    return {(field.removesuffix("_tokens"),): usage[field] for field in _USAGE_FIELDS}
+
+
+REGISTRY.callback(
+    "resumerank_llm_requests_total", "LLM responses received", "counter", (),
+    lambda: {(): usage_stats()["requests"]},
+)
+REGISTRY.callback(
+    "resumerank_llm_tokens_total", "LLM tokens from response usage, by type", "counter",
+    ("type",), _token_samples,
+)
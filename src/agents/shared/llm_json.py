@@ -0,0 +1,7 @@
+"""Parsing of JSON objects out of LLM responses, including truncated ones.
+
+The implementation lives in aws_lambda/shared/llm_json.py, which the Lambda
+packages copy as a standalone module; the agents use the same code.
+"""
+
+from aws_lambda.shared.llm_json import json_array, load_json_object
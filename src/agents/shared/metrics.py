@@ -0,0 +1,335 @@
+"""In-process metrics for the FastAPI agents in the Prometheus text format.
+
+A minimal registry (counters, gauges, histograms and callback metrics read at
+scrape time) so no client library is needed. Hot paths are timed with
+`stage(name)`. When METRICS_ENABLED is off, stage() returns a shared no-op
+context manager, the middleware is not installed and /metrics responds 404.
+
+MetricsMiddleware also collects the stage timings of each request (including
+work handed to executor threads through `in_context`) and, with METRICS_LOG
+on, logs them as one JSON line per request.
+"""
+
+import bisect
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
+
+from shared.config import METRICS_ENABLED, METRICS_LOG
+
+logger = logging.getLogger(__name__)
+
+# Starlette appends the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# (stage, seconds) pairs of the current request; list.append is atomic, so
+# executor threads can add to it without a lock
+_request_stages: contextvars.ContextVar[list | None] = contextvars.ContextVar(
+    "request_stages", default=None
+)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[tuple[str, dict, float]]:
+        """(sample name, labels, value) for every label set."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        # Unlabelled metrics are reported as 0 before their first update
+        self._values: dict[tuple, float] = {} if labelnames else {(): 0}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in values]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def track(self, **labels) -> "_Tracked":
+        """Context manager that counts the code it wraps as in progress."""
+        return _Tracked(self, labels)
+
+
+class _Tracked:
+    __slots__ = ("gauge", "labels")
+
+    def __init__(self, gauge: Gauge, labels: dict):
+        self.gauge = gauge
+        self.labels = labels
+
+    def __enter__(self):
+        self.gauge.inc(**self.labels)
+
+    def __exit__(self, *exc):
+        self.gauge.dec(**self.labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: [count per bucket..., count above the last bucket, sum].
+        # Counts are per bucket; the cumulative form is computed when scraped.
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {key: list(counts) for key, counts in self._values.items()}
+        for key, counts in values.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            total = cumulative + counts[-2]
+            yield f"{self.name}_bucket", {**labels, "le": "+Inf"}, total
+            yield f"{self.name}_count", labels, total
+            yield f"{self.name}_sum", labels, counts[-1]
+
+
+class CallbackMetric(_Metric):
+    """Values computed at scrape time by `fn`, as {label values: value}."""
+
+    def __init__(self, name, help, type, labelnames, fn: Callable[[], dict[tuple, float]]):
+        super().__init__(name, help, labelnames)
+        self.type = type
+        self._fn = fn
+
+    def samples(self):
+        return [
+            (self.name, dict(zip(self.labelnames, key)), value)
+            for key, value in self._fn().items()
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        help: str,
+        type: str,
+        labelnames: tuple[str, ...],
+        fn: Callable[[], dict[tuple, float]],
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric(name, help, type, labelnames, fn))
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for sample_name, sample_labels, value in metric.samples():
+                labels = ",".join(f'{n}="{_escape(str(v))}"' for n, v in sample_labels.items())
+                lines.append(
+                    f"{sample_name}{{{labels}}} {_format_value(value)}"
+                    if labels
+                    else f"{sample_name} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "resumerank_stage_seconds", "Time spent in each processing stage", ("stage",)
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "resumerank_http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "resumerank_http_request_seconds", "HTTP request duration", ("method", "route")
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "resumerank_http_requests_in_flight", "HTTP requests being handled"
+)
+LLM_IN_FLIGHT = REGISTRY.gauge("resumerank_llm_in_flight", "LLM calls awaiting a response")
+
+_caches: dict[str, object] = {}
+for _field in ("hits", "misses", "evictions"):
+    REGISTRY.callback(
+        f"resumerank_cache_{_field}_total",
+        f"Cache {_field}",
+        "counter",
+        ("cache",),
+        lambda field=_field: {(name,): getattr(c.stats, field) for name, c in _caches.items()},
+    )
+REGISTRY.callback(
+    "resumerank_cache_entries",
+    "Entries in each cache",
+    "gauge",
+    ("cache",),
+    lambda: {(name,): len(c) for name, c in _caches.items()},
+)
+
+
+class _Stage:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.started
+        STAGE_SECONDS.observe(seconds, stage=self.name)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages.append((self.name, seconds))
+
+
+_NOOP = nullcontext()
+
+
+def stage(name: str):
+    """Time the wrapped block as stage `name`."""
+    return _Stage(name) if METRICS_ENABLED else _NOOP
+
+
+def llm_in_flight():
+    """Count the wrapped LLM call as in flight."""
+    return LLM_IN_FLIGHT.track() if METRICS_ENABLED else _NOOP
+
+
+def in_context(fn: Callable) -> Callable:
+    """Bind `fn` to the current context, so stages it times on an executor
+    thread are attributed to the calling request."""
+    if not METRICS_ENABLED:
+        return fn
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+def register_cache(name: str, cache) -> None:
+    """Export a shared.cache.Cache's counters and size with the label cache=`name`."""
+    _caches[name] = cache
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, durations and in-flight requests.
+
+    Durations run until the last body chunk is sent, so streamed responses are
+    measured in full. Routes are labelled by their path template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        stages: list[tuple[str, float]] = []
+        token = _request_stages.set(stages)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _request_stages.reset(token)
+            seconds = time.perf_counter() - started
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUESTS.inc(method=scope["method"], route=route, status=status)
+            HTTP_SECONDS.observe(seconds, method=scope["method"], route=route)
+            if METRICS_LOG:
+                totals: dict[str, float] = {}
+                for name, stage_seconds in stages:
+                    totals[name] = totals.get(name, 0.0) + stage_seconds
+                logger.info(
+                    json.dumps(
+                        {
+                            "method": scope["method"],
+                            "route": route,
+                            "status": status,
+                            "seconds": round(seconds, 6),
+                            "stages": {k: round(v, 6) for k, v in totals.items()},
+                        }
+                    )
+                )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+# The agents are run from src/agents (see start-all.bat), so import them the same way
+AGENTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src", "agents"))
+LAMBDA_DIR = os.path.join(AGENTS_DIR, "aws_lambda")
+sys.path.insert(0, AGENTS_DIR)
+
+# Top-level names a Lambda function's modules are imported under
+_LAMBDA_MODULES = ("shared", "parser", "batch", "handler", "ranker", "pdf_text")
+
+
+def _is_lambda_module(name: str) -> bool:
+    return name.split(".", 1)[0] in _LAMBDA_MODULES
+
+
+@pytest.fixture
+def lambda_function(monkeypatch):
+    """Import a Lambda function's modules the way Lambda does, e.g. lambda_function("resume_parser").
+
+    The function's directory and aws_lambda/ go first on sys.path, so `shared`
+    is the Lambda package rather than the agents' one. The agents' modules
+    are put back afterwards.
+    """
+    saved = {name: module for name, module in sys.modules.items() if _is_lambda_module(name)}
+    for name in saved:
+        del sys.modules[name]
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.setenv("S3_BUCKET_NAME", "test-bucket")
+
+    def use(function_dir: str) -> None:
+        monkeypatch.setattr(sys, "path", [os.path.join(LAMBDA_DIR, function_dir), LAMBDA_DIR] + sys.path)
+
+    yield use
+
+    for name in [name for name in sys.modules if _is_lambda_module(name)]:
+        del sys.modules[name]
+    sys.modules.update(saved)
@@ -0,0 +1,117 @@
+"""Classification of failures in S3 and SQS batches of the parser Lambda."""
+
+import json
+
+import pytest
+
+BUCKET = "test-bucket"
+
+
+class FakeParser:
+    """Raises the error configured for a key, otherwise returns a result."""
+
+    bucket_name = BUCKET
+    bedrock_stats: dict = {}
+
+    def __init__(self, errors: dict):
+        self.errors = errors
+        self.stored = []
+
+    def parse(self, key, deadline=None):
+        if key in self.errors:
+            raise self.errors[key]
+        return {"candidate_name": key}
+
+    def store_result(self, key, result):
+        self.stored.append(key)
+
+
+@pytest.fixture
+def batch(lambda_function):
+    lambda_function("resume_parser")
+    import batch
+
+    return batch
+
+
+def _sqs_event(*keys, bucket=BUCKET):
+    return {
+        "Records": [
+            {
+                "messageId": f"m-{key}",
+                "eventSource": "aws:sqs",
+                "body": json.dumps({"file_path": f"s3://{bucket}/{key}"}),
+            }
+            for key in keys
+        ]
+    }
+
+
+def _failures(response: dict) -> list[str]:
+    return [f["itemIdentifier"] for f in response["batchItemFailures"]]
+
+
+def test_permanent_errors_are_dropped(batch):
+    from parser import UnsupportedFileTypeError
+    from shared.s3_client import ObjectTooLargeError
+
+    parser = FakeParser({
+        "a.txt": UnsupportedFileTypeError("Unsupported file type: .txt"),
+        "big.pdf": ObjectTooLargeError("too large"),
+        "gone.pdf": FileNotFoundError("gone.pdf"),
+    })
+    response = batch.handle_record_batch(
+        _sqs_event("a.txt", "big.pdf", "gone.pdf", "ok.pdf"), parser
+    )
+    assert _failures(response) == []
+    assert parser.stored == ["ok.pdf.parsed.json"]
+
+
+def test_unparseable_response_is_retried(batch):
+    parser = FakeParser({
+        "bad-json.pdf": ValueError("Failed to parse response as JSON"),
+        "throttled.pdf": RuntimeError("Bedrock rate limit exceeded"),
+    })
+    response = batch.handle_record_batch(
+        _sqs_event("bad-json.pdf", "throttled.pdf", "ok.pdf"), parser
+    )
+    assert _failures(response) == ["m-bad-json.pdf", "m-throttled.pdf"]
+
+
+def test_other_bucket_is_dropped(batch):
+    response = batch.handle_record_batch(_sqs_event("a.pdf", bucket="elsewhere"), FakeParser({}))
+    assert _failures(response) == []
+
+
+def test_records_past_deadline_are_retried(batch):
+    from shared.worker_pool import Deadline
+
+    response = batch.handle_record_batch(
+        _sqs_event("a.pdf", "b.pdf"), FakeParser({}), Deadline.after(0)
+    )
+    assert _failures(response) == ["m-a.pdf", "m-b.pdf"]
+
+
+def test_direct_s3_notification_raises_for_retry(batch):
+    event = {
+        "Records": [
+            {
+                "eventSource": "aws:s3",
+                "eventName": "ObjectCreated:Put",
+                "s3": {"bucket": {"name": BUCKET}, "object": {"key": "cv+1.pdf"}},
+            },
+            {
+                "eventSource": "aws:s3",
+                "eventName": "ObjectCreated:Put",
+                "s3": {"bucket": {"name": BUCKET}, "object": {"key": "cv.pdf.parsed.json"}},
+            },
+        ]
+    }
+    parser = FakeParser({"cv 1.pdf": ValueError("Failed to parse response as JSON")})
+    with pytest.raises(RuntimeError, match="cv 1.pdf"):
+        batch.handle_record_batch(event, parser)
+
+
+def test_malformed_messages_are_dropped(batch):
+    event = {"Records": [{"messageId": "m-1", "eventSource": "aws:sqs", "body": "not json"}]}
+    assert _failures(batch.handle_record_batch(event, FakeParser({}))) == []
@@ -0,0 +1,182 @@
+"""Bulk parsing and ranking through Message Batches, against the fake LLM server."""
+
+import json
+import os
+
+import pytest
+
+from benchmarks.fake_llm import FakeLLMServer
+from ranking_agent.agent import RankingAgent
+from ranking_agent.bulk import run_bulk_rank
+from ranking_agent.models import JobData, RankRequest, ResumeData
+from ranking_agent.score_cache import RankingScoreCache
+from resume_parser.agent import ResumeParserAgent
+from resume_parser.bulk import custom_id, run_bulk_parse
+from shared import message_batches
+from shared.cache import MemoryCache
+
+# Batches end once this much time has passed since they were submitted
+BATCH_LATENCY_MS = 200
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    with FakeLLMServer(BATCH_LATENCY_MS) as server:
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", server.base_url)
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "fake")
+        yield server
+
+
+@pytest.fixture
+def resume_files(tmp_path):
+    docx = pytest.importorskip("docx")
+    files = []
+    for name in ("jane_doe", "john_roe"):
+        document = docx.Document()
+        document.add_paragraph(name.replace("_", " ").title())
+        document.add_paragraph("Skills: Python, SQL")
+        path = tmp_path / f"{name}.docx"
+        document.save(path)
+        files.append(str(path))
+    return files
+
+
+def _records(path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _interrupt_while_polling(monkeypatch):
+    def interrupt(seconds):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(message_batches.time, "sleep", interrupt)
+
+
+def _parser(cache=None) -> ResumeParserAgent:
+    return ResumeParserAgent(cache=cache, text_store=None)
+
+
+def test_bulk_parse_submits_collects_and_caches(fake_llm, resume_files, tmp_path):
+    output = tmp_path / "parsed.jsonl"
+    cache = MemoryCache(max_entries=10, ttl_seconds=60)
+    summary = run_bulk_parse(resume_files, str(output), poll_interval=0.05, agent=_parser(cache))
+    assert (summary.submitted, summary.succeeded, summary.failed) == (2, 2, 0)
+    records = _records(output)
+    assert sorted(r["file_path"] for r in records) == sorted(resume_files)
+    assert {r["custom_id"] for r in records} == {custom_id(f) for f in resume_files}
+    assert all(r["result"]["candidate_name"] == "Jane Doe" for r in records)
+    assert len(cache) == 2
+    assert not os.path.exists(f"{output}.state.json")
+
+    # Everything is in the output already: nothing is submitted again
+    summary = run_bulk_parse(resume_files, str(output), poll_interval=0.05, agent=_parser())
+    assert (summary.already_done, summary.submitted) == (2, 0)
+    assert len(fake_llm.app.state.batches) == 1
+
+
+def test_bulk_parse_writes_cache_hits_directly(fake_llm, resume_files, tmp_path):
+    cache = MemoryCache(max_entries=10, ttl_seconds=60)
+    first, second = str(tmp_path / "first.jsonl"), str(tmp_path / "second.jsonl")
+    run_bulk_parse(resume_files[:1], first, poll_interval=0.05, agent=_parser(cache))
+    summary = run_bulk_parse(resume_files, second, poll_interval=0.05, agent=_parser(cache))
+    assert (summary.written_directly, summary.submitted, summary.succeeded) == (1, 1, 1)
+
+
+def test_bulk_parse_resumes_after_interrupt(fake_llm, resume_files, tmp_path, monkeypatch):
+    output = tmp_path / "parsed.jsonl"
+    state = f"{output}.state.json"
+    with monkeypatch.context() as m:
+        _interrupt_while_polling(m)
+        with pytest.raises(KeyboardInterrupt):
+            run_bulk_parse(resume_files, str(output), poll_interval=0.05, agent=_parser())
+    with open(state, encoding="utf-8") as f:
+        pending = json.load(f)["pending_batches"]
+    assert list(pending) == ["msgbatch_fake_1"]
+    assert not output.exists()
+
+    # The rerun polls the batch from the state file instead of resubmitting
+    summary = run_bulk_parse(resume_files, str(output), poll_interval=0.05, agent=_parser())
+    assert (summary.submitted, summary.succeeded) == (0, 2)
+    assert len(fake_llm.app.state.batches) == 1
+    assert len(_records(output)) == 2
+    assert not os.path.exists(state)
+
+
+def test_bulk_parse_resubmits_errored_requests(fake_llm, resume_files, tmp_path):
+    output = tmp_path / "parsed.jsonl"
+    fake_llm.app.state.batch_errors.add(custom_id(resume_files[0]))
+    summary = run_bulk_parse(resume_files, str(output), poll_interval=0.05, agent=_parser())
+    assert (summary.succeeded, summary.failed) == (1, 1)
+
+    fake_llm.app.state.batch_errors.clear()
+    summary = run_bulk_parse(resume_files, str(output), poll_interval=0.05, agent=_parser())
+    assert (summary.already_done, summary.submitted, summary.succeeded) == (1, 1, 1)
+    assert len(_records(output)) == 2
+
+
+JOB = JobData(
+    job_id="job-1",
+    title="Backend Engineer",
+    description="Build services.",
+    required_skills=["Python", "SQL"],
+    preferred_skills=[],
+    experience_level="Mid",
+)
+
+
+def _rank_requests(count: int) -> list[RankRequest]:
+    resumes = [
+        ResumeData(
+            resume_id=i,
+            candidate_name=f"Candidate {i}",
+            skills=["Python"],
+            experience_level="Mid",
+            summary=None,
+        )
+        for i in range(1, count + 1)
+    ]
+    return [RankRequest(job=JOB, resumes=resumes)]
+
+
+def _ranker(cache: MemoryCache) -> RankingAgent:
+    return RankingAgent(RankingScoreCache(cache, model="fake", prompt_version="1"))
+
+
+def test_bulk_rank_scores_every_candidate(fake_llm, tmp_path):
+    output = tmp_path / "rankings.jsonl"
+    cache = MemoryCache(max_entries=100, ttl_seconds=60)
+    summary = run_bulk_rank(
+        _rank_requests(5), str(output), poll_interval=0.05, agent=_ranker(cache)
+    )
+    assert summary.failed == 0
+    records = _records(output)
+    assert sorted(s["resume_id"] for r in records for s in r["rankings"]) == [1, 2, 3, 4, 5]
+    assert all(r["job_id"] == "job-1" and r["missing_resume_ids"] == [] for r in records)
+
+    # The scores were cached: a new output is written without any batch
+    summary = run_bulk_rank(
+        _rank_requests(5), str(tmp_path / "again.jsonl"), poll_interval=0.05, agent=_ranker(cache)
+    )
+    assert summary.submitted == 0
+    assert summary.written_directly == len(records)
+
+
+def test_bulk_rank_resumes_after_interrupt(fake_llm, tmp_path, monkeypatch):
+    output = tmp_path / "rankings.jsonl"
+    cache = MemoryCache(max_entries=100, ttl_seconds=60)
+    with monkeypatch.context() as m:
+        _interrupt_while_polling(m)
+        with pytest.raises(KeyboardInterrupt):
+            run_bulk_rank(
+                _rank_requests(3), str(output), poll_interval=0.05, agent=_ranker(cache)
+            )
+    assert os.path.exists(f"{output}.state.json")
+
+    summary = run_bulk_rank(
+        _rank_requests(3), str(output), poll_interval=0.05, agent=_ranker(cache)
+    )
+    assert summary.submitted == 0
+    assert summary.succeeded >= 1
+    assert len(fake_llm.app.state.batches) == 1
+    assert sorted(s["resume_id"] for r in _records(output) for s in r["rankings"]) == [1, 2, 3]
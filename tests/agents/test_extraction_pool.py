@@ -0,0 +1,51 @@
+"""Extraction in worker processes: timeouts and crashed workers."""
+
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from resume_parser.extraction import ExtractionPool, ExtractionTimeoutError
+
+
+def _double(value: int) -> int:
+    return value * 2
+
+
+def _hang(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def _crash() -> None:
+    os._exit(1)
+
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(workers=2, max_tasks_per_child=None, timeout_seconds=0.5)
+    yield pool
+    pool.shutdown()
+
+
+def test_runs_in_worker(pool):
+    assert pool.run(_double, 21) == 42
+
+
+def test_timeout_replaces_pool_and_stops_worker(pool):
+    old = pool._pool
+    old_processes = list(old._processes.values()) if old._processes else []
+    with pytest.raises(ExtractionTimeoutError):
+        pool.run(_hang, 60)
+    assert pool._pool is not old
+    deadline = time.monotonic() + 5
+    while any(p.is_alive() for p in old_processes) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not any(p.is_alive() for p in old_processes)
+    assert pool.run(_double, 2) == 4
+
+
+def test_crashed_worker_is_retried_once(pool):
+    with pytest.raises(BrokenProcessPool):
+        pool.run(_crash)
+    assert pool.run(_double, 3) == 6
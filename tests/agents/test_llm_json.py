@@ -0,0 +1,84 @@
+"""Decoding and truncation repair of JSON objects in LLM responses."""
+
+import json
+
+import pytest
+
+from shared.llm_json import json_array, load_json_object
+
+RANKINGS = {
+    "rankings": [
+        {"resume_id": 1, "overall_score": 80, "summary": "Strong match."},
+        {"resume_id": 2, "overall_score": 65, "summary": "Partial match."},
+    ]
+}
+
+
+def test_complete_object():
+    assert load_json_object(json.dumps(RANKINGS)) == (RANKINGS, True)
+
+
+def test_object_wrapped_in_prose():
+    text = f"Here are the rankings:\n```json\n{json.dumps(RANKINGS)}\n```\nDone."
+    assert load_json_object(text) == (RANKINGS, True)
+
+
+def test_no_object():
+    with pytest.raises(ValueError):
+        load_json_object("I cannot rank these resumes.")
+
+
+def test_keeps_trailing_string_value():
+    text = '{"candidate_name":"X","skills":["a","b"],"experience_level":"Senior"'
+    assert load_json_object(text) == (
+        {"candidate_name": "X", "skills": ["a", "b"], "experience_level": "Senior"},
+        False,
+    )
+
+
+def test_keeps_last_array_string():
+    assert load_json_object('{"skills": ["a","b"') == ({"skills": ["a", "b"]}, False)
+
+
+def test_drops_unterminated_string():
+    assert load_json_object('{"skills": ["a","b","Kube') == ({"skills": ["a", "b"]}, False)
+
+
+def test_drops_dangling_key():
+    text = '{"candidate_name": "X", "summary": '
+    assert load_json_object(text) == ({"candidate_name": "X"}, False)
+
+
+def test_keeps_finished_literals():
+    text = '{"a": true, "b": null, "c": 12 '
+    assert load_json_object(text) == ({"a": True, "b": None, "c": 12}, False)
+
+
+def test_drops_number_at_end_of_text():
+    # "8" may be the start of "85"
+    assert load_json_object('{"a": 1, "score": 8') == ({"a": 1}, False)
+
+
+def test_drops_partial_array_element():
+    text = json.dumps(RANKINGS)
+    cut = text.index('"overall_score": 65')
+    assert load_json_object(text[:cut]) == ({"rankings": RANKINGS["rankings"][:1]}, False)
+
+
+def test_keeps_complete_array_elements():
+    text = json.dumps(RANKINGS)[:-2]
+    assert load_json_object(text) == (RANKINGS, False)
+
+
+def test_brackets_inside_strings():
+    text = '{"summary": "Uses [brackets] and {braces}", "skills": ["a"'
+    assert load_json_object(text) == (
+        {"summary": "Uses [brackets] and {braces}", "skills": ["a"]},
+        False,
+    )
+
+
+def test_json_array():
+    assert json_array({"rankings": [1]}, "rankings") == [1]
+    assert json_array({"rankings": "none"}, "rankings") == []
+    assert json_array({}, "rankings") == []
@@ -0,0 +1,84 @@
+"""The Prometheus exposition served at /metrics."""
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ranking_agent import main as main_module
+from shared import metrics
+from shared.cache import MemoryCache
+
+JOB = {
+    "job_id": "job-1",
+    "title": "Backend Engineer",
+    "description": "Build services.",
+    "required_skills": ["Python"],
+    "preferred_skills": [],
+    "experience_level": "Mid",
+}
+RESUMES = [
+    {
+        "resume_id": 1,
+        "candidate_name": "Candidate 1",
+        "skills": ["Python"],
+        "experience_level": "Mid",
+        "summary": None,
+    }
+]
+
+
+@pytest.fixture
+def client():
+    return TestClient(main_module.app)
+
+
+def _sample(text: str, name: str, **labels) -> float:
+    """Value of the sample `name` with exactly `labels`, or 0 if absent."""
+    label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    pattern = re.escape(f"{name}{{{label_text}}}" if labels else name) + r" (\S+)$"
+    match = re.search(pattern, text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_exposition_format_and_request_metrics(client):
+    before = client.get("/metrics").text
+    ranked = client.post("/rank", json={"job": JOB, "resumes": RESUMES, "mode": "local"})
+    assert ranked.status_code == 200
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert text.endswith("\n")
+    assert "# TYPE resumerank_stage_seconds histogram" in text
+    assert "# TYPE resumerank_http_requests_total counter" in text
+    for line in text.splitlines():
+        assert line.startswith("# ") or re.fullmatch(r"[a-z_]+(\{.*\})? \S+", line), line
+
+    labels = {"method": "POST", "route": "/rank", "status": 200}
+    name = "resumerank_http_requests_total"
+    assert _sample(text, name, **labels) == _sample(before, name, **labels) + 1
+    count = "resumerank_stage_seconds_count"
+    scored = _sample(text, count, stage="local_scoring")
+    assert scored > _sample(before, count, stage="local_scoring")
+    bucket = "resumerank_stage_seconds_bucket"
+    assert _sample(text, bucket, stage="local_scoring", le="+Inf") == scored
+
+
+def test_registered_cache_is_exported(client, monkeypatch):
+    cache = MemoryCache()
+    monkeypatch.setitem(metrics._caches, "test", cache)
+    cache.set("a", {"x": 1})
+    cache.get("a")
+    cache.get("b")
+
+    text = client.get("/metrics").text
+    assert _sample(text, "resumerank_cache_hits_total", cache="test") == 1
+    assert _sample(text, "resumerank_cache_misses_total", cache="test") == 1
+    assert _sample(text, "resumerank_cache_entries", cache="test") == 1
+
+
+def test_metrics_disabled_responds_404(client, monkeypatch):
+    monkeypatch.setattr(main_module, "METRICS_ENABLED", False)
+    assert client.get("/metrics").status_code == 404
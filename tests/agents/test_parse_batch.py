@@ -0,0 +1,113 @@
+"""The /parse/batch endpoint, with extraction and the LLM call replaced."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from resume_parser import main as main_module
+from resume_parser.agent import ExtractedResume
+from resume_parser.models import ParsedResumeResponse
+
+
+def _parsed(file_path: str) -> ParsedResumeResponse:
+    return ParsedResumeResponse(
+        candidate_name=file_path,
+        skills=["Python"],
+        experience_level="Mid",
+        summary=None,
+        suitable_roles=[],
+    )
+
+
+class _FakeLLM:
+    """Replaces agent.structure and records how many calls overlap."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def structure(self, extracted: ExtractedResume) -> ParsedResumeResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return _parsed(extracted.file_path)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = _FakeLLM()
+    monkeypatch.setattr(main_module.agent, "extract", lambda path: ExtractedResume(path, "text"))
+    monkeypatch.setattr(main_module.agent, "structure", llm.structure)
+    return llm
+
+
+@pytest.fixture
+def resume_paths(tmp_path):
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"resume_{i}.pdf"
+        path.write_bytes(b"%PDF")
+        paths.append(str(path))
+    return paths
+
+
+async def _post_batches(batches: list[list[str]]) -> list[httpx.Response]:
+    transport = httpx.ASGITransport(app=main_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(
+            *(client.post("/parse/batch", json={"file_paths": b}) for b in batches)
+        )
+
+
+def test_llm_concurrency_is_per_request(fake_llm, resume_paths, monkeypatch):
+    monkeypatch.setattr(main_module, "PARSE_LLM_CONCURRENCY", 2)
+    responses = asyncio.run(_post_batches([resume_paths[:3], resume_paths[3:]]))
+    assert [r.json()["succeeded"] for r in responses] == [3, 3]
+    # Two requests, two calls each at most
+    assert fake_llm.peak == 4
+
+
+def test_each_file_gets_its_own_status(fake_llm, resume_paths, tmp_path, monkeypatch):
+    cached = _parsed("from cache")
+    unsupported = tmp_path / "notes.txt"
+    unsupported.write_text("not a resume")
+    broken = resume_paths[1]
+
+    def extract(path: str) -> ExtractedResume:
+        if path.endswith(".txt"):
+            raise ValueError("Unsupported file type: .txt")
+        if path == broken:
+            raise RuntimeError("corrupt PDF")
+        if path == resume_paths[2]:
+            return ExtractedResume(path, cached=cached)
+        return ExtractedResume(path, "text")
+
+    monkeypatch.setattr(main_module.agent, "extract", extract)
+    paths = [resume_paths[0], broken, resume_paths[2], str(unsupported), str(tmp_path / "gone.pdf")]
+    response = asyncio.run(_post_batches([paths]))[0]
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["status_code"] for r in body["results"]] == [200, 500, 200, 400, 404]
+    assert [r["file_path"] for r in body["results"]] == paths
+    assert body["results"][0]["result"]["candidate_name"] == resume_paths[0]
+    assert body["results"][1]["error"] == "Parsing failed: corrupt PDF"
+    assert body["results"][2]["result"]["candidate_name"] == "from cache"
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+    # The cache hit and the failures never reached the LLM
+    assert fake_llm.peak == 1
+
+
+def test_rejects_empty_and_oversized_batches(fake_llm, resume_paths, monkeypatch):
+    monkeypatch.setattr(main_module, "PARSE_BATCH_MAX_FILES", 5)
+    empty, oversized, at_limit = asyncio.run(
+        _post_batches([[], resume_paths, resume_paths[:5]])
+    )
+    assert empty.status_code == 400
+    assert oversized.status_code == 400
+    assert oversized.json()["detail"] == "Too many files: 6 (max 5)"
+    assert at_limit.status_code == 200
@@ -0,0 +1,28 @@
+"""Parse cache keys: a result is reused only for the same text settings."""
+
+from aws_lambda.shared.parse_cache import make_cache_key as lambda_cache_key
+from resume_parser import agent as agent_module
+from resume_parser.agent import ResumeParserAgent
+from shared.cache import MemoryCache, make_cache_key
+
+
+def test_settings_change_the_key():
+    def key(*settings):
+        return make_cache_key("digest", model="m", prompt_version="1", settings=settings)
+
+    assert key("auto", 24000, 750) == key("auto", 24000, 750)
+    assert key("auto", 24000, 750) != key("auto", 24000, 1500)
+    assert lambda_cache_key("digest", "m", "1", ("auto", 24000, 750)) != lambda_cache_key(
+        "digest", "m", "1", ("pdfium", 24000, 750)
+    )
+
+
+def test_agent_key_follows_token_budget(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"not really a pdf")
+    agent = ResumeParserAgent(cache=MemoryCache(max_entries=10, ttl_seconds=60), text_store=None)
+    monkeypatch.setattr(agent, "_extracted_text", lambda *args: "Jane Doe\nPython")
+    first = agent.extract(str(path)).cache_key
+    monkeypatch.setattr(agent_module, "PARSE_TEXT_TOKEN_BUDGET", 1500)
+    assert agent.extract(str(path)).cache_key != first
@@ -0,0 +1,38 @@
+"""PDF text extraction with the pdfium and pdfplumber backends."""
+
+import warnings
+
+import pytest
+
+from benchmarks.corpus import make_pdf, resume_lines
+from resume_parser.pdf_text import extract_pdf_text
+from resume_parser.text_compaction import PAGE_BREAK
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(make_pdf(resume_lines(0, pages=3)))
+    return str(path)
+
+
+@pytest.mark.parametrize("backend", ["pdfium", "pdfplumber"])
+def test_backends_extract_every_page(pdf_path, backend):
+    pytest.importorskip("pypdfium2" if backend == "pdfium" else "pdfplumber")
+    text = extract_pdf_text(pdf_path, 1_000_000, backend=backend)
+    assert text.count(PAGE_BREAK) == 2
+    assert text.strip()
+
+
+def test_pdfium_extraction_does_not_warn(pdf_path):
+    pytest.importorskip("pypdfium2")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        extract_pdf_text(pdf_path, 1_000_000, backend="pdfium")
+
+
+def test_stops_after_char_limit(pdf_path):
+    pytest.importorskip("pypdfium2")
+    full = extract_pdf_text(pdf_path, 1_000_000, backend="pdfium")
+    first_page = full.split(PAGE_BREAK)[0]
+    assert extract_pdf_text(pdf_path, len(first_page) // 2, backend="pdfium") == first_page
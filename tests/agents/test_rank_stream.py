@@ -0,0 +1,100 @@
+"""Framing of /rank/stream as NDJSON and as Server-Sent Events."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ranking_agent import main as main_module
+from ranking_agent.models import RankingScore
+
+JOB = {
+    "job_id": "job-1",
+    "title": "Backend Engineer",
+    "description": "Build services.",
+    "required_skills": ["Python", "SQL"],
+    "preferred_skills": [],
+    "experience_level": "Mid",
+}
+RESUMES = [
+    {
+        "resume_id": i,
+        "candidate_name": f"Candidate {i}",
+        "skills": ["Python", "SQL"][:i],
+        "experience_level": "Mid",
+        "summary": None,
+    }
+    for i in (1, 2)
+]
+REQUEST = {"job": JOB, "resumes": RESUMES, "mode": "local"}
+SSE = {"accept": "text/event-stream"}
+
+
+@pytest.fixture
+def client():
+    return TestClient(main_module.app)
+
+
+def _sse_events(text: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        assert event.startswith("event: ") and data.startswith("data: ")
+        events.append((event[len("event: ") :], json.loads(data[len("data: ") :])))
+    return events
+
+
+def test_ndjson_is_one_score_per_line(client):
+    response = client.post("/rank/stream", json=REQUEST)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.endswith("\n")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["resume_id"] for r in records] == [2, 1]
+    RankingScore(**records[0])
+
+
+def test_sse_frames_scores_and_ends_with_done(client):
+    response = client.post("/rank/stream", json=REQUEST, headers=SSE)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    assert [name for name, _ in events] == ["ranking", "ranking", "done"]
+    assert [data["resume_id"] for _, data in events[:2]] == [2, 1]
+    assert events[-1][1] == {"count": 2}
+
+
+def _failing_stream(monkeypatch):
+    async def rank_stream(resumes, job, mode, shortlist_size):
+        yield RankingScore(
+            resume_id=1,
+            job_id=job.job_id,
+            skill_match_score=50,
+            experience_match_score=95,
+            overall_score=68,
+            summary="Partial match.",
+        )
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(main_module.agent, "rank_stream", rank_stream)
+
+
+def test_ndjson_failure_ends_with_error_record(client, monkeypatch):
+    _failing_stream(monkeypatch)
+    response = client.post("/rank/stream", json={**REQUEST, "mode": "llm"})
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert records[0]["resume_id"] == 1
+    assert records[-1] == {"error": "Ranking failed: model unavailable"}
+    assert len(records) == 2
+
+
+def test_sse_failure_ends_with_error_event(client, monkeypatch):
+    _failing_stream(monkeypatch)
+    response = client.post("/rank/stream", json={**REQUEST, "mode": "llm"}, headers=SSE)
+    events = _sse_events(response.text)
+    assert [name for name, _ in events] == ["ranking", "error"]
+    assert events[-1][1] == {"error": "Ranking failed: model unavailable"}
+
+
+def test_empty_request_is_rejected_before_streaming(client):
+    response = client.post("/rank/stream", json={**REQUEST, "resumes": []})
+    assert response.status_code == 400
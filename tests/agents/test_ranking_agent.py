@@ -0,0 +1,137 @@
+"""Chunked LLM ranking in the agents, with the LLM call replaced."""
+
+import asyncio
+
+import pytest
+
+from ranking_agent import agent as agent_module
+from ranking_agent.agent import AsyncRankingAgent, RankingAgent
+from ranking_agent.models import JobData, RankingScore, ResumeData
+
+JOB = JobData(
+    job_id="job-1",
+    title="Backend Engineer",
+    description="Build services.",
+    required_skills=["Python", "SQL"],
+    preferred_skills=["Docker"],
+    experience_level="Mid",
+)
+
+
+def _resumes(count: int) -> list[ResumeData]:
+    return [
+        ResumeData(
+            resume_id=i,
+            candidate_name=f"C{i}",
+            skills=["Python", "SQL"] if i % 2 else ["Java"],
+            experience_level="Mid",
+            summary=None,
+        )
+        for i in range(count)
+    ]
+
+
+def _llm_score(resume: ResumeData) -> RankingScore:
+    return RankingScore(
+        resume_id=resume.resume_id,
+        job_id=JOB.job_id,
+        skill_match_score=50,
+        experience_match_score=50,
+        overall_score=50 + resume.resume_id % 7,
+        summary="LLM summary.",
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_score_cache(monkeypatch):
+    monkeypatch.setattr(agent_module, "RANKING_CACHE_BACKEND", "none")
+
+
+def test_async_chunks_respect_chunk_concurrency(monkeypatch):
+    monkeypatch.setattr(agent_module, "RANKING_CHUNK_CONCURRENCY", 3)
+    monkeypatch.setattr(agent_module, "RANKING_CHUNK_MAX_RESUMES", 5)
+    agent = AsyncRankingAgent()
+    running = {"now": 0, "max": 0}
+
+    async def rank_chunk(resumes, job):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return [_llm_score(r) for r in resumes]
+
+    monkeypatch.setattr(agent, "_rank_chunk", rank_chunk)
+    scores = asyncio.run(agent.rank(_resumes(60), JOB))
+    assert len(scores) == 60
+    assert running["max"] == 3
+
+
+def test_async_missing_candidates_are_retried(monkeypatch):
+    agent = AsyncRankingAgent()
+    calls = []
+
+    async def rank_chunk(resumes, job):
+        calls.append([r.resume_id for r in resumes])
+        # The first response drops the last candidate of the chunk
+        return [_llm_score(r) for r in (resumes[:-1] if len(calls) == 1 else resumes)]
+
+    monkeypatch.setattr(agent, "_rank_chunk", rank_chunk)
+    scores = asyncio.run(agent.rank(_resumes(3), JOB))
+    assert sorted(s.resume_id for s in scores) == [0, 1, 2]
+    assert calls == [[0, 1, 2], [2]]
+
+
+def test_async_llm_failure_raises_in_llm_mode(monkeypatch):
+    agent = AsyncRankingAgent()
+
+    async def rank_chunk(resumes, job):
+        raise RuntimeError("LLM down")
+
+    monkeypatch.setattr(agent, "_rank_chunk", rank_chunk)
+    with pytest.raises(RuntimeError, match="LLM down"):
+        asyncio.run(agent.rank(_resumes(4), JOB))
+
+
+def test_async_shortlist_falls_back_to_local_scores(monkeypatch):
+    agent = AsyncRankingAgent()
+
+    async def rank_chunk(resumes, job):
+        raise RuntimeError("LLM down")
+
+    monkeypatch.setattr(agent, "_rank_chunk", rank_chunk)
+    local = agent._score_locally(_resumes(10), JOB)
+    assert asyncio.run(agent.rank(_resumes(10), JOB, "shortlist", 3)) == local
+
+    async def stream():
+        return [s async for s in agent.rank_stream(_resumes(10), JOB, "shortlist", 3)]
+
+    assert sorted(s.resume_id for s in asyncio.run(stream())) == list(range(10))
+
+
+def test_sync_shortlist_falls_back_to_local_scores(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake")
+    agent = RankingAgent()
+
+    def rank_chunk(resumes, job):
+        raise RuntimeError("LLM down")
+
+    monkeypatch.setattr(agent, "_rank_chunk", rank_chunk)
+    assert agent.rank(_resumes(10), JOB, "shortlist", 3) == agent._score_locally(_resumes(10), JOB)
+
+
+def test_shortlist_rescored_by_llm(monkeypatch):
+    agent = AsyncRankingAgent()
+    seen = []
+
+    async def rank_chunk(resumes, job):
+        seen.extend(r.resume_id for r in resumes)
+        return [_llm_score(r) for r in resumes]
+
+    monkeypatch.setattr(agent, "_rank_chunk", rank_chunk)
+    scores = asyncio.run(agent.rank(_resumes(10), JOB, "shortlist", 3))
+    assert len(scores) == 10
+    # Only the local top 3 went to the LLM; they come first
+    top = {s.resume_id for s in agent._score_locally(_resumes(10), JOB)[:3]}
+    assert set(seen) == top
+    assert {s.resume_id for s in scores[:3]} == top
+    assert all(s.summary == "LLM summary." for s in scores[:3])
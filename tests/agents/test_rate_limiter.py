@@ -0,0 +1,153 @@
+"""Token-bucket rate limiting of Bedrock calls in the Lambdas."""
+
+import pytest
+
+from aws_lambda.shared.rate_limiter import MIN_RATE_SCALE, RateLimiter, TokenBucket
+
+
+def _tokens_level(limiter: RateLimiter) -> float:
+    return limiter._tokens.level
+
+
+def test_bucket_reserve_goes_into_debt():
+    bucket = TokenBucket(60)  # one per second
+    assert bucket.reserve(60) == 0
+    assert bucket.reserve(2) == pytest.approx(2)
+    bucket.credit(1000)
+    assert bucket.level == 60
+
+
+def test_bucket_caps_reservation_at_capacity():
+    bucket = TokenBucket(60)
+    assert bucket.reserve(1000) == 0
+    assert bucket.level == 0
+
+
+def test_disabled_limiter_never_waits():
+    limiter = RateLimiter()
+    for _ in range(100):
+        assert limiter.acquire(100_000, max_wait=0) == 0
+    assert limiter.stats()["requests"] == 100
+
+
+def test_settle_credits_unused_tokens():
+    limiter = RateLimiter(tokens_per_minute=6000)
+    limiter.acquire(1000)
+    limiter.settle(1000, 300)
+    assert _tokens_level(limiter) == pytest.approx(5700, abs=1)
+
+
+def test_release_returns_whole_reservation():
+    limiter = RateLimiter(tokens_per_minute=6000)
+    for _ in range(5):
+        limiter.acquire(1000)
+        limiter.release(1000)
+    assert _tokens_level(limiter) == pytest.approx(6000, abs=1)
+
+
+def test_release_does_not_reset_backoff():
+    limiter = RateLimiter(tokens_per_minute=6000)
+    limiter.throttled()
+    limiter.release(1000)
+    assert limiter.stats()["rate_scale"] == 0.5
+    limiter.settle(1000, 1000)
+    assert limiter.stats()["rate_scale"] == 0.55
+
+
+def test_timeout_reserves_nothing():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+    limiter.acquire(6000)
+    with pytest.raises(TimeoutError):
+        limiter.acquire(1000, max_wait=0)
+    # Only the first request is charged
+    assert limiter.stats()["requests"] == 1
+    assert limiter._requests.level == pytest.approx(59, abs=0.1)
+    assert _tokens_level(limiter) == pytest.approx(0, abs=1)
+
+
+def test_throttles_back_off_and_scale_down():
+    limiter = RateLimiter(tokens_per_minute=6000)
+    delays = [limiter.throttled() for _ in range(10)]
+    assert 0.25 <= delays[0] <= 0.5
+    assert delays[3] >= 2.0
+    assert limiter.stats()["throttles"] == 10
+    assert limiter.stats()["rate_scale"] == MIN_RATE_SCALE
+
+
+class _FakeRuntime:
+    """Stands in for the botocore bedrock-runtime client."""
+
+    def __init__(self, error):
+        self._error = error
+        self.calls = 0
+
+    def invoke_model(self, **kwargs):
+        self.calls += 1
+        raise self._error
+
+
+@pytest.fixture
+def bedrock_client(monkeypatch):
+    pytest.importorskip("botocore")
+    from aws_lambda.shared.bedrock_client import BedrockClient
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("BEDROCK_MAX_ATTEMPTS", "3")
+    client = BedrockClient(region="us-east-1", rate_limiter=RateLimiter(tokens_per_minute=60_000))
+    monkeypatch.setattr(client.limiter, "throttled", lambda: 0.0)
+    return client
+
+
+def test_throttled_calls_release_reservations(bedrock_client):
+    from botocore.exceptions import ClientError
+
+    # A plain ClientError, as raised by clients whose model lacks the exception class
+    error = ClientError(
+        {"Error": {"Code": "ServiceUnavailableException", "Message": "slow down"}}, "InvokeModel"
+    )
+    bedrock_client._client = _FakeRuntime(error)
+    with pytest.raises(RuntimeError, match="rate limit exceeded after 3 attempts"):
+        bedrock_client.invoke("prompt", max_tokens=4096)
+    assert bedrock_client._client.calls == 3
+    assert _tokens_level(bedrock_client.limiter) == pytest.approx(60_000, abs=1)
+
+
+def test_failed_call_releases_reservation(bedrock_client):
+    bedrock_client._client = _FakeRuntime(OSError("boom"))
+    with pytest.raises(RuntimeError, match="invocation failed"):
+        bedrock_client.invoke("prompt", max_tokens=4096)
+    assert _tokens_level(bedrock_client.limiter) == pytest.approx(60_000, abs=1)
+
+
+def test_other_client_errors_are_not_retried(bedrock_client):
+    from botocore.exceptions import ClientError
+
+    error = ClientError(
+        {"Error": {"Code": "ValidationException", "Message": "bad body"}}, "InvokeModel"
+    )
+    bedrock_client._client = _FakeRuntime(error)
+    with pytest.raises(RuntimeError, match="invocation failed"):
+        bedrock_client.invoke("prompt", max_tokens=4096)
+    assert bedrock_client._client.calls == 1
+
+
+def test_wait_is_capped_by_deadline(bedrock_client):
+    from aws_lambda.shared.worker_pool import Deadline
+
+    bedrock_client._client = _FakeRuntime(OSError("unused"))
+    bedrock_client.limiter.acquire(60_000)
+    # The next slot is minutes away; the deadline leaves under a second
+    with pytest.raises(RuntimeError, match="rate limit exceeded"):
+        bedrock_client.invoke("prompt", max_tokens=4096, deadline=Deadline.after(0.5))
+    assert bedrock_client._client.calls == 0
+
+
+def test_spent_wait_budget_does_not_refuse_free_capacity():
+    limiter = RateLimiter()
+    assert limiter.acquire(100, max_wait=-0.5) == 0
+    limiter = RateLimiter(tokens_per_minute=6000)
+    assert limiter.acquire(100, max_wait=-0.5) == 0
+    limiter.acquire(6000)
+    with pytest.raises(TimeoutError):
+        limiter.acquire(100, max_wait=-0.5)
@@ -0,0 +1,113 @@
+"""S3Client bulk operations and streaming downloads, against an in-memory S3."""
+
+import io
+import json
+
+import pytest
+
+botocore_exceptions = pytest.importorskip("botocore.exceptions")
+
+
+class _FakeS3:
+    """The botocore S3 client calls S3Client makes, over a dict of objects."""
+
+    def __init__(self, objects: dict[str, bytes]):
+        self.objects = dict(objects)
+        self.delete_requests = []
+        self.unreachable = set()
+        self.report_length = True
+
+    def get_object(self, Bucket, Key):
+        if Key in self.unreachable:
+            raise botocore_exceptions.EndpointConnectionError(endpoint_url="https://s3.example")
+        if Key not in self.objects:
+            error = {"Error": {"Code": "NoSuchKey", "Message": "none"}}
+            raise botocore_exceptions.ClientError(error, "GetObject")
+        data = self.objects[Key]
+        response = {"Body": io.BytesIO(data)}
+        if self.report_length:
+            response["ContentLength"] = len(data)
+        return response
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [o["Key"] for o in Delete["Objects"]]
+        self.delete_requests.append(keys)
+        for key in keys:
+            self.objects.pop(key, None)
+        return {"Errors": []}
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    from aws_lambda.shared.s3_client import S3Client
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    client = S3Client(bucket_name="test-bucket", region="us-east-1")
+    client._client = _FakeS3({f"resumes/{i}.pdf": f"file {i}".encode() for i in range(5)})
+    return client
+
+
+def test_download_files_returns_failures_per_key(s3):
+    s3._client.unreachable.add("resumes/1.pdf")
+    keys = ["resumes/0.pdf", "resumes/1.pdf", "resumes/2.pdf", "resumes/missing.pdf"]
+    contents, errors = s3.download_files(keys)
+    assert contents == {"resumes/0.pdf": b"file 0", "resumes/2.pdf": b"file 2"}
+    unreachable = errors["resumes/1.pdf"]
+    assert isinstance(unreachable, botocore_exceptions.EndpointConnectionError)
+    assert isinstance(errors["resumes/missing.pdf"], FileNotFoundError)
+
+
+def test_delete_files_sends_batches_of_1000_keys(s3):
+    keys = [f"parsed/{i}.json" for i in range(2005)]
+    assert s3.delete_files(keys) == []
+    assert [len(batch) for batch in s3._client.delete_requests] == [1000, 1000, 5]
+    assert [k for batch in s3._client.delete_requests for k in batch] == keys
+    assert s3.delete_files([]) == []
+    assert len(s3._client.delete_requests) == 3
+
+
+def test_download_to_stream_spools_to_disk_past_spool_bytes(s3):
+    data = bytes(range(256)) * 400
+    s3._client.objects["resumes/big.pdf"] = data
+    with s3.download_file_to_stream("resumes/big.pdf", spool_bytes=len(data) // 2) as stream:
+        assert stream._rolled
+        assert stream.read() == data
+    with s3.download_file_to_stream("resumes/0.pdf", spool_bytes=1024) as stream:
+        assert not stream._rolled
+        assert stream.read() == b"file 0"
+
+
+@pytest.mark.parametrize("report_length", [True, False])
+def test_download_to_stream_rejects_objects_over_max_bytes(s3, report_length):
+    from aws_lambda.shared.s3_client import ObjectTooLargeError
+
+    s3._client.report_length = report_length
+    s3._client.objects["resumes/big.pdf"] = b"x" * 2048
+    with pytest.raises(ObjectTooLargeError):
+        s3.download_file_to_stream("resumes/big.pdf", max_bytes=1024)
+    with s3.download_file_to_stream("resumes/0.pdf", max_bytes=1024) as stream:
+        assert stream.read() == b"file 0"
+
+
+def test_download_to_stream_missing_key(s3):
+    with pytest.raises(FileNotFoundError):
+        s3.download_file_to_stream("resumes/missing.pdf")
+
+
+def test_parser_handler_returns_413_over_parse_max_file_mb(lambda_function, monkeypatch):
+    lambda_function("resume_parser")
+    monkeypatch.setenv("PARSE_MAX_FILE_MB", "0.001")
+    import handler
+    from parser import ResumeParser
+    from shared.s3_client import S3Client
+
+    s3 = S3Client()
+    s3._client = _FakeS3({"resumes/big.pdf": b"%PDF" + b"x" * 2048})
+    handler.reset()
+    monkeypatch.setattr(handler, "_parser", ResumeParser(s3_client=s3, bedrock_client=object()))
+
+    event = {"body": json.dumps({"file_path": "s3://test-bucket/resumes/big.pdf"})}
+    response = handler.lambda_handler(event, None)
+    assert response["statusCode"] == 413
+    assert "File too large" in json.loads(response["body"])["error"]
@@ -0,0 +1,107 @@
+"""Per (resume, job) ranking score cache and job invalidation."""
+
+import pytest
+
+from ranking_agent.models import JobData, RankingScore, ResumeData
+from ranking_agent.score_cache import RankingScoreCache
+from shared.cache import MemoryCache, SQLiteCache
+
+JOB = JobData(
+    job_id="job-1",
+    title="Backend Engineer",
+    description="Build services.",
+    required_skills=["Python"],
+    preferred_skills=[],
+    experience_level="Mid",
+)
+RESUMES = [
+    ResumeData(
+        resume_id=i, candidate_name=f"C{i}", skills=["Python"], experience_level="Mid", summary=None
+    )
+    for i in range(3)
+]
+
+
+def _scores(job: JobData) -> dict[int, RankingScore]:
+    return {
+        r.resume_id: RankingScore(
+            resume_id=r.resume_id,
+            job_id=job.job_id,
+            skill_match_score=80,
+            experience_match_score=90,
+            overall_score=84,
+            summary="Good match.",
+        )
+        for r in RESUMES
+    }
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    """Builds score caches over one shared backend, like restarts of the service."""
+    memory = MemoryCache(100, 3600)
+
+    def make() -> RankingScoreCache:
+        if request.param == "memory":
+            backend = memory
+        else:
+            backend = SQLiteCache(str(tmp_path / "scores.sqlite3"), 100, 3600)
+        return RankingScoreCache(backend, model="m", prompt_version="1")
+
+    return make
+
+
+def test_store_and_lookup(make_cache):
+    cache = make_cache()
+    assert cache.lookup(RESUMES, JOB) == {}
+    cache.store(RESUMES, JOB, _scores(JOB))
+    assert cache.lookup(RESUMES, JOB) == _scores(JOB)
+    assert cache.stats.candidates_from_cache == 3
+    assert cache.stats.candidates_scored == 3
+
+
+def test_hit_rate_counts_only_score_lookups(make_cache):
+    cache = make_cache()
+    cache.lookup(RESUMES, JOB)
+    cache.store(RESUMES, JOB, _scores(JOB))
+    cache.invalidate_job(JOB.job_id)
+    cache.store(RESUMES, JOB, _scores(JOB))
+    cache.lookup(RESUMES, JOB)
+    stats = cache.stats_dict()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (3, 3, 0.5)
+
+
+def test_edited_job_misses(make_cache):
+    cache = make_cache()
+    cache.store(RESUMES, JOB, _scores(JOB))
+    edited = JOB.model_copy(update={"required_skills": ["Python", "SQL"]})
+    assert cache.lookup(RESUMES, edited) == {}
+
+
+def test_invalidate_job(make_cache):
+    cache = make_cache()
+    cache.store(RESUMES, JOB, _scores(JOB))
+    cache.invalidate_job(JOB.job_id)
+    assert cache.lookup(RESUMES, JOB) == {}
+    cache.store(RESUMES, JOB, _scores(JOB))
+    assert len(cache.lookup(RESUMES, JOB)) == 3
+
+
+def test_invalidation_survives_restart(make_cache):
+    cache = make_cache()
+    cache.store(RESUMES, JOB, _scores(JOB))
+    # A new instance over the same backend (or sqlite file) sees the entries,
+    # and invalidating through it hides entries written before
+    restarted = make_cache()
+    assert len(restarted.lookup(RESUMES, JOB)) == 3
+    restarted.invalidate_job(JOB.job_id)
+    assert make_cache().lookup(RESUMES, JOB) == {}
+
+
+def test_invalidate_job_keeps_other_jobs(make_cache):
+    cache = make_cache()
+    other = JOB.model_copy(update={"job_id": "job-2"})
+    cache.store(RESUMES, JOB, _scores(JOB))
+    cache.store(RESUMES, other, _scores(other))
+    cache.invalidate_job(JOB.job_id)
+    assert len(cache.lookup(RESUMES, other)) == 3
@@ -0,0 +1,110 @@
+"""Local skill and experience scoring used by the ranking agent."""
+
+import pytest
+
+from ranking_agent.models import JobData, ResumeData
+from ranking_agent.scoring import (
+    EXACT_LEVEL_SCORE,
+    FAR_OFF_SCORE,
+    ONE_ABOVE_SCORE,
+    ONE_BELOW_SCORE,
+    UNKNOWN_LEVEL_SCORE,
+    JobScorer,
+    score_resumes,
+    skill_terms,
+)
+
+JOB = JobData(
+    job_id="job-1",
+    title="Backend Engineer",
+    description="Build services.",
+    required_skills=["Python", "PostgreSQL", "Power BI/Tableau"],
+    preferred_skills=["Kubernetes", "CRM (Salesforce)"],
+    experience_level="Mid",
+)
+
+
+def _resume(resume_id: int, skills: list[str], level: str | None = "Mid") -> ResumeData:
+    return ResumeData(
+        resume_id=resume_id,
+        candidate_name=f"Candidate {resume_id}",
+        skills=skills,
+        experience_level=level,
+        summary=None,
+    )
+
+
+def test_skill_terms_split_alternatives_and_apply_synonyms():
+    assert skill_terms("Power BI/Tableau") >= {"power bi", "tableau"}
+    assert skill_terms("CRM (Salesforce)") >= {"customer relationship management", "salesforce"}
+    assert "kubernetes" in skill_terms("K8s")
+    assert "python" in skill_terms("Python experience")
+    assert "advanced" not in skill_terms("Advanced")
+
+
+def test_term_bits_map_each_alternative_to_its_skill():
+    bits = JobScorer(JOB).term_bits
+    assert bits["python"] == 0b00001
+    assert bits["postgresql"] == 0b00010
+    assert bits["tableau"] == bits["power bi"] == 0b00100
+    assert bits["kubernetes"] == 0b01000
+    assert bits["salesforce"] == 0b10000
+
+
+def test_skill_mask_matches_synonyms_and_alternatives():
+    scorer = JobScorer(JOB)
+    assert scorer.skill_mask(["py", "Postgres", "Tableau", "k8s"]) == 0b01111
+    assert scorer.skill_mask(["Java", "Excel"]) == 0
+
+
+def test_skill_score_weights_required_and_preferred():
+    scorer = JobScorer(JOB)
+    assert scorer.skill_score(0b11111) == pytest.approx(100.0)
+    assert scorer.skill_score(0b00111) == pytest.approx(70.0)
+    assert scorer.skill_score(0b11000) == pytest.approx(30.0)
+    assert scorer.skill_score(0b01001) == pytest.approx(100 * (0.7 / 3 + 0.3 / 2))
+
+
+def test_skill_score_without_preferred_skills():
+    scorer = JobScorer(JOB.model_copy(update={"preferred_skills": []}))
+    assert scorer.skill_score(0b011) == pytest.approx(200 / 3)
+
+
+def test_skill_score_without_skills_is_full():
+    scorer = JobScorer(JOB.model_copy(update={"required_skills": [], "preferred_skills": []}))
+    assert scorer.skill_score(0) == 100.0
+
+
+@pytest.mark.parametrize(
+    ("level", "expected"),
+    [
+        ("Mid-level", EXACT_LEVEL_SCORE),
+        ("Senior", ONE_ABOVE_SCORE),
+        ("Junior", ONE_BELOW_SCORE),
+        ("Principal Engineer", FAR_OFF_SCORE),
+        ("Unknown", UNKNOWN_LEVEL_SCORE),
+        (None, UNKNOWN_LEVEL_SCORE),
+    ],
+)
+def test_experience_score(level, expected):
+    assert JobScorer(JOB).experience_score(level) == expected
+
+
+def test_score_lists_matched_and_missing_skills():
+    match = JobScorer(JOB).score(_resume(1, ["Python", "Salesforce"]))
+    assert match.matched_required == ["Python"]
+    assert match.missing_required == ["PostgreSQL", "Power BI/Tableau"]
+    assert match.matched_preferred == ["CRM (Salesforce)"]
+
+
+def test_score_resumes_sorts_by_overall_score():
+    resumes = [
+        _resume(1, ["Python"], "Junior"),
+        _resume(2, ["Python", "PostgreSQL", "Tableau", "Kubernetes", "Salesforce"]),
+        _resume(3, ["Python", "PostgreSQL"]),
+    ]
+    scores = score_resumes(resumes, JOB)
+    assert [s.resume_id for s in scores] == [2, 3, 1]
+    assert scores[0].overall_score == pytest.approx(0.6 * 100 + 0.4 * EXACT_LEVEL_SCORE)
+    assert all(s.job_id == "job-1" for s in scores)
+    assert "Missing: Power BI/Tableau." in scores[1].summary
@@ -0,0 +1,74 @@
+"""Skill index queries and persistence."""
+
+import gzip
+import json
+import os
+import threading
+
+from ranking_agent.models import JobData
+from ranking_agent.skill_index import SkillIndex
+
+JOB = JobData(
+    job_id="job-1",
+    title="Backend Engineer",
+    description="",
+    required_skills=["Python", "SQL"],
+    preferred_skills=["Docker"],
+    experience_level="Mid",
+)
+
+
+def test_query_ranks_by_weighted_overlap():
+    index = SkillIndex()
+    index.add(1, ["Python"])
+    index.add(2, ["python", "PostgreSQL", "Docker"])
+    index.add(3, ["Java"])
+    matches = index.query(JOB)
+    assert [m.resume_id for m in matches] == [2, 1]
+    assert (matches[0].matched_required, matches[0].matched_preferred) == (1, 1)
+
+
+def test_add_replaces_and_remove_drops():
+    index = SkillIndex()
+    index.add(1, ["Python"])
+    index.add(1, ["Java"])
+    assert index.query(JOB) == []
+    assert index.remove(1)
+    assert not index.remove(1)
+    assert len(index) == 0
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "index.json.gz")
+    index = SkillIndex(path)
+    index.add(1, ["Python", "SQL"])
+    index.add(2, ["Docker"])
+    index.save()
+    loaded = SkillIndex(path)
+    assert len(loaded) == 2
+    assert [m.resume_id for m in loaded.query(JOB)] == [1, 2]
+
+
+def test_concurrent_saves(tmp_path):
+    path = str(tmp_path / "index.json.gz")
+    index = SkillIndex(path)
+    errors = []
+
+    def save(i: int) -> None:
+        try:
+            index.save(snapshot={"version": 1, "resumes": [[i, ["Python"] * 2000]]})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with open(path, "rb") as f:
+        data = json.loads(gzip.decompress(f.read()))
+    assert len(data["resumes"]) == 1
+    # No temporary files are left behind
+    assert os.listdir(tmp_path) == ["index.json.gz"]
@@ -0,0 +1,60 @@
+"""Payload size estimates and EMF documents of the Lambda telemetry."""
+
+import json
+
+import pytest
+
+from aws_lambda.shared import telemetry
+
+
+def _resume(i: int) -> dict:
+    return {
+        "resume_id": i,
+        "candidate_name": f"Candidate {i}",
+        "skills": ["Python", "SQL", "AWS", "Docker"],
+        "experience_level": "Mid",
+        "summary": "Engineer with experience shipping data and web products.",
+    }
+
+
+def _sqs_record(i: int) -> dict:
+    body = json.dumps({"file_path": f"s3://bucket/resumes/{i:04d}.pdf"})
+    return {"messageId": f"m-{i:04d}", "eventSource": "aws:sqs", "body": body}
+
+
+def test_api_gateway_body_length():
+    event = {"requestContext": {}, "body": '{"file_path": "a.pdf"}'}
+    assert telemetry.payload_size(event) == len(event["body"])
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        {"resumes": [_resume(i) for i in range(200)], "job": {"job_id": "j", "title": "Engineer"}},
+        {"Records": [_sqs_record(i) for i in range(10)]},
+    ],
+    ids=["direct-ranking", "sqs"],
+)
+def test_estimate_close_to_serialized_size(event, monkeypatch):
+    actual = len(json.dumps(event))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("payload_size must not serialize the event")
+
+    monkeypatch.setattr(telemetry.json, "dumps", fail)
+    assert telemetry.payload_size(event) == pytest.approx(actual, rel=0.1)
+
+
+def test_recording_outside_invocation_is_noop():
+    telemetry.record("Anything", 1.0)
+
+
+def test_documents_split_at_100_values():
+    metrics = telemetry.InvocationMetrics("svc", namespace="Test")
+    for i in range(250):
+        metrics.put("Latency", float(i), "Milliseconds")
+    metrics.put("ColdStart", 1, "Count")
+    documents = metrics.to_documents()
+    assert [len(d["Latency"]) for d in documents] == [100, 100, 50]
+    assert documents[0]["ColdStart"] == 1
+    assert "ColdStart" not in documents[1]
@@ -0,0 +1,61 @@
+"""Normalization and budget packing of extracted resume text."""
+
+from resume_parser.text_compaction import compact_resume_text, estimate_tokens
+
+
+def test_years_and_dates_survive():
+    text = (
+        "Jane Doe\n\nExperience\nSenior Engineer, Acme\n03/2015\n06/2021\n"
+        "Engineer, Initech\n2012\n2015\n\fEducation\nBSc Computer Science\n2011\n"
+    )
+    lines = compact_resume_text(text, 1000).splitlines()
+    assert lines == [
+        "Jane Doe",
+        "Experience",
+        "Senior Engineer, Acme",
+        "03/2015",
+        "06/2021",
+        "Engineer, Initech",
+        "2012",
+        "2015",
+        "Education",
+        "BSc Computer Science",
+        "2011",
+    ]
+
+
+def test_page_numbers_dropped():
+    text = (
+        "Jane Doe\nSkills\nPython\nPage 1 of 2\n\f"
+        "2\nExperience\nEngineer, Acme\n- 2 -\n\f"
+        "Education\nBSc\n3 of 3"
+    )
+    assert compact_resume_text(text, 1000).splitlines() == [
+        "Jane Doe", "Skills", "Python", "Experience", "Engineer, Acme", "Education", "BSc",
+    ]
+
+
+def test_bare_number_kept_on_single_page():
+    text = "Jane Doe\nYears of experience\n12"
+    assert compact_resume_text(text, 1000).splitlines()[-1] == "12"
+
+
+def test_running_header_kept_once():
+    pages = [f"Jane Doe - Page {i} of 3\nline {i}a\nline {i}b\nline {i}c\nline {i}d" for i in (1, 2, 3)]
+    lines = compact_resume_text("\f".join(pages), 1000).splitlines()
+    assert lines.count("Jane Doe") == 1
+    assert lines[0] == "Jane Doe"
+
+
+def test_over_budget_keeps_skills_before_education():
+    text = "\n".join(
+        ["Jane Doe", "Education"]
+        + [f"Course {i} with a long description of the material covered" for i in range(40)]
+        + ["Skills", "Python, SQL, AWS"]
+    )
+    packed = compact_resume_text(text, 100)
+    assert estimate_tokens(packed) <= 100 + 1
+    assert "Python, SQL, AWS" in packed
+    assert packed.splitlines()[0] == "Jane Doe"
+    # Sections stay in document order
+    assert packed.index("Education") < packed.index("Skills")
@@ -0,0 +1,73 @@
+"""Extracted text store and the CLI that pre-fills it."""
+
+import sys
+
+import pytest
+
+from resume_parser import agent as agent_module
+from resume_parser import text_store as text_store_module
+from resume_parser.text_store import TextStore
+
+
+@pytest.fixture
+def resume_file(tmp_path):
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_paragraph("Jane Doe")
+    document.add_paragraph("Python, SQL")
+    path = tmp_path / "jane_doe.docx"
+    document.save(path)
+    return path
+
+
+def test_store_round_trip(tmp_path):
+    store = TextStore(str(tmp_path / "texts"))
+    assert store.get("ab" * 32) is None
+    store.put("ab" * 32, "some text")
+    assert store.get("ab" * 32) == "some text"
+    assert (store.stats.hits, store.stats.misses) == (1, 1)
+
+
+def test_cli_fills_store_without_parse_cache(tmp_path, resume_file, monkeypatch, capsys):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+
+    def no_cache(*args, **kwargs):
+        raise AssertionError("the parse cache should not be built")
+
+    monkeypatch.setattr(agent_module, "create_cache", no_cache)
+    store_dir = tmp_path / "texts"
+    monkeypatch.setattr(sys, "argv", ["text_store", "--dir", str(store_dir), str(resume_file)])
+    text_store_module.main()
+    assert "1 stored (0 already present), 0 failed" in capsys.readouterr().out
+    assert len(list(store_dir.rglob("*.txt.gz"))) == 1
+
+
+class _FakeS3:
+    """Stands in for S3Client: objects kept in a dict."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def download_file(self, key: str) -> bytes:
+        if key not in self.objects:
+            raise FileNotFoundError(key)
+        return self.objects[key]
+
+    def upload_file(self, key: str, data: bytes, content_type: str = "") -> str:
+        self.objects[key] = data
+        return f"s3://bucket/{key}"
+
+
+def test_s3_store_counts_lookups_across_threads():
+    pytest.importorskip("boto3")
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aws_lambda.shared.text_store import S3TextStore
+
+    store = S3TextStore(_FakeS3(), prefix="texts")
+    store.put("a" * 64, "stored text")
+    keys = ["a" * 64, "b" * 64] * 200
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        texts = list(pool.map(store.get, keys))
+    assert texts.count("stored text") == 200
+    assert store.stats.as_dict() == {"hits": 200, "misses": 200, "evictions": 0, "hit_rate": 0.5}
@@ -0,0 +1,117 @@
+"""Deadline handling and error capture in the Lambda worker pool."""
+
+import threading
+import time
+
+import pytest
+
+from aws_lambda.shared.worker_pool import Deadline, WorkerPool, lambda_vcpus
+
+
+def test_deadline_keeps_reserve():
+    deadline = Deadline(lambda: 5000, reserve_ms=2000)
+    assert deadline.remaining_ms() == 3000
+    assert not deadline.expired()
+    assert Deadline(lambda: 2000, reserve_ms=2000).expired()
+
+
+def test_deadline_from_context():
+    class Context:
+        def get_remaining_time_in_millis(self):
+            return 40000
+
+    assert Deadline.from_context(None) is None
+    assert Deadline.from_context(object()) is None
+    assert Deadline.from_context(Context(), reserve_ms=30000).remaining_ms() == 10000
+
+
+def test_default_reserve_is_limited_by_timeout(monkeypatch):
+    class Context:
+        def __init__(self, remaining):
+            self.remaining = remaining
+
+        def get_remaining_time_in_millis(self):
+            return self.remaining
+
+    monkeypatch.delenv("WORKER_DEADLINE_RESERVE_MS", raising=False)
+    monkeypatch.delenv("WORKER_DEADLINE_RESERVE_FRACTION", raising=False)
+    assert Deadline.from_context(Context(20000)).remaining_ms() == 15000
+    assert Deadline.from_context(Context(900000)).remaining_ms() == 870000
+
+
+def test_map_returns_results_in_order():
+    pool = WorkerPool(max_concurrency=4, cpu_workers=1)
+    results = pool.map(lambda x: x * 2, [1, 2, 3])
+    assert [r.value for r in results] == [2, 4, 6]
+    assert all(r.ok for r in results)
+
+
+def test_map_captures_errors_per_item():
+    def fn(x):
+        if x == 2:
+            raise ValueError("bad item")
+        return x
+
+    results = WorkerPool(max_concurrency=2, cpu_workers=1).map(fn, [1, 2, 3])
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, ValueError)
+
+
+def test_map_skips_items_after_deadline():
+    deadline = Deadline.after(0.2)
+    results = WorkerPool(max_concurrency=1, cpu_workers=1).map(
+        lambda x: time.sleep(0.15), [1, 2, 3, 4], deadline=deadline
+    )
+    assert results[0].ok
+    assert results[-1].skipped
+    assert not results[-1].ok
+    assert all(r.error is None for r in results)
+
+
+def test_expired_deadline_skips_everything():
+    calls = []
+    results = WorkerPool(max_concurrency=2, cpu_workers=1).map(
+        calls.append, [1, 2], deadline=Deadline(lambda: 0, reserve_ms=0)
+    )
+    assert all(r.skipped for r in results)
+    assert calls == []
+
+
+def _peak(pool: WorkerPool, items: int, cpu: bool = False, **kwargs) -> int:
+    """Most items seen running fn (or its CPU section) at the same time."""
+    active = peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    def fn(_):
+        if cpu:
+            with pool.cpu_slot():
+                work()
+        else:
+            work()
+
+    pool.map(fn, list(range(items)), **kwargs)
+    return peak
+
+
+def test_map_max_concurrency_caps_one_call():
+    pool = WorkerPool(max_concurrency=8, cpu_workers=1)
+    assert _peak(pool, 8, max_concurrency=2) <= 2
+
+
+def test_cpu_slot_bounds_cpu_stage():
+    pool = WorkerPool(max_concurrency=8, cpu_workers=2)
+    assert _peak(pool, 8, cpu=True) <= 2
+
+
+@pytest.mark.parametrize(("memory_mb", "vcpus"), [(128, 1), (1769, 1), (3008, 2), (10240, 6)])
+def test_lambda_vcpus(memory_mb, vcpus):
+    assert lambda_vcpus(memory_mb) == vcpus